@@ -0,0 +1,62 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable
+import tracemalloc
+
+type setup = Callable[[int], Callable[[], object]]
+
+@dataclass
+class Benchmark:
+    """
+    `setup` receives the scale and builds everything the benchmark needs, then returns the callable that is actually measured.
+    It is called again before every measurement so that benchmarks which change their state always start from the same one.
+    """
+
+    name: str
+    setup: setup
+
+BENCHMARKS: list[Benchmark] = []
+
+def benchmark(name: str, /) -> Callable[[setup], setup]:
+    """ Registers the decorated setup function under `name`. """
+
+    def decorator(func: setup) -> setup:
+        BENCHMARKS.append(Benchmark(name, func))
+        return func
+
+    return decorator
+
+def measure(bench: Benchmark, scale: int, repeats: int, /) -> dict[str, object]:
+    """
+    Times `repeats` calls and then measures the peak memory of one more call with `tracemalloc`. Memory is measured separately
+    because tracing slows every allocation down, which would distort the timings.
+    """
+
+    times = []
+    for _ in range(repeats):
+        func = bench.setup(scale)
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+
+    func = bench.setup(scale)
+    tracemalloc.start()
+
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'name': bench.name,
+        'scale': scale,
+        'repeats': repeats,
+        'best_s': best,
+        'mean_s': sum(times) / len(times),
+        'units_per_s': scale / best if best > 0 else None,
+        'peak_bytes': peak,
+    }
@@ -0,0 +1,58 @@
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_DOWN, Context, DivisionByZero, InvalidOperation, setcontext
+from fnmatch import fnmatch
+from importlib import import_module
+from pathlib import Path
+import json
+import platform
+import subprocess
+import warnings
+from benchmarks import BENCHMARKS, measure
+
+MODULES = ['benchmarks.bench_goods', 'benchmarks.bench_algs', 'benchmarks.bench_prod', 'benchmarks.bench_world', 'benchmarks.bench_bulk']
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = ArgumentParser(prog='python -m benchmarks', description='Measures throughput and peak memory of the simulation.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100], help='scales every benchmark is run at')
+    parser.add_argument('--repeats', type=int, default=3, help='timed calls per benchmark and scale, the best one is kept')
+    parser.add_argument('--filter', default='*', help='only run benchmarks whose name matches this glob pattern')
+    parser.add_argument('--output', type=Path, default=Path('bench_output.json'), help='JSON file the results are written to')
+    args = parser.parse_args()
+
+    warnings.simplefilter(action='ignore', category=FutureWarning)
+    setcontext(Context(rounding=ROUND_HALF_DOWN, traps=[DivisionByZero, InvalidOperation]))
+
+    for module in MODULES:
+        import_module(module)
+
+    results = []
+    for bench in BENCHMARKS:
+        if not fnmatch(bench.name, args.filter):
+            continue
+
+        for scale in args.scales:
+            result = measure(bench, scale, args.repeats)
+            results.append(result)
+            print(f'{bench.name:<35} scale {scale:>5}  best {result['best_s']:>10.6f}s  peak {result['peak_bytes'] / 1024:>10.1f} KiB')
+
+    report = {
+        'commit': current_commit(),
+        'date': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+    args.output.write_text(json.dumps(report, indent=4))
+    print(f'\nResults written to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from decimal import getcontext
+from source.algs import first_in_first_served, impartial, iterative, proportional, retrospective, rich_first, sharing_alg
+from source.goods import Products, create_stock
+from source.pop import CommuneFactory, Jobs
+from source.prod import IndustryFactory
+from benchmarks import benchmark
+D = getcontext().create_decimal
+
+WHEAT = Products.WHEAT
+IRON = Products.IRON
+FLOUR = Products.FLOUR
+
+FARMER = Jobs.FARMER
+MINER = Jobs.MINER
+SPECIALIST = Jobs.SPECIALIST
+
+def _sharing(alg: sharing_alg, /):
+    def setup(scale: int):
+        communes = [CommuneFactory.create_by_job({FARMER: 100 + i, MINER: 50 + i, SPECIALIST: 10 + i}) for i in range(scale * 10)]
+        stock = create_stock({WHEAT: 2000 * scale, IRON: 1000 * scale, FLOUR: 3000 * scale})
+
+        def run():
+            for commune in communes:
+                alg(commune, stock)
+
+        return run
+
+    return setup
+
+for alg in (first_in_first_served, impartial, rich_first, proportional):
+    benchmark(f'algs.{alg.__name__}')(_sharing(alg))
+
+@benchmark('algs.retrospective')
+def bench_retrospective(scale: int):
+    industries = [IndustryFactory.create_industry(WHEAT, {FARMER: 495, MINER: 495, SPECIALIST: 10}, {FARMER: 500 + i, MINER: 400, SPECIALIST: 20})
+                  for i in range(scale * 10)]
+
+    def run():
+        for industry in industries:
+            retrospective(industry)
+
+    return run
+
+@benchmark('algs.iterative')
+def bench_iterative(scale: int):
+    industries = [IndustryFactory.create_industry(WHEAT, {FARMER: 495, MINER: 495, SPECIALIST: 10}, {FARMER: 500 + i, MINER: 400, SPECIALIST: 20})
+                  for i in range(scale * 10)]
+
+    def run():
+        for industry in industries:
+            iterative(industry)
+
+    return run
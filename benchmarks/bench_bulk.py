@@ -0,0 +1,35 @@
+from source.bulk import communes_from_table
+from source.pop import CommuneFactory, Jobs
+from benchmarks import benchmark
+import numpy as np
+
+JOBS = [Jobs.FARMER, Jobs.MINER, Jobs.CRAFTSMAN, Jobs.SPECIALIST]
+
+def _pops(scale: int, /) -> dict[str, np.ndarray]:
+    """ 500 communes of four pops each per unit of scale. """
+
+    communes = scale * 500
+    sizes = np.random.default_rng(0).integers(1, 1000, communes * len(JOBS))
+
+    return {'commune': np.repeat(np.arange(communes), len(JOBS)),
+            'job': np.tile(np.array([job.name for job in JOBS]), communes),
+            'size': sizes}
+
+@benchmark('bulk.communes_from_table')
+def bulk_communes(scale: int):
+    pops = _pops(scale)
+
+    def run():
+        communes_from_table(pops)
+
+    return run
+
+@benchmark('bulk.factory_baseline')
+def factory_communes(scale: int):
+    sizes = _pops(scale)['size'].reshape(-1, len(JOBS)).tolist()
+
+    def run():
+        for row in sizes:
+            CommuneFactory.create_by_job(dict(zip(JOBS, row)))
+
+    return run
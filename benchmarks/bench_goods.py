@@ -0,0 +1,83 @@
+from decimal import getcontext
+from source.goods import Products, create_stock
+from source.pop import CommuneFactory, Jobs, Strata
+from benchmarks import benchmark
+D = getcontext().create_decimal
+
+WHEAT = Products.WHEAT
+IRON = Products.IRON
+FLOUR = Products.FLOUR
+
+FARMER = Jobs.FARMER
+MINER = Jobs.MINER
+SPECIALIST = Jobs.SPECIALIST
+
+@benchmark('goods.stock_iadd')
+def stock_iadd(scale: int):
+    total = create_stock()
+    stocks = [create_stock({WHEAT: i, IRON: 2 * i, FLOUR: 3 * i}) for i in range(1, scale * 100 + 1)]
+
+    def run():
+        nonlocal total
+        for stock in stocks:
+            total += stock
+
+    return run
+
+@benchmark('goods.stock_isub')
+def stock_isub(scale: int):
+    total = create_stock({WHEAT: 10 ** 9, IRON: 10 ** 9, FLOUR: 10 ** 9})
+    stocks = [create_stock({WHEAT: i, IRON: 2 * i, FLOUR: 3 * i}) for i in range(1, scale * 100 + 1)]
+
+    def run():
+        nonlocal total
+        for stock in stocks:
+            total -= stock
+
+    return run
+
+@benchmark('goods.stock_mul')
+def stock_mul(scale: int):
+    stocks = [create_stock({WHEAT: i, IRON: 2 * i, FLOUR: 3 * i}) for i in range(1, scale * 100 + 1)]
+    share = D('0.35')
+
+    def run():
+        for stock in stocks:
+            stock * share
+
+    return run
+
+@benchmark('pop.commune_iadd')
+def commune_iadd(scale: int):
+    total = CommuneFactory.create_by_job()
+    communes = [CommuneFactory.create_by_job({FARMER: i, MINER: i, SPECIALIST: i}) for i in range(1, scale * 100 + 1)]
+
+    def run():
+        nonlocal total
+        for commune in communes:
+            total += commune
+
+    return run
+
+@benchmark('pop.commune_isub')
+def commune_isub(scale: int):
+    total = CommuneFactory.create_by_job({FARMER: 10 ** 9, MINER: 10 ** 9, SPECIALIST: 10 ** 9})
+    communes = [CommuneFactory.create_by_job({FARMER: i, MINER: i, SPECIALIST: i}) for i in range(1, scale * 100 + 1)]
+
+    def run():
+        nonlocal total
+        for commune in communes:
+            total -= commune
+
+    return run
+
+@benchmark('pop.commune_filter')
+def commune_filter(scale: int):
+    communes = [CommuneFactory.create_by_job({FARMER: i, MINER: i, SPECIALIST: i}) for i in range(1, scale * 100 + 1)]
+
+    def run():
+        for commune in communes:
+            commune[Strata.LOWER]
+            commune[Strata.MIDDLE]
+
+    return run
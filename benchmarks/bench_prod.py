@@ -0,0 +1,84 @@
+from decimal import getcontext
+from source.goods import Products, Techs, create_stock
+from source.pop import Jobs, PopFactory, Strata
+from source.prod import Extractor, IndustryFactory, Manufactury
+from benchmarks import benchmark
+D = getcontext().create_decimal
+
+WHEAT = Products.WHEAT
+IRON = Products.IRON
+FLOUR = Products.FLOUR
+
+FARMER = Jobs.FARMER
+CRAFTSMAN = Jobs.CRAFTSMAN
+SPECIALIST = Jobs.SPECIALIST
+
+def _extractors(scale: int, /) -> list[Extractor]:
+    return [IndustryFactory.create_industry(WHEAT, {FARMER: 990, SPECIALIST: 10}, {FARMER: 200 + i, SPECIALIST: 5}) for i in range(scale * 10)]
+
+def _manufacturies(scale: int, /) -> list[Manufactury]:
+    return [IndustryFactory.create_industry(FLOUR, {CRAFTSMAN: 990, SPECIALIST: 10}, {CRAFTSMAN: 200 + i, SPECIALIST: 5},
+                                            Techs.MILLING, {WHEAT: 400, IRON: 200})
+            for i in range(scale * 10)]
+
+@benchmark('prod.calc_efficiency')
+def calc_efficiency(scale: int):
+    industries = _extractors(scale)
+
+    def run():
+        for industry in industries:
+            industry.calc_efficiency()
+
+    return run
+
+@benchmark('prod.calc_labor_demand')
+def calc_labor_demand(scale: int):
+    industries = _extractors(scale)
+
+    def run():
+        for industry in industries:
+            industry.calc_labor_demand()
+
+    return run
+
+@benchmark('prod.employ')
+def employ(scale: int):
+    industries = _extractors(scale)
+    pops = [PopFactory.stratum_makepop(Strata.LOWER, 50) for _ in industries]
+
+    def run():
+        for industry, pop in zip(industries, pops):
+            industry.employ(pop)
+
+    return run
+
+@benchmark('prod.extractor_produce')
+def extractor_produce(scale: int):
+    industries = _extractors(scale)
+
+    def run():
+        for industry in industries:
+            industry.produce()
+
+    return run
+
+@benchmark('prod.manufactury_produce')
+def manufactury_produce(scale: int):
+    industries = _manufacturies(scale)
+
+    def run():
+        for industry in industries:
+            industry.produce()
+
+    return run
+
+@benchmark('prod.manufactury_restock')
+def manufactury_restock(scale: int):
+    industries = _manufacturies(scale)
+    stock = create_stock({WHEAT: 10 ** 6, IRON: 10 ** 6})
+
+    def run():
+        for industry in industries:
+            industry.restock(stock)
+
+    return run
@@ -0,0 +1,77 @@
+import copy
+from pathlib import Path
+from tempfile import gettempdir
+from source.generate import scaled_world
+from source.world import tick
+from benchmarks import benchmark
+
+def _recorder(world, /):
+    from visual.gather import DataManager
+
+    return DataManager('benchmark', *world.industries, *world.settlements, world.jobless_pops, data_dir=Path(gettempdir()))
+
+def _record(method: str, /):
+    def setup(scale: int):
+        world = scaled_world(scale)
+        tick(world)
+        recorder = _recorder(world)
+        before = copy.deepcopy(world.common_stock)
+
+        args = {
+            'record_stockpile': (world.common_stock,),
+            'record_goods_produced': (before, world.common_stock),
+            'record_goods_consumed': (before, world.common_stock),
+            'record_goods_satisfaction': (world.common_stock,),
+        }.get(method, ())
+
+        def run():
+            getattr(recorder, method)(*args)
+
+        return run
+
+    return setup
+
+for method in ('record_pop_size', 'record_pop_welfare', 'record_stockpile', 'record_goods_produced',
+               'record_goods_demanded', 'record_goods_consumed', 'record_goods_satisfaction'):
+    benchmark(f'visual.{method}')(_record(method))
+
+@benchmark('world.tick')
+def world_tick(scale: int):
+    world = scaled_world(scale)
+
+    def run():
+        tick(world)
+
+    return run
+
+@benchmark('world.tick_recorded')
+def world_tick_recorded(scale: int):
+    world = scaled_world(scale)
+    recorder = _recorder(world)
+
+    def run():
+        tick(world, recorder)
+
+    return run
+
+@benchmark('kernels.tick')
+def kernels_tick(scale: int):
+    from source import kernels
+
+    world = scaled_world(scale)
+
+    def run():
+        kernels.tick(world)
+
+    return run
+
+@benchmark('parallel.tick')
+def parallel_tick(scale: int):
+    from source import parallel
+
+    world = scaled_world(scale)
+
+    def run():
+        parallel.tick(world)
+
+    return run
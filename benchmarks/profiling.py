@@ -0,0 +1,175 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_DOWN, Context, DivisionByZero, InvalidOperation, setcontext
+from pathlib import Path
+from typing import Iterator, Optional
+from contextlib import contextmanager
+from source.goods import Good, Stock
+from source.pop import Commune, Pop
+from source.generate import scaled_world
+from source.pool import scope
+from source.world import PHASES, World
+import fnmatch
+import gc
+import json
+import tracemalloc
+
+# Types whose instantiations are counted. `deepcopy` bypasses `__init__`, so it is `__new__` that is instrumented.
+COUNTED: tuple[type, ...] = (Good, Pop, Stock, Commune)
+
+# Allocations made by the profiler itself are left out of the per-line report.
+_OWN_TRACES = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+
+@dataclass
+class PhaseProfile:
+    """
+    Allocations of one tick phase, summed over every profiled tick except for `peak_bytes`, which is the highest peak.
+
+    `created` counts instances of the `COUNTED` types, including temporaries that were freed before the phase ended, and `freed`
+    is derived from it and the number of live instances before and after the phase. `Decimal` is a C type that cannot be
+    instrumented, so only the change in the number of decimals held by live goods and pops is known for it.
+    """
+
+    phase: str
+    peak_bytes: int = 0
+    net_bytes: int = 0
+    created: Counter[str] = field(default_factory=Counter)
+    freed: Counter[str] = field(default_factory=Counter)
+    decimals_held: int = 0
+    lines: Counter[str] = field(default_factory=Counter)  # Net bytes allocated by each source line.
+
+# The instantiations are counted into this while a phase is profiled, and not at all when it is `None`.
+_counts: Optional[Counter[str]] = None
+
+def _counting_new(cls, *args, **kwargs):
+    if _counts is not None:
+        _counts[cls.__name__] += 1
+
+    return object.__new__(cls)
+
+@contextmanager
+def _count_instances(counts: Counter[str], /) -> Iterator[None]:
+    # CPython cannot give a class back its original `__new__` once it was assigned one, neither by deleting it nor by assigning
+    # `object.__new__`, after which the class rejects constructor arguments. So the counting `__new__` stays once installed.
+    global _counts
+
+    for cls in COUNTED:
+        if vars(cls).get('__new__') is not _counting_new:
+            cls.__new__ = _counting_new  # type: ignore
+
+    _counts = counts
+
+    try:
+        yield
+
+    finally:
+        _counts = None
+
+def _live() -> tuple[Counter[str], int]:
+    """ Counts the live instances of every counted type and the decimals held by live goods and pops. """
+
+    live: Counter[str] = Counter()
+    decimals: set[int] = set()
+
+    for obj in gc.get_objects():
+        if isinstance(obj, COUNTED):
+            live[type(obj).__name__] += 1
+
+        if isinstance(obj, Good):
+            decimals.add(id(obj.amount))
+
+        elif isinstance(obj, Pop):
+            decimals.update((id(obj.size), id(obj.welfare)))
+
+    return live, len(decimals)
+
+def profile(world: World, ticks: int, /, top: int = 10) -> dict[str, PhaseProfile]:
+    """ Runs `ticks` ticks of `world` under `tracemalloc` and returns the allocations of each phase. """
+
+    profiles = {phase.__name__: PhaseProfile(phase.__name__) for phase in PHASES}
+
+    # `fnmatch` compiles and caches the filter patterns on first use, which would otherwise be reported in the first phase.
+    for trace_filter in _OWN_TRACES:
+        fnmatch.fnmatch(__file__, trace_filter.filename_pattern)
+
+    tracemalloc.start()
+
+    try:
+        for _ in range(ticks):
+            for phase in PHASES:
+                result = profiles[phase.__name__]
+                gc.collect()
+                live_before, decimals_before = _live()
+                snapshot_before = tracemalloc.take_snapshot().filter_traces(_OWN_TRACES)
+                traced_before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+
+                created: Counter[str] = Counter()
+                with _count_instances(created), scope(world.arena):  # The same scope as in `source.world.tick`.
+                    phase(world, None)
+
+                traced_after, peak = tracemalloc.get_traced_memory()
+                snapshot_after = tracemalloc.take_snapshot().filter_traces(_OWN_TRACES)
+                gc.collect()
+                live_after, decimals_after = _live()
+
+                result.peak_bytes = max(result.peak_bytes, peak - traced_before)
+                result.net_bytes += traced_after - traced_before
+                result.created += created
+                result.decimals_held += decimals_after - decimals_before
+
+                for cls in COUNTED:
+                    name = cls.__name__
+                    result.freed[name] += live_before[name] + created[name] - live_after[name]
+
+                for stat in snapshot_after.compare_to(snapshot_before, 'lineno')[:top]:
+                    frame = stat.traceback[0]
+                    result.lines[f'{frame.filename}:{frame.lineno}'] += stat.size_diff
+
+    finally:
+        tracemalloc.stop()
+
+    return profiles
+
+def format_report(profiles: dict[str, PhaseProfile], /, top: int = 5) -> str:
+    out = []
+
+    for result in profiles.values():
+        out.append(f'{result.phase}: peak {result.peak_bytes / 1024:.1f} KiB, net {result.net_bytes / 1024:+.1f} KiB, '
+                   f'decimals held {result.decimals_held:+}')
+
+        for cls in COUNTED:
+            name = cls.__name__
+            out.append(f'    {name:<8} created {result.created[name]:>9}  freed {result.freed[name]:>9}')
+
+        for line, size in result.lines.most_common(top):
+            out.append(f'    {size / 1024:>+9.1f} KiB  {line}')
+
+    return '\n'.join(out)
+
+def main():
+    parser = ArgumentParser(prog='python -m benchmarks.profiling', description='Profiles the allocations of every tick phase.')
+    parser.add_argument('--scale', type=int, default=1, help='size of the generated world relative to the default one')
+    parser.add_argument('--ticks', type=int, default=5, help='how many ticks to profile')
+    parser.add_argument('--warmup', type=int, default=5, help='ticks run before profiling starts')
+    parser.add_argument('--output', type=Path, default=None, help='also write the profiles to this JSON file')
+    args = parser.parse_args()
+
+    setcontext(Context(rounding=ROUND_HALF_DOWN, traps=[DivisionByZero, InvalidOperation]))
+
+    from source.world import tick
+
+    world = scaled_world(args.scale)
+    for _ in range(args.warmup):
+        tick(world)
+
+    profiles = profile(world, args.ticks)
+    print(format_report(profiles))
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({name: vars(result) for name, result in profiles.items()}, indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -1,106 +1,136 @@
-import copy
-from random import shuffle
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable, Optional
 import warnings
-from source.algs import proportional, retrospective
-from source.goods import Techs, Products, create_stock
-from source.pop import CommuneFactory, Jobs
-from source.prod import Industry, IndustryFactory
-from visual.gather import DataManager
-from decimal import ROUND_HALF_DOWN, Context, DivisionByZero, InvalidOperation, setcontext
-
-def main():
+from source.world import World, default_world, tick
+from source.convergence import DEFAULT_WINDOW, Monitor
+from source.generate import scaled_world
+from source.validation import Validation, set_validation
+from decimal import ROUND_HALF_DOWN, Context, Decimal, DivisionByZero, InvalidOperation, setcontext
+
+DEFAULT_SCENARIO = Path(__file__).parent / 'scenarios' / 'default.toml'
+FLUSH_EVERY = 50  # Ticks between each hand-off of recorded rows to the background writer.
+CHECKPOINT_EVERY = 1000  # Ticks between checkpoints, when checkpointing.
+
+def main(ticks: int = 200, *, record: bool = True, plot: bool = True, data_dir: Optional[Path] = None, world: Optional[World] = None,
+         engine: Callable[..., None] = tick, checkpoint: Optional[Path] = None, checkpoint_every: int = CHECKPOINT_EVERY,
+         resume: bool = False, monitor: Optional[Monitor] = None, fast_forward: bool = False) -> World:
+    """
+    Runs `world`, or the default world if none is passed, for `ticks` ticks of `engine`. `visual` is only imported when recording,
+    and matplotlib only when plotting, so a run with neither never imports pandas or matplotlib.
+
+    With `checkpoint`, the run is checkpointed to that file every `checkpoint_every` ticks, see `source.checkpoint`. With `resume`
+    as well, the run continues from that checkpoint instead of starting from `world`, until `ticks` ticks in total were run, and
+    goes on exactly as the run that wrote it would have.
+
+    With `monitor`, the run stops as soon as it converged, see `source.convergence`, and `monitor.converged_at` tells when. Its window
+    is checkpointed along with the run and given back to it on resume. With `fast_forward` as well, the recording is still filled up
+    to `ticks` ticks by repeating the last recorded state.
+    """
+
+    start = 0
+    saved = None
+
+    if checkpoint is not None:
+        from source.checkpoint import load, save
+
+        if resume:
+            saved = load(checkpoint)
+            world, start = saved.world, saved.ticks
+
+            if monitor is not None and saved.window is not None:
+                monitor.history.extend(saved.window)
+
+    elif resume:
+        raise ValueError('Can only resume a run from a checkpoint, but none was passed.')
+
+    world = default_world() if world is None else world
+
+    def checkpoints(current: int, /) -> bool:
+        return checkpoint is not None and (current + 1) % checkpoint_every == 0
+
+    if not record:
+        for current in range(start, ticks):
+            engine(world)
+            converged = monitor is not None and monitor.observe(world, current + 1)
+
+            if checkpoints(current) and not converged:
+                save(checkpoint, world, current + 1, monitor=monitor)
+
+            if converged:
+                break
+
+        return world
+
     warnings.simplefilter(action='ignore', category=FutureWarning)
 
+    from visual.gather import DataManager
+    from visual.writer import BackgroundWriter
+
     data_name = 'EconSim'
 
-    WHEAT = Products.WHEAT
-    IRON = Products.IRON
-    FLOUR = Products.FLOUR
-
-    FARMER = Jobs.FARMER
-    MINER = Jobs.MINER
-    CRAFTSMAN = Jobs.CRAFTSMAN
-    SPECIALIST = Jobs.SPECIALIST
-
-    CRAFTING = Techs.CRAFTING
-    MILLING = Techs.MILLING
-
-    farm = IndustryFactory.create_industry(WHEAT, {FARMER: 990, SPECIALIST: 10}, {FARMER: 200, SPECIALIST: 5})
-    mine = IndustryFactory.create_industry(IRON, {MINER: 990, SPECIALIST: 10}, {MINER: 200, SPECIALIST: 5})
-    flour_craft = IndustryFactory.create_industry(FLOUR, {CRAFTSMAN: 990, SPECIALIST: 10}, {CRAFTSMAN: 200, SPECIALIST: 5}, CRAFTING)
-    flour_mill = IndustryFactory.create_industry(FLOUR, {CRAFTSMAN: 990, SPECIALIST: 10}, {CRAFTSMAN: 200, SPECIALIST: 5}, MILLING)
-
-    common_stock = create_stock({WHEAT: 500, IRON: 500})
-    jobless_pops = CommuneFactory.create_by_job()
-    
-    communes = [farm.workforce, mine.workforce, flour_craft.workforce, flour_mill.workforce, jobless_pops]
-    industries: list[Industry] = [farm, mine, flour_craft, flour_mill]
-    manufacturies = [flour_craft, flour_mill]
-
-    data_manager = DataManager(data_name, farm, mine, flour_craft, flour_mill, jobless_pops)
-
-    for _ in range(200):
-
-        # ---------------------- PRODUCTION ------------------------
-        data_manager.record_goods_satisfaction(common_stock)
-
-        before = copy.deepcopy(common_stock)
-
-        for industry in industries:
-            common_stock += industry.produce()
-
-        data_manager.record_goods_produced(before, common_stock)
-        data_manager.record_stockpile(common_stock)
-
-        # --------------------- CONSUMPTION ------------------------
-        original_stock = copy.deepcopy(common_stock)
-        data_manager.record_goods_demanded()
-
-        shuffle(manufacturies)
-        for manufactury in manufacturies:
-            manufactury.restock(common_stock)
-
-        shuffle(industries)
-        for industry in industries:
-            industry.workforce.update_welfares(common_stock, proportional)
-
-        jobless_pops.update_welfares(common_stock, proportional)
-        
-        data_manager.record_pop_welfare()
-        data_manager.record_goods_consumed(original_stock, common_stock)
-        
-        # ----------------------- RESIZING -------------------------
-        for commune in communes:
-            commune.resize_all()
-        
-        # ----------------------- PROMOTION ------------------------
-        # The fact that promotion goes after resizing does affect the behavior of the simulation, for the promotions will be larger this way.
-        for commune in communes:
-            if commune is jobless_pops: continue
-            jobless_pops += commune.promote_all()
-
-        # ----------------------- EMPLOYMENT -----------------------
-        shuffle(industries)  # TODO implement an algorithm for choosing what Extractor gets the goods first, or that divides it between them.
-        for industry in industries:
-            for pop in jobless_pops.values():
-                if industry.can_employ(pop):
-                    industry.employ(pop)
-        
-        # ---------------------- REBALANCING -----------------------
-        for industry in industries:
-            if industry.workforce.size > industry.capacity:
-                jobless_pops += industry.fire_excess()
-
-            if industry.is_unbalanced():
-                jobless_pops += industry.balance(retrospective)
-
-        data_manager.record_pop_size()
-    
-    data_manager.save_csv(True)
-    data_manager.plot_all()
+    with BackgroundWriter() as writer:
+        if saved is None:
+            data_manager = DataManager(data_name, *world.industries, *world.settlements, world.jobless_pops, writer=writer, data_dir=data_dir)
+
+        elif saved.recorded is None or saved.position is None:
+            raise ValueError('A run that was not recorded cannot be resumed into a recorded one.')
+
+        else:
+            data_manager = DataManager(data_name, *saved.recorded, writer=writer, data_dir=data_dir)
+            data_manager.resume(saved.position)
+
+        try:
+            for current in range(start, ticks):
+                engine(world, data_manager)
+                converged = monitor is not None and monitor.observe(world, current + 1)
+
+                if current % FLUSH_EVERY == FLUSH_EVERY - 1:
+                    data_manager.flush(True)
+
+                if checkpoints(current) and not converged:
+                    # The checkpoint must not claim rows that are still waiting to be written.
+                    data_manager.flush(True)
+                    writer.join()
+                    save(checkpoint, world, current + 1, data_manager, monitor)
+
+                if converged:
+                    if fast_forward:
+                        data_manager.repeat(ticks - current - 1)
+
+                    break
+
+        finally:
+            data_manager.flush(True)
+
+    if plot:
+        data_manager.plot_all()
+
+    return world
 
 if __name__ == '__main__':
 
+    parser = ArgumentParser(description='Runs the EconSim simulation.')
+    parser.add_argument('--ticks', type=int, default=200, help='how many ticks to simulate')
+    parser.add_argument('--headless', action='store_true', help='record the run but do not plot it, which never imports matplotlib')
+    parser.add_argument('--no-record', action='store_true', help='do not record the run at all, which never imports `visual`')
+    parser.add_argument('--output', type=Path, default=None, help='folder where the recorded data is saved')
+    parser.add_argument('--scale', type=int, default=None, help='run a generated world this many times larger than the default one')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generated world')
+    parser.add_argument('--scenario', type=Path, default=DEFAULT_SCENARIO, help='TOML scenario to run when no `--scale` is passed')
+    parser.add_argument('--validation', choices=[level.name.lower() for level in Validation], default='full',
+                        help='`boundary` only checks user-facing factories and `off` skips every check, see `source.validation`')
+    parser.add_argument('--checkpoint', type=Path, default=None, help='file the run is checkpointed to every `--checkpoint-every` ticks')
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY, help='how many ticks between checkpoints')
+    parser.add_argument('--resume', action='store_true', help='continue the run from `--checkpoint` instead of starting a new one')
+    parser.add_argument('--converge', type=Decimal, default=None, help='stop once no total changed by more than this fraction over `--window` ticks')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='how many ticks convergence is told over')
+    parser.add_argument('--fast-forward', action='store_true', help='fill the recording of a converged run up to `--ticks` by repeating its last state')
+    engines = parser.add_mutually_exclusive_group()
+    engines.add_argument('--kernels', action='store_true', help='run the float kernels of `source.kernels` instead of the exact engine')
+    engines.add_argument('--threads', action='store_true', help='run independent industries and communes on a thread pool when the interpreter is free-threaded')
+    args = parser.parse_args()
+
     context = Context(rounding=ROUND_HALF_DOWN, traps=[DivisionByZero, InvalidOperation])
 
     if False:
@@ -108,4 +138,32 @@ if __name__ == '__main__':
         exit()
 
     setcontext(context)
-    main()
+    set_validation(Validation[args.validation.upper()])
+
+    if args.resume:
+        world = None  # The checkpoint holds it.
+
+    elif args.scale is None:
+        from source.scenario import load_scenario
+        world = load_scenario(args.scenario).world
+
+    else:
+        world = scaled_world(args.scale, args.seed)
+
+    if args.kernels:
+        from source.kernels import tick as engine
+
+    elif args.threads:
+        from source.parallel import tick as engine
+
+    else:
+        engine = tick
+
+    monitor = None if args.converge is None else Monitor(args.converge, args.window)
+
+    main(args.ticks, record=not args.no_record, plot=not args.headless, data_dir=args.output, world=world, engine=engine,
+         checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every, resume=args.resume, monitor=monitor,
+         fast_forward=args.fast_forward)
+
+    if monitor is not None:
+        print('Did not converge.' if monitor.converged_at is None else f'Converged at tick {monitor.converged_at}.')
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Callable, Hashable, ItemsView, Iterator, KeysView, Self, ValuesView
 from source.exceptions import NegativeAmountError
+from source import validation
 from abc import ABC, abstractmethod
 from collections import UserDict
 from decimal import Decimal
@@ -13,6 +14,7 @@ class Group[T: "Group"](ABC):
     a physical quantity; you cannot have negative two apples.
 
     `_scrutinize` needs to be overwritten on all subclass after the supercall. Different subclass will need to check things particular to them.
+    It is only called when the validation level is `FULL`, see `source.validation`.
     `_iadd` and `_isub` are inside in a template pattern to add all the adding and subtracting functionality. 
     """
 
@@ -53,7 +55,9 @@ class Group[T: "Group"](ABC):
         ...
 
     def __iadd__(self, __value: T) -> Self:
-        self._scrutinize(__value)
+        if validation.full:
+            self._scrutinize(__value)
+
         self._iadd(__value)
         return self
 
@@ -67,7 +71,9 @@ class Group[T: "Group"](ABC):
         ...
     
     def __isub__(self, __value: T) -> Self:
-        self._scrutinize(__value, sub=True)
+        if validation.full:
+            self._scrutinize(__value, sub=True)
+
         self._isub(__value)
         return self
 
@@ -77,7 +83,9 @@ class Group[T: "Group"](ABC):
         return new  # type: ignore
 
     def __imul__(self, __value: Decimal) -> Self:
-        self._scrutinize(__value, mul=True)
+        if validation.full:
+            self._scrutinize(__value, mul=True)
+
         quantity: Decimal = getattr(self, self._amount_attr)
 
         product = quantity * __value
@@ -90,7 +98,9 @@ class Group[T: "Group"](ABC):
         return new  # type: ignore
 
     def __itruediv__(self, __value: Decimal) -> Self:
-        self._scrutinize(__value, div=True)
+        if validation.full:
+            self._scrutinize(__value, div=True)
+
         quantity: Decimal = getattr(self, self._amount_attr)
 
         quotient = quantity / __value
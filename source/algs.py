@@ -1,14 +1,15 @@
 from __future__ import annotations
-from source.pop import PopFactory, CommuneFactory, Strata
+from source.pop import Commune, PopFactory, Strata
 from decimal import Decimal, getcontext
 from typing import TYPE_CHECKING, Callable
 from source.goods import create_stock
+from source.pool import temporary
 from source.goods import Stock
 import copy
 D = getcontext().create_decimal
 
 if TYPE_CHECKING:
-    from source.pop import Commune, Pop
+    from source.pop import Pop
     from source.prod import Industry
 
 # ===================== Sharing algorithms =====================
@@ -19,11 +20,12 @@ def _sub_stock(real_stockpile: Stock, calc_stockpile: Stock, consumption: Stock,
     """
     This function subtracts from a `stockpile` object representing an actual stockpile all it can subtract from 
     another consumption `Stock` object. All the negative amount check are already done in the stockpile class 
-    through the `NegativeAmountError` exception.
+    through the `NegativeAmountError` exception. The shares `calc_stockpile` is cut into can round above what the real stockpile
+    holds in their last digit, so the amount removed never exceeds the real stockpile either.
     """
 
     for product, wanted_good in consumption.items():
-        removed = min(wanted_good, calc_stockpile[product])
+        removed = min(wanted_good, calc_stockpile[product], real_stockpile[product])
         real_stockpile[product] -= removed
 
 def first_in_first_served(community: Commune, stockpile: Stock, /):
@@ -74,22 +76,19 @@ def rich_first(community: Commune, stockpile: Stock, /):
             pop.update_welfare(consumption, divided)  # type: ignore
             _sub_stock(stockpile, divided, consumption)  # type: ignore
 
+# The share of the stock `proportional` offers each stratum, in the order the strata are served.
+PROPORTIONAL_WEIGHTS = {Strata.UPPER: D('.50'), Strata.MIDDLE: D('.35'), Strata.LOWER: D('.15')}
+
 def proportional(community: Commune, stockpile: Stock, /):
     """
     Iterates with stratum priority, but each stratum only gets a fixed amount of the stock. If the stratum does not consume
     the entire stock, it is then added to the next stratum's stock.
     """
     
-    UPPER_WEIGHT  = D('.50')
-    MIDDLE_WEIGHT = D('.35')
-    LOWER_WEIGHT  = D('.15')
-
-    stockpiles = {Strata.UPPER: Stock({good: amount * UPPER_WEIGHT for good, amount in stockpile.items()}),
-                  Strata.MIDDLE: Stock({good: amount * MIDDLE_WEIGHT for good, amount in stockpile.items()}),
-                  Strata.LOWER: Stock({good: amount * LOWER_WEIGHT for good, amount in stockpile.items()})}
+    stockpiles = {stratum: Stock({good: amount * weight for good, amount in stockpile.items()}) for stratum, weight in PROPORTIONAL_WEIGHTS.items()}
     
     left_overs = create_stock()
-    for stratum in (Strata.UPPER, Strata.MIDDLE, Strata.LOWER):
+    for stratum in PROPORTIONAL_WEIGHTS:
         current_community = community[stratum]
         stockpiles[stratum] += left_overs
 
@@ -116,7 +115,7 @@ type balance_alg = Callable[[Industry], Commune]
 def _get_removed(desired_share: Decimal, total_size: Decimal, pop: Pop, /) -> Pop:
     """ Refer to the formulas index. """
 
-    return PopFactory.job_makepop(pop.job, - ((desired_share * total_size - pop.size) / (1 + desired_share)), pop.welfare)
+    return PopFactory.trusted_job_makepop(pop.job, - ((desired_share * total_size - pop.size) / (1 + desired_share)), pop.welfare)
 
 def retrospective(ext: Industry, /) -> Commune:
     """ 
@@ -128,7 +127,7 @@ def retrospective(ext: Industry, /) -> Commune:
     as it unemploys pops trying to make those 0 pops of a job it doesn't have reach the desired share.
     """
 
-    total_unemployed = CommuneFactory.create_by_job()
+    total_unemployed = temporary(Commune)
 
     for job, pop in ext.workforce.items():
         if ext.workforce.get_share_of(job) > ext.efficient_shares[job]:  # type: ignore
@@ -146,7 +145,7 @@ def iterative(ext: Industry, /):
     
     ITERATIONS = 3
 
-    total_unemployed = CommuneFactory.create_by_job()
+    total_unemployed = temporary(Commune)
 
     for _ in range(ITERATIONS):
         total_unemployed += retrospective(ext)
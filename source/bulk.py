@@ -0,0 +1,271 @@
+"""
+Builds communes, industries and whole worlds from tables instead of one object at a time through the factories.
+
+A table is any of a `dict` of equally long sequences or NumPy arrays, a NumPy structured array, a pandas `DataFrame` or a pyarrow
+`Table`. Columns of enums accept members, names or values, and numeric columns accept numbers or strings, the latter being converted
+to `Decimal` exactly. Every row is checked at once with NumPy, unless the validation level is `OFF`, and the first problem found
+raises the same exception type the factories would, naming the offending rows.
+"""
+
+from __future__ import annotations
+from collections.abc import Mapping
+from decimal import Decimal, getcontext
+from enum import Enum
+from random import Random
+from typing import Any, Optional
+from source.exceptions import NegativeAmountError
+from source.goods import Products, Stock, Techs, create_stock
+from source.pop import Commune, Jobs, Pop, Strata
+from source.prod import Extractor, Industry, Manufactury
+from source.world import World
+from source import validation
+import numpy as np
+D = getcontext().create_decimal
+
+type table = Any  # See the module docstring.
+
+NEEDED_PREFIX = 'needed_'  # Industry columns `needed_FARMER`, `needed_SPECIALIST`... hold the workers each industry needs.
+STOCK_PREFIX = 'stock_'  # Industry columns `stock_WHEAT`, `stock_IRON`... hold the initial stockpile of each manufactury.
+JOBLESS = -1  # The `commune` of the jobless pops in the table passed to `world_from_tables`.
+
+def _columns(data: table, /) -> dict[str, np.ndarray]:
+    if hasattr(data, 'column_names'):  # pyarrow.Table
+        columns = {name: data.column(name).to_numpy() for name in data.column_names}
+
+    elif isinstance(data, np.ndarray) and data.dtype.names is not None:
+        columns = {name: data[name] for name in data.dtype.names}
+
+    elif hasattr(data, 'columns') and hasattr(data, 'to_numpy'):  # pandas.DataFrame
+        columns = {str(name): data[name].to_numpy() for name in data.columns}
+
+    elif isinstance(data, Mapping):
+        columns = {str(name): np.asarray(values) for name, values in data.items()}
+
+    else:
+        raise TypeError(f'{type(data).__name__} type is not a table.')
+
+    if len({len(values) for values in columns.values()}) > 1:
+        raise ValueError('All the columns of a table must have the same length.')
+
+    return columns
+
+def _rows(mask: np.ndarray, /) -> str:
+    rows = np.flatnonzero(mask)
+    return f'rows {rows[:10].tolist()}' + (f' and {len(rows) - 10} more' if len(rows) > 10 else '')
+
+def _required(columns: dict[str, np.ndarray], name: str, /) -> np.ndarray:
+    try:
+        return columns[name]
+
+    except KeyError:
+        raise ValueError(f'The table has no `{name}` column.') from None
+
+def _members[E: Enum](enum: type[E], values: np.ndarray, name: str, /) -> list[E]:
+    """ Parses every distinct value of the column once and maps the rows to the parsed members. """
+
+    values = values.tolist()
+    lookup: dict[object, E] = {}
+    invalid = []
+
+    for value in set(values):
+        if isinstance(value, enum):
+            lookup[value] = value
+
+        elif isinstance(value, str) and value.upper() in enum.__members__:
+            lookup[value] = enum[value.upper()]
+
+        elif isinstance(value, int) and not isinstance(value, bool) and value in enum._value2member_map_:
+            lookup[value] = enum(value)
+
+        else:
+            invalid.append(value)
+
+    if invalid:
+        raise ValueError(f'The `{name}` column has values that are not `{enum.__name__}`: {invalid[:10]}.')
+
+    return [lookup[value] for value in values]
+
+def _numbers(values: np.ndarray, name: str, /, upper: Optional[float] = None) -> np.ndarray:
+    """ Checks that the column is numeric, finite, non-negative and, if passed, not above `upper`. """
+
+    try:
+        numbers = values.astype(float)
+
+    except (TypeError, ValueError):
+        raise TypeError(f'The `{name}` column is not numeric.') from None
+
+    if not validation.boundary:
+        return numbers
+
+    invalid = ~np.isfinite(numbers)
+    if invalid.any():
+        raise ValueError(f'The `{name}` column is not finite on {_rows(invalid)}.')
+
+    negative = numbers < 0
+    if negative.any():
+        raise NegativeAmountError(f'The `{name}` column is negative on {_rows(negative)}.')
+
+    if upper is not None and (above := numbers > upper).any():
+        raise ValueError(f'The `{name}` column is above {upper} on {_rows(above)}.')
+
+    return numbers
+
+def _decimals(values: np.ndarray, /) -> list[Decimal]:
+    return [D(value) for value in values.tolist()]
+
+def communes_from_table(data: table, count: Optional[int] = None, /) -> list[Commune]:
+    """
+    Builds `count` communes, by default as many as the largest `commune` in the table plus one, from a table of pops with the
+    columns `commune`, `job` and `size`, and optionally `welfare` and `stratum`. Rows of the `UNEMPLOYED` job are unemployed pops of
+    their `stratum`, which is otherwise the job's and must match it when passed.
+
+    Each commune may only have one row per job or unemployed stratum, and pops of size zero are left out, like the factories do.
+    """
+
+    columns = _columns(data)
+    commune_ids = _required(columns, 'commune')
+    jobs = _members(Jobs, _required(columns, 'job'), 'job')
+    sizes = _numbers(_required(columns, 'size'), 'size')
+    welfares = _numbers(columns['welfare'], 'welfare', 1) if 'welfare' in columns else None
+
+    if not np.issubdtype(commune_ids.dtype, np.integer):
+        raise TypeError('The `commune` column must hold integers.')
+
+    count = int(commune_ids.max()) + 1 if count is None and len(commune_ids) else count or 0
+
+    if validation.boundary and ((outside := (commune_ids < 0) | (commune_ids >= count)).any()):
+        raise ValueError(f'The `commune` column is outside [0, {count}) on {_rows(outside)}.')
+
+    if 'stratum' in columns:
+        strata = _members(Strata, columns['stratum'], 'stratum')
+        mismatch = np.fromiter((job != Jobs.UNEMPLOYED and job.stratum != stratum for job, stratum in zip(jobs, strata)), bool, len(jobs))
+
+        if mismatch.any():
+            raise ValueError(f'The `stratum` column does not match the job on {_rows(mismatch)}.')
+
+    elif Jobs.UNEMPLOYED in jobs:
+        raise ValueError('Unemployed pops need a `stratum` column.')
+
+    else:
+        strata = [job.stratum for job in jobs]
+
+    # Jobs and unemployed strata share one code space so that duplicated keys can be found along with the commune.
+    codes = np.fromiter((job.value if job != Jobs.UNEMPLOYED else len(Jobs) + stratum.value for job, stratum in zip(jobs, strata)), np.int64, len(jobs))
+    pairs = commune_ids.astype(np.int64) * (len(Jobs) + len(Strata) + 1) + codes
+    unique, first, occurrences = np.unique(pairs, return_index=True, return_counts=True)
+
+    if (occurrences > 1).any():
+        duplicated = np.isin(pairs, unique[occurrences > 1])
+        duplicated[first[occurrences > 1]] = False
+        raise ValueError(f'The table repeats a job or unemployed stratum of a commune on {_rows(duplicated)}.')
+
+    keep = np.flatnonzero(sizes > 0)
+    size_list = _decimals(columns['size'][keep])
+    welfare_list = [Pop.BASE_WELFARE] * len(keep) if welfares is None else _decimals(columns['welfare'][keep])
+
+    pops: list[dict[Jobs | tuple[Strata, Jobs], Pop]] = [{} for _ in range(count)]
+
+    for row, size, welfare in zip(keep.tolist(), size_list, welfare_list):
+        job, stratum = jobs[row], strata[row]
+        key = job if job != Jobs.UNEMPLOYED else (stratum, Jobs.UNEMPLOYED)
+        pops[commune_ids[row]][key] = Pop(size, welfare, stratum, job)
+
+    communes = []
+    for init_dict in pops:
+        # The keys were checked above, so they are put in place directly instead of going through `Dyct.__setitem__`.
+        commune = Commune({})
+        commune.data = init_dict
+        communes.append(commune)
+
+    return communes
+
+def industries_from_table(data: table, workforces: Optional[list[Commune]] = None, /) -> list[Industry]:
+    """
+    Builds one industry per row of a table with the columns `product` and one `needed_<JOB>` column for each job any industry
+    needs, and optionally `tech`, which defaults to `EXTRACTION`, and `stock_<PRODUCT>` columns with the initial stockpile of each
+    manufactury. Jobs an industry needs zero of are not part of its `needed_workers`, so every row needs some worker.
+
+    `workforces` are the communes working for each industry, by default empty ones.
+    """
+
+    columns = _columns(data)
+    products = _members(Products, _required(columns, 'product'), 'product')
+    techs = _members(Techs, columns['tech'], 'tech') if 'tech' in columns else [Techs.EXTRACTION] * len(products)
+
+    needed_columns = {Jobs[name.removeprefix(NEEDED_PREFIX)]: name for name in columns
+                      if name.startswith(NEEDED_PREFIX) and name.removeprefix(NEEDED_PREFIX) in Jobs.__members__}
+    stock_columns = {Products[name.removeprefix(STOCK_PREFIX)]: name for name in columns
+                     if name.startswith(STOCK_PREFIX) and name.removeprefix(STOCK_PREFIX) in Products.__members__}
+
+    if Jobs.UNEMPLOYED in needed_columns:
+        raise ValueError(f'Industries cannot need {Jobs.UNEMPLOYED.name} workers.')
+
+    if not needed_columns:
+        raise ValueError(f'The table has no `{NEEDED_PREFIX}<JOB>` columns.')
+
+    needed = {job: _numbers(columns[name], name) for job, name in needed_columns.items()}
+    stocks = {product: _numbers(columns[name], name) for product, name in stock_columns.items()}
+
+    if validation.boundary:
+        unknown = {(product, tech) for product, tech in set(zip(products, techs)) if tech not in product.techs}
+        if unknown:
+            raise ValueError(f'Some products cannot be made with their tech: {sorted((p.name, t.name) for p, t in unknown)}.')
+
+        idle = sum(needed.values()) == 0  # type: ignore
+        if idle.any():
+            raise ValueError(f'Industries need some worker, but none are needed on {_rows(idle)}.')
+
+        extracting = np.fromiter((tech == Techs.EXTRACTION for tech in techs), bool, len(techs))
+        stocked = extracting & np.any([amounts > 0 for amounts in stocks.values()] or [np.zeros(len(techs), bool)], axis=0)
+        if stocked.any():
+            raise ValueError(f'Only manufacturies have stockpiles, but extractors have stock on {_rows(stocked)}.')
+
+    if workforces is None:
+        workforces = [Commune({}) for _ in products]
+
+    elif len(workforces) != len(products):
+        raise ValueError(f'{len(workforces)} workforces were passed for {len(products)} industries.')
+
+    needed_lists = {job: _decimals(columns[name]) for job, name in needed_columns.items()}
+    stock_lists = {product: _decimals(columns[name]) for product, name in stock_columns.items()}
+    techs_by_product = {product: product.techs for product in set(products)}
+
+    industries: list[Industry] = []
+
+    for row, (product, tech, workforce) in enumerate(zip(products, techs, workforces)):
+        needed_workers = {job: amounts[row] for job, amounts in needed_lists.items() if amounts[row] > 0}
+        production = techs_by_product[product][tech]
+
+        if tech == Techs.EXTRACTION:
+            industries.append(Extractor(product, tech, production, needed_workers, workforce))
+
+        else:
+            stockpile = create_stock({product: amounts[row] for product, amounts in stock_lists.items() if amounts[row] > 0})
+            industries.append(Manufactury(product, tech, production, needed_workers, workforce, stockpile))
+
+    return industries
+
+def world_from_tables(industries: table, pops: table, /,
+                      common_stock: Optional[Stock] = None,
+                      settlements: int = 0,
+                      rng: Optional[Random] = None) -> World:
+    """
+    Builds a whole world in one call. The `commune` of each pop is the row of the industry it works for, or `len(industries) + i`
+    for the `i`-th of the `settlements`, or `JOBLESS`.
+    """
+
+    industry_count = len(next(iter(_columns(industries).values()), ()))
+    pop_columns = _columns(pops)
+    commune_ids = _required(pop_columns, 'commune')
+
+    if not np.issubdtype(commune_ids.dtype, np.integer):
+        raise TypeError('The `commune` column must hold integers.')
+
+    # The jobless pops are moved to the last commune, right after the settlements.
+    pop_columns['commune'] = np.where(commune_ids == JOBLESS, industry_count + settlements, commune_ids)
+    communes = communes_from_table(pop_columns, industry_count + settlements + 1)
+
+    built = industries_from_table(industries, communes[:industry_count])
+    common_stock = create_stock() if common_stock is None else common_stock
+
+    return World.create(built, common_stock, communes[-1], rng, communes[industry_count:-1])
@@ -0,0 +1,336 @@
+"""
+Checkpoints of a whole simulation, so that a long run that dies can be resumed where its last checkpoint left it and go on exactly as
+if it never stopped.
+
+A checkpoint holds the installed rules, the techs of every product and the needs of every stratum, which `load` installs again. It
+also holds every industry with its workforce and stockpile, the common stock, the jobless pops and settlements, the state of the
+world's `Random` and the order of `industries`, `manufacturies` and `communes`, which the tick phases shuffle and iterate in and so
+decide how every amount is rounded. When the run is recorded, it also holds the position of its `DataManager`: how many times each
+`record_*` method was called, how many rows were already flushed to the CSV files, inserted into the SQLite database and appended to
+the binary history, and the rows that were not flushed, which is enough to reload the flushed rows from those files on resume. When
+the run stops once it converges, it also holds the window of totals its `Monitor` has seen, so that it tells convergence at the same
+tick as if it never stopped.
+
+Objects are written with `Codec.EXACT` of `source.codec`, so every `Decimal` is read back exactly as it was. `save` writes to a
+temporary file and moves it over the previous checkpoint with `os.replace`, so a run that dies while saving leaves the previous
+checkpoint whole.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from random import Random
+from typing import TYPE_CHECKING, Optional
+from source.codec import decode, encode
+from source.goods import TECHS, Products, Techs, Technology
+from source.pop import NEEDS, Commune, Strata
+from source.prod import Industry, Manufactury
+from source.world import World
+import os
+import struct
+
+if TYPE_CHECKING:
+    from source.convergence import Monitor
+    from visual.gather import DataManager
+
+MAGIC = b'ESCK'
+VERSION = 4  # Bump whenever the layout changes. Older checkpoints are rejected rather than misread.
+HEADER = struct.Struct('<4sBQ')  # Magic, version and the ticks run so far.
+RNG = struct.Struct('<B625I?d')  # Version, Mersenne Twister state, whether a Gaussian is cached and that Gaussian.
+INLINE = -1  # Reference of a commune that is not the workforce of any industry, which is written where it is referenced.
+
+@dataclass
+class Position:
+    """ Where a `DataManager` is in its recording, by data key. `pending` are the rows recorded since the last flush to the CSV files. """
+
+    every: int
+    aggregate: Optional[str]
+    calls: dict[str, int] = field(default_factory=dict)
+    flushed: dict[str, int] = field(default_factory=dict)
+    stored: dict[str, int] = field(default_factory=dict)  # Rows already inserted into the SQLite database.
+    appended: dict[str, int] = field(default_factory=dict)  # Rows already appended to the binary history.
+    pending: dict[str, list[list[Decimal]]] = field(default_factory=dict)
+    windows: dict[str, list[list[Decimal]]] = field(default_factory=dict)
+
+@dataclass
+class Checkpoint:
+    """
+    A simulation after `ticks` ticks. `recorded` are the industries and communes the `DataManager` of the run recorded, in the order
+    that gives back the same `DataManager`, and `position` is where it was, both `None` if the run was not recorded. `window` is the
+    `Monitor.history` of the run, `None` if it was not monitored.
+    """
+
+    world: World
+    ticks: int
+    recorded: Optional[tuple[Industry | Commune, ...]] = None
+    position: Optional[Position] = None
+    window: Optional[list[list[Decimal]]] = None
+
+# ===================== Writing =====================
+
+class _Writer:
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def pack(self, format: str, /, *values) -> None:
+        self.data += struct.pack('<' + format, *values)
+
+    def blob(self, data: bytes, /) -> None:
+        self.pack('I', len(data))
+        self.data += data
+
+    def text(self, text: str, /) -> None:
+        self.blob(text.encode('utf-8'))
+
+    def rows(self, rows: list[list[Decimal]], /) -> None:
+        self.pack('I', len(rows))
+        for row in rows:
+            self.blob(encode(row))
+
+def _write_rules(writer: _Writer, /) -> None:
+    writer.pack('I', len(TECHS))
+    for product, techs in TECHS.items():
+        writer.pack('BI', product.value, len(techs))
+
+        for tech, technology in techs.items():
+            recipe = technology.recipe if technology.has_recipe else {}
+            writer.pack('BB', tech.value, len(recipe))
+            writer.data += bytes(ingredient.value for ingredient in recipe)
+            writer.blob(encode([technology.base_yield, *recipe.values()]))
+
+    writer.pack('I', len(NEEDS))
+    for stratum, needs in NEEDS.items():
+        writer.pack('BB', stratum.value, len(needs))
+        writer.data += bytes(product.value for product in needs)
+        writer.blob(encode(list(needs.values())))
+
+def _write_rng(writer: _Writer, rng: Random, /) -> None:
+    version, internal, gauss = rng.getstate()
+    writer.data += RNG.pack(version, *internal, gauss is not None, 0.0 if gauss is None else gauss)
+
+def _write_world(writer: _Writer, world: World, /) -> None:
+    _write_rng(writer, world.rng)
+
+    industries = {id(industry): index for index, industry in enumerate(world.industries)}
+    workforces = {id(industry.workforce): index for index, industry in enumerate(world.industries)}
+
+    writer.pack('I', len(world.industries))
+    for industry in world.industries:
+        writer.blob(encode(industry))
+
+    writer.pack('I', len(world.manufacturies))
+    for manufactury in world.manufacturies:
+        writer.pack('I', industries[id(manufactury)])
+
+    writer.pack('I', len(world.communes))
+    for commune in world.communes:
+        reference = workforces.get(id(commune), INLINE)
+        writer.pack('i', reference)
+
+        if reference == INLINE:
+            writer.blob(encode(commune))
+
+    writer.pack('I', next(index for index, commune in enumerate(world.communes) if commune is world.jobless_pops))
+    writer.blob(encode(world.common_stock))
+
+def _write_recorder(writer: _Writer, world: World, recorder: DataManager, /) -> None:
+    # Industries are referenced by their index and other communes by their index in `communes`, offset below zero.
+    references = {id(industry): index for index, industry in enumerate(world.industries)}
+    references.update((id(commune), -1 - index) for index, commune in enumerate(world.communes))
+    recorded = (*recorder.manufacturies, *recorder.extractors, *recorder.communes)
+
+    writer.pack('I', len(recorded))
+    for thing in recorded:
+        writer.pack('i', references[id(thing)])
+
+    position = recorder.position()
+    writer.pack('I', position.every)
+    writer.text(position.aggregate or '')
+
+    writer.pack('I', len(position.calls))
+    for key in position.calls:
+        writer.text(key)
+        writer.pack('QQQQ', position.calls[key], position.flushed[key], position.stored[key], position.appended[key])
+        writer.rows(position.pending[key])
+        writer.rows(position.windows[key])
+
+def save(path: Path, world: World, ticks: int, /, recorder: Optional[DataManager] = None, monitor: Optional[Monitor] = None) -> None:
+    """
+    Checkpoints `world` after `ticks` ticks, along with the position of `recorder` if the run is recorded and the window of `monitor`
+    if it is monitored, which must already have observed the world after `ticks` ticks. The rows `recorder` has flushed must already
+    be on disk, so join its `BackgroundWriter` first.
+    """
+
+    writer = _Writer()
+    writer.data += HEADER.pack(MAGIC, VERSION, ticks)
+    _write_rules(writer)
+    _write_world(writer, world)
+    writer.pack('?', recorder is not None)
+
+    if recorder is not None:
+        _write_recorder(writer, world, recorder)
+
+    writer.pack('?', monitor is not None)
+
+    if monitor is not None:
+        writer.rows(list(monitor.history))
+
+    temporary = path.with_name(path.name + '.tmp')
+
+    with open(temporary, 'wb') as file:
+        file.write(writer.data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary, path)
+
+# ===================== Reading =====================
+
+class _Reader:
+    def __init__(self, data: bytes, /) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, format: str, /) -> tuple:
+        values = struct.unpack_from('<' + format, self.data, self.offset)
+        self.offset += struct.calcsize('<' + format)
+        return values
+
+    def blob(self) -> memoryview:
+        length, = self.unpack('I')
+        data = self.data[self.offset:self.offset + length]
+        self.offset += length
+
+        if len(data) < length:
+            raise ValueError('The checkpoint is truncated.')
+
+        return data
+
+    def text(self) -> str:
+        return bytes(self.blob()).decode('utf-8')
+
+    def rows(self) -> list[list[Decimal]]:
+        count, = self.unpack('I')
+        return [decode(self.blob()) for _ in range(count)]
+
+    def members[E: Enum](self, enum: type[E], count: int, /) -> list[E]:
+        values = self.data[self.offset:self.offset + count]
+        self.offset += count
+
+        if len(values) < count:
+            raise ValueError('The checkpoint is truncated.')
+
+        return [enum(value) for value in values]
+
+def _read_rules(reader: _Reader, /) -> tuple[dict[Products, dict[Techs, Technology]], dict[Strata, dict[Products, Decimal]]]:
+    techs: dict[Products, dict[Techs, Technology]] = {}
+    count, = reader.unpack('I')
+
+    for _ in range(count):
+        product_value, tech_count = reader.unpack('BI')
+        product_techs = techs[Products(product_value)] = {}
+
+        for _ in range(tech_count):
+            tech_value, recipe_count = reader.unpack('BB')
+            ingredients = reader.members(Products, recipe_count)
+            base_yield, *shares = decode(reader.blob())
+            product_techs[Techs(tech_value)] = Technology(base_yield, dict(zip(ingredients, shares)) if ingredients else None)
+
+    needs: dict[Strata, dict[Products, Decimal]] = {}
+    count, = reader.unpack('I')
+
+    for _ in range(count):
+        stratum_value, need_count = reader.unpack('BB')
+        products = reader.members(Products, need_count)
+        needs[Strata(stratum_value)] = dict(zip(products, decode(reader.blob())))
+
+    return techs, needs
+
+def _read_rng(reader: _Reader, /) -> Random:
+    version, *internal, has_gauss, gauss = RNG.unpack_from(reader.data, reader.offset)
+    reader.offset += RNG.size
+
+    rng = Random()
+    rng.setstate((version, tuple(internal), gauss if has_gauss else None))
+    return rng
+
+def _read_world(reader: _Reader, /) -> World:
+    rng = _read_rng(reader)
+
+    count, = reader.unpack('I')
+    industries: list[Industry] = [decode(reader.blob()) for _ in range(count)]
+
+    count, = reader.unpack('I')
+    manufacturies: list[Manufactury] = [industries[reader.unpack('I')[0]] for _ in range(count)]  # type: ignore
+
+    communes: list[Commune] = []
+    count, = reader.unpack('I')
+    for _ in range(count):
+        reference, = reader.unpack('i')
+        communes.append(decode(reader.blob()) if reference == INLINE else industries[reference].workforce)
+
+    jobless, = reader.unpack('I')
+    common_stock = decode(reader.blob())
+
+    return World(industries, manufacturies, communes, common_stock, communes[jobless], rng)
+
+def _read_recorder(reader: _Reader, world: World, /) -> tuple[tuple[Industry | Commune, ...], Position]:
+    count, = reader.unpack('I')
+    recorded = tuple(world.industries[reference] if reference >= 0 else world.communes[-1 - reference]
+                     for reference, in (reader.unpack('i') for _ in range(count)))
+
+    every, = reader.unpack('I')
+    position = Position(every, reader.text() or None)
+
+    count, = reader.unpack('I')
+    for _ in range(count):
+        key = reader.text()
+        position.calls[key], position.flushed[key], position.stored[key], position.appended[key] = reader.unpack('QQQQ')
+        position.pending[key] = reader.rows()
+        position.windows[key] = reader.rows()
+
+    return recorded, position
+
+def load(path: Path, /) -> Checkpoint:
+    """ Reads the checkpoint in `path` and installs the rules it was written under, like `source.scenario.Scenario.install`. """
+
+    from source.scenario import Scenario
+
+    reader = _Reader(path.read_bytes())
+    previous = dict(TECHS), dict(NEEDS)
+
+    try:
+        magic, version, ticks = reader.unpack('4sBQ')
+
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a checkpoint.')
+
+        if version != VERSION:
+            raise ValueError(f'Checkpoints of version {version} cannot be read, only those of version {VERSION}.')
+
+        # The industries take their technologies from the installed rules, so the rules are installed first and put back on failure.
+        techs, needs = _read_rules(reader)
+        Scenario(techs, needs, None).install()  # type: ignore
+
+        checkpoint = Checkpoint(_read_world(reader), ticks)
+        recorded, = reader.unpack('?')
+
+        if recorded:
+            checkpoint.recorded, checkpoint.position = _read_recorder(reader, checkpoint.world)
+
+        monitored, = reader.unpack('?')
+
+        if monitored:
+            checkpoint.window = reader.rows()
+
+    except Exception as error:
+        Scenario(*previous, None).install()  # type: ignore
+
+        if isinstance(error, struct.error):
+            raise ValueError('The checkpoint is truncated.') from None
+
+        raise
+
+    return checkpoint
@@ -0,0 +1,291 @@
+"""
+A compact, versioned binary encoding of `Good`, `Stock`, `Pop`, `Commune` and `Industry` objects, and of plain lists of amounts, for
+IPC, caches and checkpoints.
+
+Every encoding starts with a header holding `MAGIC`, `VERSION`, the codec and the kind of object. Enum members are written as their
+values and amounts in one of two codecs:
+
+- `Codec.EXACT` writes every `Decimal` as its sign, exponent and coefficient, so decoding gives back the exact same number.
+- `Codec.FLOAT` writes amounts as aligned blocks of little-endian doubles, which `decode_arrays` turns into NumPy arrays that are
+  views of the encoded bytes instead of copies.
+
+A `Pop` takes about 25 bytes and an `Extractor` about 80, where their pickles take over 150 and 500.
+"""
+
+from __future__ import annotations
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from source.goods import Good, Products, Stock, Techs, trusted_good
+from source.pop import Commune, Jobs, Pop, Strata
+from source.prod import Extractor, Industry, Manufactury
+import numpy as np
+import struct
+
+MAGIC = b'ESIM'
+VERSION = 1  # Bump whenever the layout of any kind changes. Older encodings are rejected rather than misread.
+HEADER = struct.Struct('<4sBBB')  # Magic, version, codec and kind.
+ALIGNMENT = 8  # Float blocks start at multiples of this from the start of the encoding, so that they can be viewed in place.
+
+# The values of these enums are written to the encoding, so they must never change.
+
+class Codec(Enum):
+    EXACT = 1
+    FLOAT = 2
+
+class Kind(Enum):
+    GOOD = 1
+    STOCK = 2
+    POP = 3
+    COMMUNE = 4
+    INDUSTRY = 5
+    AMOUNTS = 6
+
+class _Writer:
+    def __init__(self, codec: Codec, kind: Kind, /) -> None:
+        self.codec = codec
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, codec.value, kind.value))
+
+    def pack(self, format: str, /, *values) -> None:
+        self.data += struct.pack('<' + format, *values)
+
+    def members(self, members: list[Enum], /) -> None:
+        self.pack('I', len(members))
+        self.data += bytes(member.value for member in members)
+
+    def amounts(self, amounts: list[Decimal], /) -> None:
+        if self.codec == Codec.FLOAT:
+            self.data += bytes(-len(self.data) % ALIGNMENT)
+            self.pack(f'{len(amounts)}d', *amounts)
+            return
+
+        for amount in amounts:
+            sign, digits, exponent = amount.as_tuple()
+
+            if not isinstance(exponent, int):
+                raise ValueError(f'{amount} cannot be encoded, only finite amounts can.')
+
+            coefficient = int(''.join(map(str, digits)))
+            length = (coefficient.bit_length() + 7) // 8
+            self.pack('BiB', sign, exponent, length)
+            self.data += coefficient.to_bytes(length, 'little')
+
+class _Reader:
+    def __init__(self, data: bytes | memoryview, /) -> None:
+        self.data = memoryview(data)
+
+        try:
+            magic, version, codec, kind = HEADER.unpack_from(self.data)
+
+        except struct.error:
+            raise ValueError('The data is too short to be an encoding.') from None
+
+        if magic != MAGIC:
+            raise ValueError('The data is not an encoding.')
+
+        if version != VERSION:
+            raise ValueError(f'Encodings of version {version} cannot be read, only those of version {VERSION}.')
+
+        self.codec = Codec(codec)
+        self.kind = Kind(kind)
+        self.offset = HEADER.size
+
+    def unpack(self, format: str, /) -> tuple:
+        values = struct.unpack_from('<' + format, self.data, self.offset)
+        self.offset += struct.calcsize('<' + format)
+        return values
+
+    def members[E: Enum](self, enum: type[E], /) -> list[E]:
+        count, = self.unpack('I')
+        values = self.data[self.offset:self.offset + count]
+        self.offset += count
+
+        if len(values) < count:
+            raise ValueError('The encoding is truncated.')
+
+        return [enum(value) for value in values]
+
+    def float_block(self, count: int, /) -> np.ndarray:
+        self.offset += -self.offset % ALIGNMENT
+        block = np.frombuffer(self.data, '<f8', count, self.offset)
+        self.offset += count * ALIGNMENT
+        return block
+
+    def amounts(self, count: int, /) -> list[Decimal]:
+        if self.codec == Codec.FLOAT:
+            return [Decimal(value) for value in self.float_block(count).tolist()]
+
+        amounts = []
+        for _ in range(count):
+            sign, exponent, length = self.unpack('BiB')
+            encoded = self.data[self.offset:self.offset + length]
+            self.offset += length
+
+            if len(encoded) < length:
+                raise ValueError('The encoding is truncated.')
+
+            coefficient = int.from_bytes(encoded, 'little')
+            amounts.append(Decimal((sign, tuple(map(int, str(coefficient))), exponent)))
+
+        return amounts
+
+# ===================== Bodies =====================
+
+def _write_stock(writer: _Writer, stock: Stock, /) -> None:
+    writer.members(list(stock.keys()))
+    writer.amounts([good.amount for good in stock.values()])
+
+def _read_stock(reader: _Reader, /) -> Stock:
+    products = reader.members(Products)
+    stock = Stock({})
+    stock.data = {product: trusted_good(product, amount) for product, amount in zip(products, reader.amounts(len(products)))}
+    return stock
+
+def _write_commune(writer: _Writer, commune: Commune, /) -> None:
+    pops = list(commune.values())
+    writer.members([pop.job for pop in pops])
+    writer.members([pop.stratum for pop in pops])
+    writer.amounts([pop.size for pop in pops])
+    writer.amounts([pop.welfare for pop in pops])
+
+def _read_commune(reader: _Reader, /) -> Commune:
+    jobs = reader.members(Jobs)
+    strata = reader.members(Strata)
+    sizes = reader.amounts(len(jobs))
+    welfares = reader.amounts(len(jobs))
+
+    commune = Commune({})
+    commune.data = {(job if job != Jobs.UNEMPLOYED else (stratum, job)): Pop(size, welfare, stratum, job)
+                    for job, stratum, size, welfare in zip(jobs, strata, sizes, welfares)}
+    return commune
+
+def _write_industry(writer: _Writer, industry: Industry, /) -> None:
+    writer.pack('BB', industry.product.value, industry.prod_tech.value)
+    writer.members(list(industry.needed_workers))
+    writer.amounts(list(industry.needed_workers.values()))
+    _write_commune(writer, industry.workforce)
+
+    if isinstance(industry, Manufactury):
+        writer.pack('B', 1)
+        _write_stock(writer, industry.stockpile)
+
+    else:
+        writer.pack('B', 0)
+
+def _read_industry(reader: _Reader, /) -> Industry:
+    product_value, tech_value = reader.unpack('BB')
+    product, tech = Products(product_value), Techs(tech_value)
+    jobs = reader.members(Jobs)
+    needed_workers = dict(zip(jobs, reader.amounts(len(jobs))))
+    workforce = _read_commune(reader)
+    has_stockpile, = reader.unpack('B')
+
+    if has_stockpile:
+        return Manufactury(product, tech, product.techs[tech], needed_workers, workforce, _read_stock(reader))
+
+    return Extractor(product, tech, product.techs[tech], needed_workers, workforce)
+
+# ===================== Public interface =====================
+
+def encode(obj: Good | Stock | Pop | Commune | Industry | list[Decimal], /, codec: Codec = Codec.EXACT) -> bytes:
+    match obj:
+
+        case Good():
+            writer = _Writer(codec, Kind.GOOD)
+            writer.pack('B', obj.product.value)
+            writer.amounts([obj.amount])
+
+        case Stock():
+            writer = _Writer(codec, Kind.STOCK)
+            _write_stock(writer, obj)
+
+        case Pop():
+            writer = _Writer(codec, Kind.POP)
+            writer.pack('BB', obj.job.value, obj.stratum.value)
+            writer.amounts([obj.size, obj.welfare])
+
+        case Commune():
+            writer = _Writer(codec, Kind.COMMUNE)
+            _write_commune(writer, obj)
+
+        case Industry():
+            writer = _Writer(codec, Kind.INDUSTRY)
+            _write_industry(writer, obj)
+
+        case list() if all(isinstance(amount, Decimal) for amount in obj):
+            writer = _Writer(codec, Kind.AMOUNTS)
+            writer.pack('I', len(obj))
+            writer.amounts(obj)
+
+        case _:
+            raise TypeError(f'{type(obj).__name__} type cannot be encoded.')
+
+    return bytes(writer.data)
+
+def decode(data: bytes | memoryview, /) -> Any:
+    """ The object `encode` was given, or an equal one when it used `Codec.FLOAT`, up to the precision of a double. """
+
+    reader = _Reader(data)
+
+    try:
+        match reader.kind:
+
+            case Kind.GOOD:
+                product_value, = reader.unpack('B')
+                return trusted_good(Products(product_value), *reader.amounts(1))
+
+            case Kind.STOCK:
+                return _read_stock(reader)
+
+            case Kind.POP:
+                job_value, stratum_value = reader.unpack('BB')
+                size, welfare = reader.amounts(2)
+                return Pop(size, welfare, Strata(stratum_value), Jobs(job_value))
+
+            case Kind.COMMUNE:
+                return _read_commune(reader)
+
+            case Kind.INDUSTRY:
+                return _read_industry(reader)
+
+            case Kind.AMOUNTS:
+                count, = reader.unpack('I')
+                return reader.amounts(count)
+
+    except struct.error:
+        raise ValueError('The encoding is truncated.') from None
+
+def decode_arrays(data: bytes | memoryview, /) -> dict[str, np.ndarray]:
+    """
+    The columns of a `Stock` or `Commune` encoded with `Codec.FLOAT`, as read-only NumPy arrays that share memory with `data`:
+    `products` and `amounts` for a stock, and `jobs`, `strata`, `sizes` and `welfares` for a commune. Enum members are their values.
+    """
+
+    reader = _Reader(data)
+
+    if reader.codec != Codec.FLOAT:
+        raise ValueError('Only encodings made with `Codec.FLOAT` can be viewed as arrays.')
+
+    def members() -> np.ndarray:
+        count, = reader.unpack('I')
+        values = np.frombuffer(reader.data, np.uint8, count, reader.offset)
+        reader.offset += count
+        return values
+
+    try:
+        match reader.kind:
+
+            case Kind.STOCK:
+                products = members()
+                return {'products': products, 'amounts': reader.float_block(len(products))}
+
+            case Kind.COMMUNE:
+                jobs = members()
+                strata = members()
+                return {'jobs': jobs, 'strata': strata, 'sizes': reader.float_block(len(jobs)), 'welfares': reader.float_block(len(jobs))}
+
+            case _:
+                raise ValueError(f'Only stocks and communes can be viewed as arrays, but this encodes a {reader.kind.name.lower()}.')
+
+    except struct.error:
+        raise ValueError('The encoding is truncated.') from None
@@ -0,0 +1,100 @@
+"""
+Detects when a run has settled into a steady state, so that it can stop instead of ticking through the rest of its ticks unchanged.
+
+A `Monitor` is shown the world after every tick and keeps the last `window` snapshots of its totals: the common stock of every
+product, the size of every job and the welfare of every job, weighted by size. The run converged once no total moved by more than
+`tolerance` relative to its largest value in the window, which also catches runs that settle into a small oscillation.
+"""
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal, getcontext
+from typing import Callable, Optional
+from source.goods import Products
+from source.pop import Jobs
+from source.world import World, tick
+D = getcontext().create_decimal
+
+DEFAULT_TOLERANCE = D('1e-6')
+DEFAULT_WINDOW = 20
+
+def snapshot(world: World, /) -> list[Decimal]:
+    """ The totals of `world` a `Monitor` tracks, in the order of `Products` and then twice that of `Jobs`. """
+
+    sizes = {job: D(0) for job in Jobs}
+    pools = {job: D(0) for job in Jobs}
+
+    for commune in world.communes:
+        for pop in commune.values():
+            sizes[pop.job] += pop.size
+            pools[pop.job] += pop.size * pop.welfare
+
+    stock = [world.common_stock[product].amount for product in Products]
+    welfares = [pools[job] / sizes[job] if sizes[job] else D(0) for job in Jobs]
+
+    return stock + list(sizes.values()) + welfares
+
+@dataclass
+class Monitor:
+    """ Tells when the world it is shown converged, see the module's docstring. `converged_at` is the tick it did, once it does. """
+
+    tolerance: Decimal = DEFAULT_TOLERANCE
+    window: int = DEFAULT_WINDOW
+    converged_at: Optional[int] = field(default=None, init=False)
+    history: deque[list[Decimal]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.window < 2:
+            raise ValueError(f'Convergence can only be told over a window of two or more ticks, but {self.window} was passed.')
+
+        if self.tolerance < 0:
+            raise ValueError(f'The tolerance must not be negative, but {self.tolerance} was passed.')
+
+        self.history = deque(maxlen=self.window)
+
+    def change(self) -> Optional[Decimal]:
+        """ The largest relative change of any total over the window, or `None` until the window is full. """
+
+        if len(self.history) < self.window:
+            return None
+
+        change = D(0)
+
+        for values in zip(*self.history):
+            largest = max(abs(value) for value in values)
+
+            if largest:
+                change = max(change, (max(values) - min(values)) / largest)
+
+        return change
+
+    def observe(self, world: World, ticks: int, /) -> bool:
+        """ Shows the monitor `world` after `ticks` ticks, and returns whether it converged by then. """
+
+        self.history.append(snapshot(world))
+
+        if self.converged_at is None:
+            change = self.change()
+
+            if change is not None and change <= self.tolerance:
+                self.converged_at = ticks
+
+        return self.converged_at is not None
+
+def run_until_converged(world: World, ticks: int, /, monitor: Optional[Monitor] = None,
+                        engine: Callable[[World], None] = tick) -> Optional[int]:
+    """
+    Runs `world` for up to `ticks` ticks of `engine`, stopping as soon as `monitor`, a default one if none is passed, tells it
+    converged. Returns the tick it converged at, or `None` if it never did, which is all a parameter sweep needs from each member.
+    """
+
+    monitor = Monitor() if monitor is None else monitor
+
+    for current in range(ticks):
+        engine(world)
+
+        if monitor.observe(world, current + 1):
+            break
+
+    return monitor.converged_at
@@ -0,0 +1,211 @@
+"""
+Solves for the steady state of a world as the fixed point of the tick map, instead of simulating tick after tick until it settles.
+
+The state of a world is flattened into a vector: the common stock, the stockpile of every manufactury and then the size and welfare
+pool, its size times its welfare, of every pop, one pop after another. A pool, unlike a welfare, shrinks to zero along with its pop,
+so the map stays continuous where pops die out or appear. One evaluation of the map writes a vector into a copy of the world, runs
+one tick of an engine on it and reads the vector back. Every copy starts from the same `Random` state, so the map shuffles the same
+way every time it is evaluated.
+
+`solve` warm-starts from the world's current state and accelerates the iteration with Anderson mixing: each new guess is the
+combination of the last few evaluations whose residuals cancel out best, which usually needs a handful of evaluations where
+plain iteration needs hundreds. Once it converges, the spectral radius of the map's Jacobian at the fixed point is estimated by
+power iteration on finite differences. Below one, small deviations from the fixed point die out and simulation would settle
+there. Otherwise the fixed point exists but simulation would drift away from it.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from decimal import getcontext
+from typing import Callable, Optional
+from source.goods import Products, trusted_good
+from source import unemployed_key
+from source.pop import Jobs, Pop
+from source.prod import Industry, Manufactury
+from source.world import World, tick
+import numpy as np
+import copy
+D = getcontext().create_decimal
+
+PRODUCTS = tuple(Products)
+MAX_WELFARE = float(np.nextafter(1, 0))  # Rounding can take the welfare of a pop moved out of a commune past an exact one.
+
+@dataclass
+class Equilibrium:
+    """
+    The outcome of `solve`. `world` is a copy of the solved world holding the last guess, the fixed point if `converged`, and
+    `residual` is how far one tick moves it, relative to its size. `spectral_radius` is only estimated when the solver converged.
+    """
+
+    world: World
+    converged: bool
+    residual: float
+    evaluations: int
+    spectral_radius: Optional[float] = None
+
+    @property
+    def stable(self) -> bool:
+        return self.spectral_radius is not None and self.spectral_radius < 1
+
+class _Layout:
+    """
+    Which entry of a state vector is which amount of a world, with the industries in a fixed order, since ticks shuffle them. The
+    pops that ticks create, such as the first jobless pop of a stratum, are added with `extend`, which makes the vectors longer. Each
+    pop is a size and a welfare pool at the end of the vector, so vectors read before a pop was added line up with the longer ones
+    once they are padded with zeros, an empty pop.
+    """
+
+    def __init__(self, industries: list[Industry], /) -> None:
+        self.stockpiles = [index for index, industry in enumerate(industries) if isinstance(industry, Manufactury)]
+        self.pops: list[tuple[int, Jobs | unemployed_key]] = []
+
+    def __len__(self) -> int:
+        return len(PRODUCTS) * (1 + len(self.stockpiles)) + 2 * len(self.pops)
+
+    def extend(self, world: World, /) -> bool:
+        known = set(self.pops)
+        new = [(index, key) for index, commune in enumerate(world.communes) for key in commune if (index, key) not in known]
+        self.pops += new
+        return bool(new)
+
+    def read(self, world: World, industries: list[Industry], /) -> np.ndarray:
+        stocks = [world.common_stock, *(industries[index].stockpile for index in self.stockpiles)]  # type: ignore
+        amounts = [float(stock[product].amount) for stock in stocks for product in PRODUCTS]
+        pops = [world.communes[index][key] for index, key in self.pops]
+        return np.array(amounts + [float(amount) for pop in pops for amount in (pop.size, pop.size * pop.welfare)])
+
+    def write(self, world: World, industries: list[Industry], state: np.ndarray, /) -> None:
+        stocks = [world.common_stock, *(industries[index].stockpile for index in self.stockpiles)]  # type: ignore
+        values = iter(state.tolist() + [0.0] * (len(self) - len(state)))  # Pops added since `state` was read are empty in it.
+
+        for stock in stocks:
+            for product in PRODUCTS:
+                amount = next(values)
+
+                # Products a stock never held are left out of it, so that it iterates in the same order as a simulated one.
+                if amount or product in stock:
+                    stock.data[product] = trusted_good(product, D(str(amount)))
+
+        for index, key in self.pops:
+            size, pool = next(values), next(values)
+            commune = world.communes[index]
+
+            if size or key in commune:
+                template = commune[key]
+                welfare = D(str(min(pool / size, MAX_WELFARE))) if size else Pop.ZERO_SIZE_WELFARE
+                commune.data[key] = Pop(D(str(size)), welfare, template.stratum, template.job)
+
+def _copy(world: World, /) -> tuple[World, list[Industry]]:
+    copied = copy.deepcopy(world)
+    return copied, list(copied.industries)
+
+def solve(world: World, /, *,
+          engine: Callable[[World], None] = tick,
+          tolerance: float = 1e-8,
+          memory: int = 5,
+          max_evaluations: int = 100,
+          power_iterations: int = 10) -> Equilibrium:
+    """
+    Finds the fixed point of one tick of `engine` on `world`, starting from its current state, which is left untouched. The
+    solver converged once a tick moves no amount by more than `tolerance` relative to the amount, or to one for amounts smaller
+    than one. `memory` is how many past evaluations Anderson mixing combines, and zero makes it plain iteration.
+
+    `source.kernels.tick` is a faster `engine` than the default when the solution does not need to be exact.
+    """
+
+    if memory < 0 or max_evaluations < 1:
+        raise ValueError('The solver needs a non-negative memory and at least one evaluation.')
+
+    base, industries = _copy(world)
+    layout = _Layout(industries)
+    layout.extend(base)
+    evaluations = 0
+
+    def evaluate(state: np.ndarray, /) -> np.ndarray:
+        nonlocal evaluations
+        evaluations += 1
+
+        copied, copied_industries = _copy(base)
+        layout.write(copied, copied_industries, state)
+        engine(copied)
+
+        layout.extend(copied)
+        return layout.read(copied, copied_industries)
+
+    def residual(state: np.ndarray, image: np.ndarray, /) -> float:
+        return float(np.max(np.abs(image - state) / np.maximum(1, np.abs(state)), initial=0))
+
+    state = layout.read(base, industries)
+    states: list[np.ndarray] = []
+    images: list[np.ndarray] = []
+    converged = False
+
+    while evaluations < max_evaluations:
+        try:
+            image = evaluate(state)
+
+        except ArithmeticError:
+            # Mixing can extrapolate into states no simulation reaches, such as a manufactury without workers, which the engines
+            # cannot tick. The last evaluation is a state the engine reached itself, so the solver falls back to it and starts over.
+            if not images:
+                raise
+
+            state = images[-1]
+            states.clear()
+            images.clear()
+            continue
+
+        if len(image) > len(state):  # The tick created pops, which are empty in `state`, and the past evaluations no longer line up.
+            state = np.concatenate([state, np.zeros(len(image) - len(state))])
+            states.clear()
+            images.clear()
+
+        error = residual(state, image)
+
+        if error <= tolerance:
+            converged = True
+            break
+
+        states.append(state)
+        images.append(image)
+        del states[:-memory - 1], images[:-memory - 1]
+
+        # Anderson mixing: the combination of the last evaluations that minimizes the residual, with the weights summing to one.
+        residuals = np.array(images) - np.array(states)
+        if len(residuals) > 1:
+            differences = (residuals[1:] - residuals[:-1]).T
+            gamma = np.linalg.lstsq(differences, residuals[-1], rcond=None)[0]
+            image = image - (np.array(images[1:]) - np.array(images[:-1])).T @ gamma
+
+        state = np.maximum(image, 0)
+
+    equilibrium, equilibrium_industries = _copy(base)
+    layout.write(equilibrium, equilibrium_industries, state)
+    result = Equilibrium(equilibrium, converged, error, evaluations)
+
+    if converged and power_iterations > 0:
+        result.spectral_radius = _spectral_radius(evaluate, state, image, power_iterations)
+
+    return result
+
+def _spectral_radius(evaluate: Callable[[np.ndarray], np.ndarray], state: np.ndarray, image: np.ndarray, iterations: int, /) -> float:
+    """
+    Estimates the largest absolute eigenvalue of the Jacobian of `evaluate` at `state`, by power iteration on finite differences.
+    Amounts cannot be negative, so those at zero are only ever perturbed upwards.
+    """
+
+    step = 1e-6 * max(1.0, float(np.max(np.abs(state))))
+    direction = np.random.default_rng(0).random(len(state))
+    direction /= np.linalg.norm(direction)
+    radius = 0.0
+
+    for _ in range(iterations):
+        product = (evaluate(np.maximum(state + step * direction, 0))[:len(state)] - image) / step
+        radius = float(np.linalg.norm(product))
+
+        if radius == 0:
+            break
+
+        direction = product / radius
+
+    return radius
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from source.goods import Products, Techs, create_stock
+from source.pop import Commune, CommuneFactory, Jobs, Strata
+from source.prod import Industry, IndustryFactory
+from source.world import World
+from decimal import getcontext
+from random import Random
+D = getcontext().create_decimal
+
+type size_range = tuple[int, int]
+
+# Jobs that can work the main position of each kind of industry. Specialists fill the rest of every industry.
+EXTRACTION_JOBS = (Jobs.FARMER, Jobs.MINER)
+MANUFACTURE_JOBS = (Jobs.CRAFTSMAN,)
+SPECIALIST_SHARE = D('0.01')
+
+def _check_range(name: str, bounds: size_range, /) -> None:
+    low, high = bounds
+
+    if low < 0 or high < low:
+        raise ValueError(f'`{name}` must be a non-negative (low, high) range, but {bounds} was passed.')
+
+def _industry(rng: Random, product: Products, tech: Techs, jobs: tuple[Jobs, ...], capacity: size_range, workforce: size_range, /) -> Industry:
+    job = rng.choice(jobs)
+    total = D(rng.randint(*capacity))
+    needed = {job: total * (1 - SPECIALIST_SHARE), Jobs.SPECIALIST: total * SPECIALIST_SHARE}
+
+    workers = D(rng.randint(*workforce))
+    employed = {job: workers * (1 - SPECIALIST_SHARE / 2), Jobs.SPECIALIST: workers * SPECIALIST_SHARE / 2}
+
+    return IndustryFactory.create_industry(product, needed, employed, tech)  # type: ignore
+
+def _settlement(rng: Random, size: size_range, /) -> Commune:
+    jobs = [job for job in Strata.LOWER.jobs if rng.random() < 0.5] or [rng.choice(Strata.LOWER.jobs)]
+    want = {job: rng.randint(*size) for job in jobs}
+    want[Jobs.SPECIALIST] = rng.randint(*size) // 20
+
+    return CommuneFactory.create_by_job(want)  # type: ignore
+
+def generate_world(seed: int, /, *,
+                   extractors: int = 2,
+                   manufacturies: int = 2,
+                   settlements: int = 0,
+                   capacity: size_range = (800, 1200),
+                   workforce: size_range = (150, 250),
+                   settlement_size: size_range = (100, 1000),
+                   stock: size_range = (0, 1000)) -> World:
+    """
+    Builds a random world through `IndustryFactory` and `CommuneFactory`. The same seed and arguments always build the same world,
+    whose `rng` is seeded from `seed` as well, so whole runs are reproducible.
+
+    Extractors draw their product among those that can be extracted and manufacturies draw a product and one of its
+    non-extraction techs. Capacities, workforces, settlement pops and the common stock of every product are drawn uniformly from
+    their `(low, high)` ranges.
+    """
+
+    for name, bounds in (('capacity', capacity), ('workforce', workforce), ('settlement_size', settlement_size), ('stock', stock)):
+        _check_range(name, bounds)
+
+    if min(extractors, manufacturies, settlements) < 0:
+        raise ValueError('Cannot generate a negative amount of industries or settlements.')
+
+    rng = Random(seed)
+
+    extractables = [product for product in Products if Techs.EXTRACTION in product.techs]
+    recipes = [(product, tech) for product in Products for tech in product.techs if tech != Techs.EXTRACTION]
+
+    industries: list[Industry] = []
+
+    for _ in range(extractors):
+        industries.append(_industry(rng, rng.choice(extractables), Techs.EXTRACTION, EXTRACTION_JOBS, capacity, workforce))
+
+    for _ in range(manufacturies):
+        product, tech = rng.choice(recipes)
+        industries.append(_industry(rng, product, tech, MANUFACTURE_JOBS, capacity, workforce))
+
+    towns = [_settlement(rng, settlement_size) for _ in range(settlements)]
+    common_stock = create_stock({product: rng.randint(*stock) for product in Products})
+
+    return World.create(industries, common_stock, CommuneFactory.create_by_job(), Random(rng.getrandbits(64)), towns)
+
+def scaled_world(scale: int, seed: int = 0, /) -> World:
+    """ A generated world `scale` times the size of the default one, with one settlement per four industries. """
+
+    return generate_world(seed, extractors=2 * scale, manufacturies=2 * scale, settlements=scale, stock=(500 * scale, 500 * scale))
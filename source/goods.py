@@ -2,8 +2,10 @@ from __future__ import annotations
 from source.exceptions import NegativeAmountError
 from dataclasses import dataclass, field
 from decimal import Decimal, getcontext
-from typing import Callable, Optional
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 from source.abcs import Group, Dyct
+from source import validation
 from functools import partial
 from enum import Enum, auto
 from math import isclose
@@ -42,18 +44,24 @@ class Products(Enum):
     FLOUR = auto()
 
     @property
-    def techs(self) -> dict[Techs, Technology]:
+    def techs(self) -> Mapping[Techs, Technology]:
+        """ A read-only view of the installed techs of the product, so that callers cannot change the rules by accident. """
 
-        match self:
-            case Products.WHEAT:
-                return {Techs.EXTRACTION: Technology(D('4.267'))}
+        try:
+            return MappingProxyType(TECHS[self])
 
-            case Products.IRON:
-                return {Techs.EXTRACTION: Technology(D('1.723'))}
+        except KeyError:
+            raise KeyError(f'`Products` {self.name} has no techs assigned to it.') from None
 
-            case Products.FLOUR:
-                return {Techs.CRAFTING: Technology(D('2.5'), {Products.WHEAT: D('0.8'), Products.IRON: D('0.2')}),
-                        Techs.MILLING: Technology(D('3.5'), {Products.WHEAT: D('0.65'), Products.IRON: D('0.35')})}
+DEFAULT_TECHS: dict[Products, dict[Techs, Technology]] = {
+    Products.WHEAT: {Techs.EXTRACTION: Technology(D('4.267'))},
+    Products.IRON: {Techs.EXTRACTION: Technology(D('1.723'))},
+    Products.FLOUR: {Techs.CRAFTING: Technology(D('2.5'), {Products.WHEAT: D('0.8'), Products.IRON: D('0.2')}),
+                     Techs.MILLING: Technology(D('3.5'), {Products.WHEAT: D('0.65'), Products.IRON: D('0.35')})},
+}
+
+# What `Products.techs` reads. Installing a scenario replaces its contents, see `source.scenario`.
+TECHS: dict[Products, dict[Techs, Technology]] = dict(DEFAULT_TECHS)
 
 @dataclass(order=True)
 class Good(Group["Good"], amount_attr='amount'):
@@ -94,16 +102,24 @@ class Good(Group["Good"], amount_attr='amount'):
 def create_good(product: Products, amount: num = D(0)):
     """ Checks and transforms the arguments and returns a correctly instantiated `Good` object. """
 
-    if not isinstance(product, Products):
+    if validation.boundary and not isinstance(product, Products):
         raise TypeError(f'The `product` parameter does not accept `{type(product).__name__}` type.')
     
     amount = D(amount)
 
-    if amount < D(0):
+    if validation.boundary and amount < D(0):
         raise NegativeAmountError
     
     return Good(product, amount)
 
+def trusted_good(product: Products, amount: Decimal = D(0), /) -> Good:
+    """ For amounts the simulation computed itself. They are only checked, through `create_good`, when validation is `FULL`. """
+
+    if validation.full:
+        return create_good(product, amount)
+
+    return Good(product, amount)
+
 def good_factory(product: Products, /) -> Callable[..., Good]:
     """ 
     Returns a partial function that returns a `Good` object of the passed argument's product.
@@ -112,7 +128,7 @@ def good_factory(product: Products, /) -> Callable[..., Good]:
 
     return partial(create_good, product)
 
-class Stock(Dyct[Products, Good], factory=staticmethod(create_good)):
+class Stock(Dyct[Products, Good], factory=staticmethod(trusted_good)):
     """
     Do not instantiate. Use the `create_stock` factory function.
 
@@ -120,7 +136,7 @@ class Stock(Dyct[Products, Good], factory=staticmethod(create_good)):
     """
 
     def _scrutinize(self, __key: Products) -> None:
-        if not isinstance(__key, Products):
+        if validation.full and not isinstance(__key, Products):
             raise TypeError(f'Cannot use type `{type(__key).__name__}` as a key.')
 
     def _iadd(self, __value: Stock | Good):
@@ -149,6 +165,23 @@ class Stock(Dyct[Products, Good], factory=staticmethod(create_good)):
         for key in self.copy().keys():
             self[key] = __value[key]
 
+    def mirror(self, __value: Stock, /) -> None:
+        """ Makes the stock hold the same amounts as `__value`, in the same order, reusing its own goods instead of copying those. """
+
+        goods = self.data
+        self.data = {}
+
+        for product, good in __value.data.items():
+            mirrored = goods.get(product)
+
+            if mirrored is None:
+                mirrored = trusted_good(product, good.amount)
+
+            else:
+                mirrored.amount = good.amount
+
+            self.data[product] = mirrored
+
 def create_stock(init_dict: Optional[dict[Products, num]] = None, /):
     """ Transforms the passed arguments and returns a correctly instantiated `Stock` object. """
 
@@ -156,6 +189,11 @@ def create_stock(init_dict: Optional[dict[Products, num]] = None, /):
         return Stock({})
     
     return Stock({key: create_good(key, value) for key, value in init_dict.items()})
+
+def trusted_stock(init_dict: dict[Products, Decimal], /) -> Stock:
+    """ The `trusted_good` counterpart of `create_stock`. """
+
+    return Stock({key: trusted_good(key, value) for key, value in init_dict.items()})
     
 def stock_factory(*products: Products) -> Callable[..., Stock]:
     """
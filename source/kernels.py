@@ -0,0 +1,402 @@
+"""
+Float kernels for the numeric inner loops of a tick, and the tick phases built on them.
+
+Each kernel works on plain NumPy arrays extracted from the world. When Numba is installed the kernels are its compiled loops,
+otherwise the same computations run as vectorized NumPy, which is what every kernel falls back to transparently. Setting the
+`ECONSIM_JIT` environment variable to `0` forces the fallback even when Numba is installed.
+
+The kernels trade the exact `Decimal` arithmetic of the reference engine for floats, so `tick` only agrees with `source.world.tick`
+up to rounding. `tests.oracle.compare_engines` is how that agreement is checked.
+"""
+
+from __future__ import annotations
+from decimal import Decimal, getcontext
+from math import isclose
+from typing import TYPE_CHECKING, Callable, Mapping, Optional
+from source.algs import PROPORTIONAL_WEIGHTS
+from source.goods import Products, Stock, trusted_good
+from source.pool import temporary
+from source.pop import NEEDS, Commune, Jobs, Pop, PopFactory
+from source.prod import Manufactury
+from source.world import World
+from source import world as reference
+import numpy as np
+import os
+D = getcontext().create_decimal
+
+try:
+    from numba import njit
+
+except ImportError:
+    njit = None
+
+if TYPE_CHECKING:
+    from visual.gather import DataManager
+
+JIT = njit is not None and os.environ.get('ECONSIM_JIT', '1') != '0'  # Whether the kernels are compiled.
+
+PRODUCTS = tuple(Products)
+JOBS = tuple(job for job in Jobs if job != Jobs.UNEMPLOYED)
+STRATA = tuple(PROPORTIONAL_WEIGHTS)
+
+# The loop versions of every kernel, which are what Numba compiles. They stay importable so that they can be checked against the
+# NumPy versions when Numba is not installed, as pure Python.
+LOOPS: dict[str, Callable] = {}
+
+def _kernel(fallback: Callable, /) -> Callable[[Callable], Callable]:
+    def decorator(loops: Callable, /) -> Callable:
+        LOOPS[loops.__name__] = loops
+        return njit(cache=True)(loops) if JIT else fallback  # type: ignore
+
+    return decorator
+
+# ===================== Kernels =====================
+
+def _efficiencies(sizes: np.ndarray, needed: np.ndarray, /) -> np.ndarray:
+    totals = sizes.sum(axis=1, keepdims=True)
+    shares = np.divide(sizes, totals, out=np.zeros_like(sizes), where=totals > 0)
+    is_needed = needed > 0
+    efficient = needed / needed.sum(axis=1, keepdims=True)
+    differences = np.minimum(1, np.abs(efficient - shares) / np.where(is_needed, efficient, 1))
+    return 1 - np.where(is_needed, differences, 0).sum(axis=1) / is_needed.sum(axis=1)
+
+@_kernel(_efficiencies)
+def efficiencies(sizes: np.ndarray, needed: np.ndarray, /) -> np.ndarray:
+    """ `Industry.calc_efficiency` of each row, where `sizes` and `needed` hold the workers and needed workers of every job. """
+
+    count, jobs = sizes.shape
+    result = np.empty(count)
+
+    for row in range(count):
+        total = 0.0
+        capacity = 0.0
+
+        for job in range(jobs):
+            total += sizes[row, job]
+            capacity += needed[row, job]
+
+        difference = 0.0
+        needed_jobs = 0
+
+        for job in range(jobs):
+            if needed[row, job] > 0:
+                efficient_share = needed[row, job] / capacity
+                share = sizes[row, job] / total if total > 0 else 0.0
+                difference += min(1.0, abs(efficient_share - share) / efficient_share)
+                needed_jobs += 1
+
+        result[row] = 1.0 - difference / needed_jobs
+
+    return result
+
+def _ceilings(stock: np.ndarray, recipe: np.ndarray, potential: np.ndarray, /) -> np.ndarray:
+    needed = recipe * potential[:, None]
+    ratios = np.divide(stock, needed, out=np.full_like(stock, np.inf), where=needed > 0)
+    return np.minimum(1, ratios.min(axis=1, initial=np.inf))
+
+@_kernel(_ceilings)
+def ceilings(stock: np.ndarray, recipe: np.ndarray, potential: np.ndarray, /) -> np.ndarray:
+    """
+    `Manufactury.calc_ceil` of each row, from the stockpiles, the recipe shares of every product and the potential production.
+    Manufacturies that cannot produce anything get a ceiling of 1, where the reference engine divides by zero.
+    """
+
+    count, products = stock.shape
+    result = np.ones(count)
+
+    for row in range(count):
+        for product in range(products):
+            needed = recipe[row, product] * potential[row]
+
+            if needed > 0:
+                result[row] = min(result[row], stock[row, product] / needed)
+
+    return result
+
+def _resized(sizes: np.ndarray, welfares: np.ndarray, threshold: float, rate: float, /) -> np.ndarray:
+    return sizes * np.where(welfares >= threshold, 1 + rate, 1 - rate)
+
+@_kernel(_resized)
+def resized(sizes: np.ndarray, welfares: np.ndarray, threshold: float, rate: float, /) -> np.ndarray:
+    """ `Pop.resize` of every pop. """
+
+    result = np.empty_like(sizes)
+
+    for pop in range(len(sizes)):
+        result[pop] = sizes[pop] * (1 + rate if welfares[pop] >= threshold else 1 - rate)
+
+    return result
+
+def _layoffs(sizes: np.ndarray, desired: np.ndarray, /) -> np.ndarray:
+    sizes = sizes.copy()
+    removed = np.zeros_like(sizes)
+
+    for column in range(sizes.shape[1]):
+        totals = sizes.sum(axis=1)
+        shares = np.divide(sizes[:, column], totals, out=np.zeros_like(totals), where=totals > 0)
+        over = shares > desired[:, column]
+
+        removed[:, column] = np.where(over, (sizes[:, column] - desired[:, column] * totals) / (1 + desired[:, column]), 0)
+        sizes[:, column] -= removed[:, column]
+
+    return removed
+
+@_kernel(_layoffs)
+def layoffs(sizes: np.ndarray, desired: np.ndarray, /) -> np.ndarray:
+    """
+    How many workers `algs.retrospective` lays off from each column, with the layoff formula of `formulas.md`. Each row is a
+    workforce in its iteration order and `desired` holds the efficient shares, with padding columns of size 0 and share 1.
+    """
+
+    count, columns = sizes.shape
+    removed = np.zeros_like(sizes)
+
+    for row in range(count):
+        total = 0.0
+
+        for column in range(columns):
+            total += sizes[row, column]
+
+        for column in range(columns):
+            if total > 0 and sizes[row, column] / total > desired[row, column]:
+                removed[row, column] = (sizes[row, column] - desired[row, column] * total) / (1 + desired[row, column])
+                total -= removed[row, column]
+
+    return removed
+
+def _shares(stock: np.ndarray, sizes: np.ndarray, needs: np.ndarray, weights: np.ndarray, /) -> tuple[np.ndarray, np.ndarray]:
+    satisfaction = np.zeros_like(sizes)
+    is_needed = needs > 0
+    counts = is_needed.sum(axis=1)
+
+    for commune in range(len(sizes)):
+        stockpiles = weights[:, None] * stock
+        left_overs = np.zeros_like(stock)
+
+        for stratum in range(len(weights)):
+            original = stockpiles[stratum] + left_overs
+            wanted = needs[stratum] * sizes[commune, stratum]
+
+            if sizes[commune, stratum] > 0:
+                ratios = np.minimum(1, np.divide(original, wanted, out=np.zeros_like(original), where=is_needed[stratum]))
+                satisfaction[commune, stratum] = ratios.sum() / counts[stratum]
+                original = original - np.minimum(wanted, original)
+
+            left_overs = original
+
+        stock = left_overs
+
+    return stock, satisfaction
+
+@_kernel(_shares)
+def shares(stock: np.ndarray, sizes: np.ndarray, needs: np.ndarray, weights: np.ndarray, /) -> tuple[np.ndarray, np.ndarray]:
+    """
+    `algs.proportional` applied to one commune after another, each row of `sizes` holding the size of every stratum of a commune in
+    the order of `weights`. Returns the stock left and the satisfaction, the welfare before blending, of every stratum of every
+    commune. Within a stratum every pop gets the same share of the stock for its size, so they are all equally satisfied.
+    """
+
+    communes, strata = sizes.shape
+    products = len(stock)
+    satisfaction = np.zeros_like(sizes)
+    stock = stock.copy()
+
+    for commune in range(communes):
+        left_overs = np.zeros(products)
+
+        for stratum in range(strata):
+            original = weights[stratum] * stock + left_overs
+            size = sizes[commune, stratum]
+
+            if size > 0:
+                total = 0.0
+                counted = 0
+
+                for product in range(products):
+                    if needs[stratum, product] > 0:
+                        wanted = needs[stratum, product] * size
+                        total += min(1.0, original[product] / wanted)
+                        original[product] -= min(wanted, original[product])
+                        counted += 1
+
+                satisfaction[commune, stratum] = total / counted
+
+            left_overs = original
+
+        stock = left_overs
+
+    return stock, satisfaction
+
+def _blended(old: np.ndarray, new: np.ndarray, sizes: np.ndarray, old_weight: float, new_weight: float, empty: float, /) -> np.ndarray:
+    return np.where(sizes > 0, (old * old_weight + new * new_weight) / (old_weight + new_weight), empty)
+
+@_kernel(_blended)
+def blended(old: np.ndarray, new: np.ndarray, sizes: np.ndarray, old_weight: float, new_weight: float, empty: float, /) -> np.ndarray:
+    """ The welfare `Pop.update_welfare` gives every pop, from its old welfare and its satisfaction. Empty pops get `empty`. """
+
+    result = np.empty_like(old)
+
+    for pop in range(len(old)):
+        result[pop] = (old[pop] * old_weight + new[pop] * new_weight) / (old_weight + new_weight) if sizes[pop] > 0 else empty
+
+    return result
+
+# ===================== Extraction =====================
+
+def _floats(values: list[Decimal], /) -> np.ndarray:
+    return np.array(values, dtype=float)
+
+def _job_matrix(rows: list[dict[Jobs, Decimal]], /) -> np.ndarray:
+    matrix = np.zeros((len(rows), len(JOBS)))
+
+    for row, amounts in enumerate(rows):
+        for job, amount in amounts.items():
+            matrix[row, JOBS.index(job)] = amount
+
+    return matrix
+
+def _product_matrix(rows: list[Mapping[Products, Decimal]], /) -> np.ndarray:
+    matrix = np.zeros((len(rows), len(PRODUCTS)))
+
+    for row, amounts in enumerate(rows):
+        for product, amount in amounts.items():
+            matrix[row, PRODUCTS.index(product)] = amount
+
+    return matrix
+
+def _needs_matrix(sizes: np.ndarray, /) -> np.ndarray:
+    # Reading the needs of a stratum without any raises the same `KeyError` as the reference engine, but only if it has pops.
+    return _product_matrix([stratum.needs if stratum in NEEDS or sizes[:, index].any() else {} for index, stratum in enumerate(STRATA)])
+
+def _share(communes: list[Commune], stockpile: Stock, /) -> None:
+    sizes = np.zeros((len(communes), len(STRATA)))
+
+    for row, commune in enumerate(communes):
+        for pop in commune.values():
+            sizes[row, STRATA.index(pop.stratum)] += float(pop.size)
+
+    stock = _product_matrix([{product: good.amount for product, good in stockpile.items()}])[0]
+    weights = _floats(list(PROPORTIONAL_WEIGHTS.values()))
+    left_overs, satisfaction = shares(stock, sizes, _needs_matrix(sizes), weights)
+
+    pops = [(pop, satisfaction[row, STRATA.index(pop.stratum)]) for row, commune in enumerate(communes) for pop in commune.values()
+            if sizes[row, STRATA.index(pop.stratum)] > 0]
+    welfares = blended(_floats([pop.welfare for pop, _ in pops]), _floats([value for _, value in pops]), _floats([pop.size for pop, _ in pops]),
+                       float(Pop.OLD_WELFARE_WEIGHT), float(Pop.NEW_WELFARE_WEIGHT), float(Pop.ZERO_SIZE_WELFARE))
+
+    for (pop, _), welfare in zip(pops, welfares.tolist()):
+        pop.welfare = D(welfare)
+
+    remaining = temporary(Stock)
+    for product, amount in zip(PRODUCTS, left_overs.tolist()):
+        if amount > 0:
+            remaining[product] = trusted_good(product, D(amount))
+
+    stockpile.reset_to(remaining)
+
+def proportional(community: Commune, stockpile: Stock, /) -> None:
+    """ `algs.proportional` through the kernels, with the same interface. """
+
+    _share([community], stockpile)
+
+# ===================== Tick phases =====================
+
+# `production` and `resizing` take their kernel as an argument, so that `source.shared` can run it in worker processes.
+
+def production(world: World, recorder: Optional[DataManager] = None, /, *, efficiency: Callable = efficiencies) -> None:
+    if recorder is not None:
+        recorder.record_goods_satisfaction(world.common_stock)
+
+    before = world.common_stock
+    if recorder is not None and recorder.records_next('goods_produced'):
+        before = world.buffer_stock()
+
+    industries = world.industries
+    sizes = _job_matrix([{job: pop.size for job, pop in industry.workforce.items() if job in JOBS} for industry in industries])
+    needed = _job_matrix([industry.needed_workers for industry in industries])
+    yields = _floats([industry.production.base_yield for industry in industries])
+    potential = yields * _floats([industry.workforce.size for industry in industries]) * efficiency(sizes, needed)
+
+    manufacturies = [row for row, industry in enumerate(industries) if isinstance(industry, Manufactury)]
+    recipes = _product_matrix([industries[row].production.recipe for row in manufacturies])
+    stock = _product_matrix([{product: good.amount for product, good in industries[row].stockpile.items()} for row in manufacturies])  # type: ignore
+    ceils = dict(zip(manufacturies, ceilings(stock, recipes, potential[manufacturies]).tolist()))
+
+    for row, industry in enumerate(industries):
+        produced = float(potential[row])
+
+        if isinstance(industry, Manufactury):
+            produced *= ceils[row]
+
+            for product, share in industry.production.recipe.items():
+                available = industry.stockpile[product].amount
+                amount_used = float(share) * produced
+                industry.stockpile[product] -= trusted_good(product, available if isclose(amount_used, available) else D(amount_used))
+
+        world.common_stock += trusted_good(industry.product, D(produced))
+
+    if recorder is not None:
+        recorder.record_goods_produced(before, world.common_stock)
+        recorder.record_stockpile(world.common_stock)
+
+def consumption(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    original_stock = world.common_stock
+    if recorder is not None and recorder.records_next('goods_consumed'):
+        original_stock = world.buffer_stock()
+
+    if recorder is not None:
+        recorder.record_goods_demanded()
+
+    world.rng.shuffle(world.manufacturies)
+    for manufactury in world.manufacturies:
+        manufactury.restock(world.common_stock)
+
+    world.rng.shuffle(world.industries)
+    _share([industry.workforce for industry in world.industries] + [world.jobless_pops] + world.settlements, world.common_stock)
+
+    if recorder is not None:
+        recorder.record_pop_welfare()
+        recorder.record_goods_consumed(original_stock, world.common_stock)
+
+def resizing(world: World, recorder: Optional[DataManager] = None, /, *, resize: Callable = resized) -> None:
+    pops = [pop for commune in world.communes for pop in commune.values()]
+    sizes = resize(_floats([pop.size for pop in pops]), _floats([pop.welfare for pop in pops]), float(Pop.WELFARE_THRESHOLD), float(Pop.GROWTH_RATE))
+
+    for pop, size in zip(pops, sizes.tolist()):
+        pop.size = D(size)
+
+def rebalancing(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    for industry in world.industries:
+        if industry.workforce.size > industry.capacity:
+            world.jobless_pops += industry.fire_excess()
+
+    workforces = [list(industry.workforce.items()) for industry in world.industries]
+    width = max(map(len, workforces), default=0)
+    sizes = np.zeros((len(workforces), width))
+    desired = np.ones((len(workforces), width))
+
+    for row, (industry, workforce) in enumerate(zip(world.industries, workforces)):
+        efficient_shares = industry.efficient_shares
+
+        for column, (job, pop) in enumerate(workforce):
+            sizes[row, column] = pop.size
+            desired[row, column] = efficient_shares[job]  # type: ignore
+
+    removed = layoffs(sizes, desired)
+
+    for row, column in zip(*np.nonzero(removed)):
+        job, pop = workforces[row][column]
+        amount = D(float(removed[row, column]))
+
+        world.industries[row].workforce -= PopFactory.trusted_job_makepop(job, amount, pop.welfare)  # type: ignore
+        world.jobless_pops += PopFactory.trusted_stratum_makepop(pop.stratum, amount, pop.welfare)
+
+    if recorder is not None:
+        recorder.record_pop_size()
+
+PHASES: tuple[reference.phase, ...] = (production, consumption, resizing, reference.promotion, reference.employment, rebalancing)
+
+def tick(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    """ `source.world.tick` through the kernels. """
+
+    reference.tick(world, recorder, PHASES)
@@ -0,0 +1,83 @@
+"""
+Runs the independent units of a tick on a thread pool when the interpreter is free-threaded, and serially otherwise.
+
+Within a tick, every industry produces from its own workforce and stockpile, and every commune resizes and promotes its own pops,
+so those units can run at the same time. Anything they would write to shared state is returned instead and reduced into the world
+afterwards, in the same order the serial phases use, so `tick` gives exactly the same results as `source.world.tick` whatever the
+number of threads or the order they finish in.
+
+With the GIL threads would only add overhead, so on a standard build `tick` runs everything in the calling thread.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Context, getcontext, localcontext
+from operator import methodcaller
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+from source.world import World
+from source import world as reference
+import os
+import sys
+
+if TYPE_CHECKING:
+    from visual.gather import DataManager
+
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+threaded = FREE_THREADED  # Can be set to `True` to use the thread pool even with the GIL, which is only useful for testing.
+WORKERS = os.cpu_count() or 1
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _call[T, R](function: Callable[[T], R], context: Context, item: T, /) -> R:
+    # Decimal contexts are per thread and new threads start from the default one, not from the caller's.
+    with localcontext(context):
+        return function(item)
+
+def run_all[T, R](function: Callable[[T], R], items: Iterable[T], /) -> list[R]:
+    """ Calls `function` on every item, on the thread pool if `threaded`, and returns the results in the order of `items`. """
+
+    global _executor
+    items = list(items)
+
+    if not threaded or len(items) < 2:
+        return [function(item) for item in items]
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(WORKERS, thread_name_prefix='econsim')
+
+    context = getcontext()
+    return list(_executor.map(lambda item: _call(function, context, item), items))
+
+# ===================== Tick phases =====================
+
+def production(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    if recorder is not None:
+        recorder.record_goods_satisfaction(world.common_stock)
+
+    before = world.common_stock
+    if recorder is not None and recorder.records_next('goods_produced'):
+        before = world.buffer_stock()
+
+    for produced in run_all(methodcaller('produce'), world.industries):
+        world.common_stock += produced
+
+    if recorder is not None:
+        recorder.record_goods_produced(before, world.common_stock)
+        recorder.record_stockpile(world.common_stock)
+
+def resizing(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    run_all(methodcaller('resize_all'), world.communes)
+
+def promotion(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    communes = [commune for commune in world.communes if commune is not world.jobless_pops]
+
+    for promoted in run_all(methodcaller('promote_all'), communes):
+        world.jobless_pops += promoted
+
+PHASES: tuple[reference.phase, ...] = (production, reference.consumption, resizing, promotion, reference.employment, reference.rebalancing)
+
+def tick(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    """ `source.world.tick` with the independent units of each phase run by `run_all`. """
+
+    reference.tick(world, recorder, PHASES)
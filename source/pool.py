@@ -0,0 +1,70 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from source.abcs import Dyct
+import threading
+
+class Arena:
+    """
+    Hands out empty `Dyct`s, such as `Stock` and `Commune` objects, for temporaries that do not outlive a tick phase, and takes all
+    of them back at once with `reset`, which empties them for the next phase. Steady-state phases then allocate no new containers.
+
+    Anything taken from an arena must not be kept after the scope it was taken in ends: adding a temporary to another `Dyct` is fine,
+    for that copies its amounts, but storing the temporary itself is not.
+    """
+
+    def __init__(self) -> None:
+        self._free: dict[type[Dyct], list[Dyct]] = {}
+        self._used: list[Dyct] = []
+        self.allocated = 0  # How many containers this arena had to create, which stops growing once it is warm.
+
+    def __reduce__(self):
+        # Pooled containers are scratch space, so copies and pickles of the arena, or of a world holding one, start empty.
+        return Arena, ()
+
+    def take[T: Dyct](self, kind: type[T], /) -> T:
+        free = self._free.get(kind)
+
+        if free:
+            container = free.pop()
+
+        else:
+            container = kind({})
+            self.allocated += 1
+
+        self._used.append(container)
+        return container  # type: ignore
+
+    def reset(self) -> None:
+        for container in self._used:
+            container.data.clear()
+            self._free.setdefault(type(container), []).append(container)
+
+        self._used.clear()
+
+_local = threading.local()  # Each thread has its own active arena, so phases running in parallel never share one.
+
+def active() -> Optional[Arena]:
+    return getattr(_local, 'arena', None)
+
+def temporary[T: Dyct](kind: type[T], /) -> T:
+    """ An empty `kind` from the active arena, or a new one when no arena is active. """
+
+    arena = getattr(_local, 'arena', None)
+    return kind({}) if arena is None else arena.take(kind)
+
+@contextmanager
+def scope(arena: Arena, /) -> Iterator[Arena]:
+    """ Makes `arena` the active one for the current thread and resets it once the outermost block using it ends. """
+
+    previous = getattr(_local, 'arena', None)
+    _local.arena = arena
+
+    try:
+        yield arena
+
+    finally:
+        _local.arena = previous
+
+        if previous is not arena:
+            arena.reset()
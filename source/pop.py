@@ -1,11 +1,14 @@
 from __future__ import annotations
 from decimal import Decimal, DivisionByZero, InvalidOperation, getcontext
-from source.goods import Products, Stock, create_stock
-from typing import TYPE_CHECKING, Optional, overload
+from source.goods import Products, Stock, trusted_good
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping, Optional, overload
 from source.exceptions import NegativeAmountError
 from dataclasses import dataclass, field
 from source import num, unemployed_key
 from source.abcs import Dyct, Group
+from source.pool import temporary
+from source import validation
 from enum import Enum, auto
 D = getcontext().create_decimal
 
@@ -18,18 +21,14 @@ class Strata(Enum):
     UPPER = auto()
 
     @property
-    def needs(self) -> dict[Products, Decimal]:
+    def needs(self) -> Mapping[Products, Decimal]:
+        """ A read-only view of the installed needs of the stratum, so that callers cannot change the rules by accident. """
 
-        match self:
-
-            case Strata.LOWER:
-                return {Products.FLOUR: D(1)}
+        try:
+            return MappingProxyType(NEEDS[self])
 
-            case Strata.MIDDLE:
-                return {Products.FLOUR: D(1.5)}
-            
-            case _ :
-                raise KeyError(f'`Strata` {self.name} has no needs assigned to it.')
+        except KeyError:
+            raise KeyError(f'`Strata` {self.name} has no needs assigned to it.') from None
 
     @property
     def jobs(self) -> tuple[Jobs, ...]:
@@ -58,6 +57,14 @@ class Strata(Enum):
             case _ :
                 raise KeyError(f'stratum `{self}` has no promotion assigned to it.')
 
+DEFAULT_NEEDS: dict[Strata, dict[Products, Decimal]] = {
+    Strata.LOWER: {Products.FLOUR: D(1)},
+    Strata.MIDDLE: {Products.FLOUR: D(1.5)},
+}
+
+# What `Strata.needs` reads. Installing a scenario replaces its contents, see `source.scenario`.
+NEEDS: dict[Strata, dict[Products, Decimal]] = dict(DEFAULT_NEEDS)
+
 class Jobs(Enum):
     UNEMPLOYED = auto()
     FARMER = auto()
@@ -160,7 +167,12 @@ class Pop(Group["Pop"], amount_attr='size'):
     def calc_consumption(self) -> Stock:
         """ Returns a `Stock` object containing how much this pop would need to eventually reach 1.0 welfare. """
 
-        return create_stock({product: need * self.size for product, need in self.stratum.needs.items()})
+        consumption = temporary(Stock)
+
+        for product, need in self.stratum.needs.items():
+            consumption[product] = trusted_good(product, need * self.size)
+
+        return consumption
 
     def update_welfare(self, consumption: Stock, stockpile: Stock, /):
         """
@@ -209,7 +221,7 @@ class Pop(Group["Pop"], amount_attr='size'):
 
         if self.stratum == Strata.LOWER:
             size = self.size * self.PROMOTE_RATE
-            return PopFactory.stratum_makepop(Strata.MIDDLE, size, self.welfare)
+            return PopFactory.trusted_stratum_makepop(Strata.MIDDLE, size, self.welfare)
         
         else:
             raise NotImplementedError   
@@ -218,26 +230,26 @@ class PopFactory:
 
     @staticmethod
     def _validate_size(size: num, /) -> Decimal:
-        if not isinstance(size, (Decimal, int, float, str)):
+        if validation.boundary and not isinstance(size, (Decimal, int, float, str)):
             raise TypeError(f'{type(size).__name__} type is not allowed for `size` parameter.')
         
         if not isinstance(size, Decimal):
             size = D(size)
 
-        if size < 0:
+        if validation.boundary and size < 0:
             raise NegativeAmountError(f'Sizes cannot be negative, but {size} was passed.')
         
         return size
 
     @staticmethod
     def _validate_welfare(size: num, welfare: num, /) -> Decimal:
-        if not isinstance(welfare, (Decimal, int, float, str)):
+        if validation.boundary and not isinstance(welfare, (Decimal, int, float, str)):
             raise TypeError(f'{type(welfare).__name__} type is not allowed for `welfare` parameter.')
         
         if not isinstance(welfare, Decimal):
             welfare = D(welfare)
 
-        if 0 > welfare or welfare > 1:
+        if validation.boundary and (0 > welfare or welfare > 1):
             raise ValueError(f'The `welfare` argument must be between 0 and 1, but {welfare} was passed.')
         
         if size == 0:
@@ -247,7 +259,7 @@ class PopFactory:
 
     @classmethod
     def job_makepop(cls, job: Jobs, size: num = D(0), welfare: num = D(Pop.BASE_WELFARE), /) -> Pop:
-        if not isinstance(job, Jobs):
+        if validation.boundary and not isinstance(job, Jobs):
             raise TypeError(f'{type(job).__name__} type is not allowed for the `job` parameter.')
         
         if job == Jobs.UNEMPLOYED:
@@ -260,7 +272,7 @@ class PopFactory:
 
     @classmethod
     def stratum_makepop(cls, stratum: Strata, size: num = D(0), welfare: num = D(Pop.BASE_WELFARE), /) -> Pop:
-        if not isinstance(stratum, Strata):
+        if validation.boundary and not isinstance(stratum, Strata):
             raise TypeError
         
         size = cls._validate_size(size)
@@ -268,9 +280,27 @@ class PopFactory:
 
         return Pop(size, welfare, stratum, Jobs.UNEMPLOYED)
 
+    @classmethod
+    def trusted_job_makepop(cls, job: Jobs, size: Decimal = D(0), welfare: Decimal = Pop.BASE_WELFARE, /) -> Pop:
+        """ For sizes and welfares the simulation computed itself. They are only checked when validation is `FULL`. """
+
+        if validation.full:
+            return cls.job_makepop(job, size, welfare)
+
+        return Pop(size, welfare if size != 0 else Pop.ZERO_SIZE_WELFARE, job.stratum, job)
+
+    @classmethod
+    def trusted_stratum_makepop(cls, stratum: Strata, size: Decimal = D(0), welfare: Decimal = Pop.BASE_WELFARE, /) -> Pop:
+        """ The unemployed counterpart of `trusted_job_makepop`. """
+
+        if validation.full:
+            return cls.stratum_makepop(stratum, size, welfare)
+
+        return Pop(size, welfare if size != 0 else Pop.ZERO_SIZE_WELFARE, stratum, Jobs.UNEMPLOYED)
+
     @classmethod
     def empty(cls, key) -> Pop:        
-        return cls.stratum_makepop(key[0]) if isinstance(key, tuple) else cls.job_makepop(key)
+        return cls.trusted_stratum_makepop(key[0]) if isinstance(key, tuple) else cls.trusted_job_makepop(key)
 
     def __init__(self, key: Jobs | Strata) -> None:
         if not isinstance(key, (Jobs, Strata)):
@@ -369,7 +399,7 @@ class Commune(Dyct[Jobs | unemployed_key, Pop], factory=PopFactory.empty):
             return D(0)
 
     def calc_goods_demand(self) -> Stock:
-        total_demand = create_stock()
+        total_demand = temporary(Stock)
         
         for pop in self.values():
             total_demand += pop.calc_consumption()
@@ -386,7 +416,7 @@ class Commune(Dyct[Jobs | unemployed_key, Pop], factory=PopFactory.empty):
             pop.resize()
 
     def promote_all(self) -> Commune:
-        promoted = CommuneFactory.create_by_job()
+        promoted = temporary(Commune)
 
         for pop in self.values():
             if pop.can_promote(): 
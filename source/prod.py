@@ -6,7 +6,8 @@ from inspect import isclass
 from math import isclose
 from typing import TYPE_CHECKING, Optional, overload
 from source.exceptions import CannotEmployError, NegativeAmountError
-from source.goods import Techs, Technology, Products, Stock, create_good, create_stock
+from source.goods import Techs, Technology, Products, Stock, create_stock, trusted_good
+from source.pool import temporary
 from source.pop import CommuneFactory, Commune, Jobs, Pop, PopFactory
 D = getcontext().create_decimal
 
@@ -71,14 +72,14 @@ class Industry(ABC):
         """ Returns a `dict[Jobs, int | float]` representing how many workers from a specific job are needed to fill up to capacity. """
 
         available_space = self.capacity - self.workforce.size
-        labor_demand = CommuneFactory.create_by_job()
+        labor_demand = temporary(Commune)
 
         if available_space <= 0: 
             return labor_demand
 
         for job, needed_pop in self.needed_workers.items():
             missing = max(D(0), needed_pop - self.workforce[job].size)
-            labor_demand += PopFactory.job_makepop(job, missing)
+            labor_demand += PopFactory.trusted_job_makepop(job, missing)
         
         total_needed = labor_demand.size
 
@@ -86,14 +87,20 @@ class Industry(ABC):
             return labor_demand
 
         weights = {job: pop.size / total_needed for job, pop in labor_demand.items()}  # job will never be `tuple[Strata, Jobs.UNEMPLOYED]``
-        labor_demand = CommuneFactory.create_by_job({job: weight * available_space for job, weight in weights.items()})  # type: ignore
+        labor_demand = temporary(Commune)
+
+        for job, weight in weights.items():
+            labor_demand[job] = PopFactory.trusted_job_makepop(job, weight * available_space)  # type: ignore
 
         return labor_demand
     
-    def can_employ(self, __value: Pop, /) -> bool:
-        """ This method does not care about amounts, for excess amounts will just be left in the original `Pop` object. """
+    def can_employ(self, __value: Pop, labor_demand: Optional[Commune] = None, /) -> bool:
+        """
+        This method does not care about amounts, for excess amounts will just be left in the original `Pop` object. `labor_demand`
+        is a result of `calc_labor_demand` that is still current, which is calculated again when it is not passed.
+        """
 
-        labor_demand = self.calc_labor_demand()
+        labor_demand = self.calc_labor_demand() if labor_demand is None else labor_demand
 
         if __value.job != Jobs.UNEMPLOYED:
             raise CannotEmployError(f'Can only employ jobless pops, but {__value} was passed.')
@@ -104,18 +111,19 @@ class Industry(ABC):
         else:
             return False
 
-    def employ(self, pop: Pop, /) -> None:
+    def employ(self, pop: Pop, labor_demand: Optional[Commune] = None, /) -> None:
         """ 
         Employs a pop assuming its job is `Jobs.UNEMPLOYED` and that the pop's stratum has jobs that are demanded by this `Extractor`.
         This modifies the passed `pop` argument in place. It removes the workers from it that were employed by this `Extractor`.
+        Employing changes the workforce, so a `labor_demand` passed to it is out of date afterwards.
         """
 
-        labor_demand = self.calc_labor_demand()
+        labor_demand = self.calc_labor_demand() if labor_demand is None else labor_demand
         job = max(labor_demand[pop.stratum].values()).job
 
         amount_employed = min(pop, labor_demand[job]).size
-        self.workforce += PopFactory.job_makepop(job, amount_employed, pop.welfare)
-        pop -= PopFactory.stratum_makepop(pop.stratum, amount_employed, pop.welfare)
+        self.workforce += PopFactory.trusted_job_makepop(job, amount_employed, pop.welfare)
+        pop -= PopFactory.trusted_stratum_makepop(pop.stratum, amount_employed, pop.welfare)
 
     def is_unbalanced(self) -> bool:
         """ A `Extractor` object will attempt to unemploy all pops that are causing its efficiency to drop below 100%. """
@@ -133,11 +141,11 @@ class Industry(ABC):
         """ Fires workers to bring the workforce back to the capacity. """
 
         overcapacity = self.workforce.size / self.capacity
-        excess = CommuneFactory.create_by_job()
+        excess = temporary(Commune)
 
         for job, pop in self.workforce.items():
             amount = pop.size - pop.size / overcapacity
-            excess += PopFactory.job_makepop(job, amount, pop.welfare)  # type: ignore
+            excess += PopFactory.trusted_job_makepop(job, amount, pop.welfare)  # type: ignore
 
         self.workforce -= excess
 
@@ -147,7 +155,9 @@ class Industry(ABC):
 class Extractor(Industry):
 
     def produce(self) -> Stock:
-        return create_stock({self.product: self.production.base_yield * self.workforce.size * self.calc_efficiency()})
+        produced = temporary(Stock)
+        produced[self.product] = trusted_good(self.product, self.production.base_yield * self.workforce.size * self.calc_efficiency())
+        return produced
         
 class Manufactury(Industry):
     
@@ -164,8 +174,8 @@ class Manufactury(Industry):
     def calc_potential_production(self) -> Decimal:
         return self.production.base_yield * self.workforce.size * self.calc_efficiency()
 
-    def calc_ceil(self) -> Decimal:
-        potential_production = self.calc_potential_production()
+    def calc_ceil(self, potential_production: Optional[Decimal] = None, /) -> Decimal:
+        potential_production = self.calc_potential_production() if potential_production is None else potential_production
         ceil = D(1)
         for product, share in self.production.recipe.items():
             needed_amount = share * potential_production
@@ -174,23 +184,20 @@ class Manufactury(Industry):
         return ceil
     
     def calc_input_demand(self) -> Stock:
-        demand = create_stock()
+        demand = temporary(Stock)
         potential_production = self.calc_potential_production()
 
         for product, share in self.production.recipe.items():
             difference = potential_production * share - self.stockpile[product].amount
 
-            try:
-                demand[product] += create_good(product, difference)
-            
-            except NegativeAmountError:
-                pass
-                        
+            if difference > 0:
+                demand[product] += trusted_good(product, difference)
+
         return demand
 
     def produce(self) -> Stock:
-        potential_production = self.calc_potential_production()
-        ceil = self.calc_ceil()
+        potential_production = self.calc_potential_production()  # Using up the stockpile leaves the workforce it depends on as is.
+        ceil = self.calc_ceil(potential_production)
 
         for product, share in self.production.recipe.items():
             amount_used = share * potential_production * ceil
@@ -198,9 +205,11 @@ class Manufactury(Industry):
             if isclose(amount_used, self.stockpile[product].amount):
                 amount_used = self.stockpile[product].amount
 
-            self.stockpile[product] -= create_good(product, amount_used)
+            self.stockpile[product] -= trusted_good(product, amount_used)
 
-        return create_stock({self.product: self.calc_potential_production() * ceil})
+        produced = temporary(Stock)
+        produced[self.product] = trusted_good(self.product, potential_production * ceil)
+        return produced
 
     def restock(self, stock: Stock) -> None:
         demand = self.calc_input_demand()
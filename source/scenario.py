@@ -0,0 +1,273 @@
+"""
+Scenarios declare the rules of a simulation, which are the techs of every product and the needs of every stratum, along with its
+initial world, in a TOML file. See `scenarios/default.toml` for the format.
+
+Parsing and validating a large scenario takes much longer than simulating its first ticks, so `load_scenario` caches the result in a
+compact binary next to the file and reads that instead for as long as neither the file nor the code of the `source` package changes.
+The cache is a pickle, so only load scenarios from folders you trust.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import cache
+from decimal import Decimal, getcontext
+from hashlib import sha256
+from pathlib import Path
+from random import Random
+from typing import Any, Optional
+from source.goods import DEFAULT_TECHS, TECHS, Products, Techs, Technology, create_stock
+from source.pop import DEFAULT_NEEDS, NEEDS, Jobs, Strata
+from source.world import World
+import os
+import pickle
+import tomllib
+D = getcontext().create_decimal
+
+CACHE_MAGIC = b'ECONSIM-SCENARIO'
+CACHE_VERSION = 1  # Version of the header. Changes to the pickled classes are caught by `_code_digest`.
+CACHE_SUFFIX = '.bin'
+
+@dataclass
+class Scenario:
+    """ `seed` is `None` when the scenario does not pin one, in which case every load gives the world a fresh `Random`. """
+
+    techs: dict[Products, dict[Techs, Technology]]
+    needs: dict[Strata, dict[Products, Decimal]]
+    world: World
+    seed: Optional[int] = None
+
+    def install(self) -> None:
+        """ Makes `Products.techs` and `Strata.needs` return this scenario's rules. """
+
+        TECHS.clear()
+        TECHS.update(self.techs)
+        NEEDS.clear()
+        NEEDS.update(self.needs)
+
+def restore_defaults() -> None:
+    """ Undoes `Scenario.install`. """
+
+    TECHS.clear()
+    TECHS.update(DEFAULT_TECHS)
+    NEEDS.clear()
+    NEEDS.update(DEFAULT_NEEDS)
+
+# ===================== Parsing =====================
+
+def _decimal(value: Any, where: str, /) -> Decimal:
+    # Floats go through `str` so that `0.8` in the file is exactly `Decimal('0.8')`.
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(f'`{where}` must be a number, but {value!r} was found.')
+
+    try:
+        return D(str(value))
+
+    except ArithmeticError:
+        raise ValueError(f'`{where}` must be a number, but {value!r} was found.') from None
+
+def _member[E](enum: type[E], name: Any, where: str, /) -> E:
+    if not isinstance(name, str) or name.upper() not in enum.__members__:  # type: ignore
+        raise ValueError(f'`{where}` must be one of {list(enum.__members__)}, but {name!r} was found.')  # type: ignore
+
+    return enum[name.upper()]  # type: ignore
+
+def _checked(value: Any, where: str, /) -> dict:
+    if not isinstance(value, dict):
+        raise TypeError(f'`{where}` must be a table.')
+
+    return value
+
+def _table(data: dict, key: str, /) -> dict:
+    return _checked(data.get(key, {}), key)
+
+def _parse_techs(data: dict, /) -> dict[Products, dict[Techs, Technology]]:
+    techs = dict(DEFAULT_TECHS)
+
+    for product_name, product_techs in _table(data, 'techs').items():
+        product = _member(Products, product_name, 'techs')
+        techs[product] = {}
+
+        for tech_name, spec in _checked(product_techs, f'techs.{product_name}').items():
+            where = f'techs.{product_name}.{tech_name}'
+            tech = _member(Techs, tech_name, where)
+            spec = _checked(spec, where)
+            base_yield = _decimal(spec.get('base_yield'), f'{where}.base_yield')
+
+            if base_yield <= 0:
+                raise ValueError(f'`{where}.base_yield` must be positive.')
+
+            if 'recipe' not in spec:
+                techs[product][tech] = Technology(base_yield)
+                continue
+
+            recipe = {_member(Products, name, f'{where}.recipe'): _decimal(share, f'{where}.recipe.{name}') for name, share in _checked(spec['recipe'], f'{where}.recipe').items()}
+
+            if any(share <= 0 for share in recipe.values()) or sum(recipe.values()) != 1:
+                raise ValueError(f'The shares of `{where}.recipe` must be positive and add up to 1.')
+
+            techs[product][tech] = Technology(base_yield, recipe)
+
+    return techs
+
+def _parse_needs(data: dict, /) -> dict[Strata, dict[Products, Decimal]]:
+    needs = dict(DEFAULT_NEEDS)
+
+    for stratum_name, stratum_needs in _table(data, 'needs').items():
+        stratum = _member(Strata, stratum_name, 'needs')
+        needs[stratum] = {_member(Products, name, f'needs.{stratum_name}'): _decimal(amount, f'needs.{stratum_name}.{name}')
+                          for name, amount in _checked(stratum_needs, f'needs.{stratum_name}').items()}
+
+        if any(amount <= 0 for amount in needs[stratum].values()):
+            raise ValueError(f'The needs of `{stratum_name}` must be positive.')
+
+    return needs
+
+def _pop_rows(commune: int, pops: dict, where: str, rows: dict[str, list], /) -> None:
+    """ Keys are job names, or strata names for unemployed pops. Values are sizes or `{ size = ..., welfare = ... }` tables. """
+
+    for name, value in pops.items():
+        size, welfare = (value.get('size'), value.get('welfare', '0.5')) if isinstance(value, dict) else (value, '0.5')
+
+        if isinstance(name, str) and name.upper() in Strata.__members__:
+            job, stratum = Jobs.UNEMPLOYED, Strata[name.upper()]
+
+        else:
+            job = _member(Jobs, name, where)
+            stratum = job.stratum
+
+        rows['commune'].append(commune)
+        rows['job'].append(job.name)
+        rows['stratum'].append(stratum.name)
+        rows['size'].append(str(_decimal(size, f'{where}.{name}')))
+        rows['welfare'].append(str(_decimal(welfare, f'{where}.{name}.welfare')))
+
+def parse_scenario(data: dict[str, Any], /) -> Scenario:
+    """ Validates an already decoded scenario, installs its rules and builds its world. """
+
+    from source.bulk import JOBLESS, NEEDED_PREFIX, STOCK_PREFIX, world_from_tables
+
+    techs = _parse_techs(data)
+    needs = _parse_needs(data)
+    seed = data.get('seed')
+
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+        raise TypeError('`seed` must be an integer.')
+
+    industries = data.get('industries', [])
+    settlements = data.get('settlements', [])
+
+    industry_rows: dict[str, list] = {'product': [], 'tech': []}
+    needed_columns = {f'{NEEDED_PREFIX}{job.name}': [] for job in Jobs if job != Jobs.UNEMPLOYED}
+    stock_columns = {f'{STOCK_PREFIX}{product.name}': [] for product in Products}
+    pop_rows: dict[str, list] = {'commune': [], 'job': [], 'stratum': [], 'size': [], 'welfare': []}
+
+    for index, industry in enumerate(industries):
+        where = f'industries[{index}]'
+        industry = _checked(industry, where)
+        industry_rows['product'].append(_member(Products, industry.get('product'), f'{where}.product').name)
+        industry_rows['tech'].append(_member(Techs, industry.get('tech', 'EXTRACTION'), f'{where}.tech').name)
+
+        needed = {_member(Jobs, name, f'{where}.needed').name: _decimal(amount, f'{where}.needed.{name}') for name, amount in _checked(industry.get('needed', {}), f'{where}.needed').items()}
+        stockpile = {_member(Products, name, f'{where}.stockpile').name: _decimal(amount, f'{where}.stockpile.{name}') for name, amount in _checked(industry.get('stockpile', {}), f'{where}.stockpile').items()}
+
+        for column, values in needed_columns.items():
+            values.append(str(needed.get(column.removeprefix(NEEDED_PREFIX), 0)))
+
+        for column, values in stock_columns.items():
+            values.append(str(stockpile.get(column.removeprefix(STOCK_PREFIX), 0)))
+
+        _pop_rows(index, _checked(industry.get('workforce', {}), f'{where}.workforce'), f'{where}.workforce', pop_rows)
+
+    for index, settlement in enumerate(settlements):
+        _pop_rows(len(industries) + index, _checked(settlement, f'settlements[{index}]'), f'settlements[{index}]', pop_rows)
+
+    _pop_rows(JOBLESS, _table(data, 'jobless'), 'jobless', pop_rows)
+
+    common_stock = create_stock({_member(Products, name, 'stock'): _decimal(amount, f'stock.{name}') for name, amount in _table(data, 'stock').items()})
+
+    # The industries take their technologies from the installed rules, so they are installed first and put back on failure.
+    previous = dict(TECHS), dict(NEEDS)
+    scenario = Scenario(techs, needs, None, seed)  # type: ignore
+    scenario.install()
+
+    try:
+        industry_table = industry_rows | needed_columns | stock_columns
+        scenario.world = world_from_tables(industry_table, pop_rows, common_stock, len(settlements), Random(seed))
+
+    except Exception:
+        Scenario(*previous, None).install()  # type: ignore
+        raise
+
+    return scenario
+
+# ===================== Binary cache =====================
+
+def cache_path(path: Path, /) -> Path:
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+@cache
+def _code_digest() -> bytes:
+    """ Hash of every module of the `source` package, whose classes make up the pickled scenario. """
+
+    digest = sha256()
+
+    for module in sorted(Path(__file__).parent.glob('*.py')):
+        digest.update(module.name.encode() + b'\0' + module.read_bytes())
+
+    return digest.digest()
+
+def _read_cache(path: Path, digest: bytes, /) -> Optional[Scenario]:
+    try:
+        blob = path.read_bytes()
+
+    except OSError:
+        return None
+
+    header = CACHE_MAGIC + CACHE_VERSION.to_bytes(2, 'little') + digest
+
+    if not blob.startswith(header):
+        return None
+
+    try:
+        scenario = pickle.loads(memoryview(blob)[len(header):])
+
+    except Exception:  # A cache written by older code is just rebuilt.
+        return None
+
+    return scenario if isinstance(scenario, Scenario) else None
+
+def _write_cache(path: Path, digest: bytes, scenario: Scenario, /) -> None:
+    header = CACHE_MAGIC + CACHE_VERSION.to_bytes(2, 'little') + digest
+    temporary = path.with_name(path.name + '.tmp')
+
+    try:
+        temporary.write_bytes(header + pickle.dumps(scenario, pickle.HIGHEST_PROTOCOL))
+        os.replace(temporary, path)
+
+    except OSError:  # Not being able to cache only costs the next load its speed.
+        temporary.unlink(missing_ok=True)
+
+def load_scenario(path: Path, /, use_cache: bool = True) -> Scenario:
+    """
+    Loads the scenario at `path`, installs its rules and returns it. The binary cache is used when it was built from the exact same
+    file by the exact same code and is rewritten otherwise.
+    """
+
+    source = path.read_bytes()
+    digest = sha256(_code_digest() + source).digest()
+
+    scenario = _read_cache(cache_path(path), digest) if use_cache else None
+
+    if scenario is None:
+        scenario = parse_scenario(tomllib.loads(source.decode()))
+
+        if use_cache:
+            _write_cache(cache_path(path), digest, scenario)
+
+    else:
+        scenario.install()
+
+    if scenario.seed is None:
+        scenario.world.rng = Random()
+
+    return scenario
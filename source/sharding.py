@@ -0,0 +1,284 @@
+"""
+Runs a world split into provinces, each a `World` of its own living in a worker process, possibly on another host. The coordinator
+and the workers only exchange the boundary flows of each tick, over a compact binary protocol on TCP sockets.
+
+Each province is built by its worker from a `Province`, either a seed and a scale for `scaled_world` or a scenario file the worker
+can read, so no world ever crosses the wire. Workers run with the same decimal context as `main.py` and the validation level of the
+coordinator, so a province rounds exactly as it would in a single process.
+Every tick the coordinator sends each worker the goods flowing into or out of its common stock, the worker applies them and ticks
+its world, and replies with its common stock, from which the coordinator computes the next flows with `exchange`.
+
+Run a worker with `python -m source.sharding HOST PORT` once the coordinator is listening on that address.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from decimal import ROUND_HALF_DOWN, Context, Decimal, DivisionByZero, InvalidOperation, getcontext, localcontext, setcontext
+from enum import IntEnum
+from pathlib import Path
+from random import Random
+from typing import Optional
+from source.codec import Codec, decode, encode
+from source.generate import scaled_world
+from source.goods import Products, trusted_good
+from source.validation import Validation, set_validation
+from source.world import World, tick
+from source import validation
+import socket
+import struct
+import sys
+D = getcontext().create_decimal
+
+PRODUCTS = tuple(Products)  # The order of the amounts in every message.
+TRADE_SHARE = D('0.1')  # The share of the gap to the average stock of all provinces that flows into or out of each province every tick.
+
+HEADER = struct.Struct('!BI')  # Message kind and payload length.
+INIT = struct.Struct('!qIB')  # Seed and scale of the province and validation level, followed by the path of its scenario, if any.
+AMOUNTS = struct.Struct('!Q')  # Tick, followed by the amounts as `source.codec` encodes them.
+
+class Message(IntEnum):
+    INIT = 1
+    TICK = 2
+    STOCK = 3
+    STOP = 4
+
+def _context() -> Context:
+    """ The decimal context `main.py` runs the simulation in. """
+
+    return Context(rounding=ROUND_HALF_DOWN, traps=[DivisionByZero, InvalidOperation])
+
+@dataclass(frozen=True)
+class Province:
+    """
+    A generated world of `scale` times the default size, or the world of the scenario at `scenario`, whose rules are installed when
+    it is built. `seed` seeds the world either way. Installing rules is global to a process, so provinces run by `run_local` must
+    all share the same rules.
+    """
+
+    seed: int
+    scale: int = 1
+    scenario: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.scenario is not None and self.scale != 1:
+            raise ValueError('The scale only applies to generated provinces, not to those of a scenario.')
+
+    def build(self) -> World:
+        if self.scenario is None:
+            return scaled_world(self.scale, self.seed)
+
+        from source.scenario import load_scenario
+
+        world = load_scenario(Path(self.scenario)).world
+        world.rng = Random(self.seed)
+        return world
+
+# ===================== Protocol =====================
+
+def _pack_amounts(at: int, amounts: list[Decimal], /) -> bytes:
+    # `Codec.EXACT` keeps every digit, so a province rounds the same on either side of the wire.
+    return AMOUNTS.pack(at) + encode(amounts, Codec.EXACT)
+
+def _unpack_amounts(payload: bytes, /) -> tuple[int, list[Decimal]]:
+    try:
+        at, = AMOUNTS.unpack_from(payload)
+
+    except struct.error:
+        raise ConnectionError('The message is too short to hold amounts.') from None
+
+    amounts = decode(memoryview(payload)[AMOUNTS.size:])
+
+    if not isinstance(amounts, list):
+        raise ConnectionError('The message does not hold amounts.')
+
+    return at, amounts
+
+def _receive_exactly(connection: socket.socket, size: int, /) -> bytes:
+    data = bytearray()
+
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+
+        if not chunk:
+            raise ConnectionError('The connection was closed in the middle of a message.')
+
+        data += chunk
+
+    return bytes(data)
+
+def send(connection: socket.socket, kind: Message, payload: bytes = b'', /) -> None:
+    connection.sendall(HEADER.pack(kind, len(payload)) + payload)
+
+def receive(connection: socket.socket, /) -> tuple[Message, bytes]:
+    kind, length = HEADER.unpack(_receive_exactly(connection, HEADER.size))
+    return Message(kind), _receive_exactly(connection, length)
+
+# ===================== Flows =====================
+
+def stock_amounts(world: World, /) -> list[Decimal]:
+    return [world.common_stock[product].amount for product in PRODUCTS]
+
+def apply_flows(world: World, flows: list[Decimal], /) -> None:
+    for product, flow in zip(PRODUCTS, flows):
+        if flow > 0:
+            world.common_stock += trusted_good(product, flow)
+
+        elif flow < 0:
+            world.common_stock -= trusted_good(product, -flow)
+
+def exchange(stocks: list[list[Decimal]], /) -> list[list[Decimal]]:
+    """
+    The flows of every province, `TRADE_SHARE` of the gap between its stock and the average of all provinces for each product. The
+    last province takes whatever the others' flows leave, so that flows always add up to exactly zero.
+    """
+
+    flows = [[D(0)] * len(PRODUCTS) for _ in stocks]
+
+    for column in range(len(PRODUCTS)):
+        average = sum(stock[column] for stock in stocks) / len(stocks)
+
+        for row, stock in enumerate(stocks[:-1]):
+            flows[row][column] = (average - stock[column]) * TRADE_SHARE
+
+        flows[-1][column] = -sum(flow[column] for flow in flows[:-1])
+
+    return flows
+
+def run_local(provinces: list[Province], ticks: int, /) -> list[list[list[Decimal]]]:
+    """ What `Coordinator.run` computes, in a single process. Returns the stocks of every province after each tick. """
+
+    with localcontext(_context()):
+        worlds = [province.build() for province in provinces]
+        stocks = [stock_amounts(world) for world in worlds]
+        history = []
+
+        for _ in range(ticks):
+            for world, flows in zip(worlds, exchange(stocks)):
+                apply_flows(world, flows)
+                tick(world)
+
+            stocks = [stock_amounts(world) for world in worlds]
+            history.append(stocks)
+
+    return history
+
+# ===================== Coordinator and workers =====================
+
+class Coordinator:
+    """
+    Listens on `host` and `port`, the latter picked by the system if 0, for one worker per province. Provinces are assigned to
+    workers in the order they connect, along with the validation level the coordinator runs at. Use it as a context manager, which
+    stops the workers on exit.
+    """
+
+    def __init__(self, provinces: list[Province], /, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.provinces = provinces
+        self.server = socket.create_server((host, port))
+        self.workers: list[socket.socket] = []
+        self.stocks: list[list[Decimal]] = []
+        self.tick = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.server.getsockname()[:2]
+
+    def __enter__(self) -> Coordinator:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def accept(self, timeout: Optional[float] = None, /) -> None:
+        """ Waits for every worker to connect and build its province. """
+
+        self.server.settimeout(timeout)
+
+        for province in self.provinces:
+            connection, _ = self.server.accept()
+            connection.settimeout(None)
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            scenario = b'' if province.scenario is None else province.scenario.encode('utf-8')
+            send(connection, Message.INIT, INIT.pack(province.seed, province.scale, validation.level.value) + scenario)
+            self.workers.append(connection)
+
+        self.stocks = [self._receive_stock(worker) for worker in self.workers]
+
+    def _receive_stock(self, worker: socket.socket, /) -> list[Decimal]:
+        kind, payload = receive(worker)
+
+        if kind != Message.STOCK:
+            raise ConnectionError(f'Expected a {Message.STOCK.name} message, but got {kind.name}.')
+
+        at, amounts = _unpack_amounts(payload)
+
+        if at != self.tick:
+            raise ConnectionError(f'A worker replied for tick {at} during tick {self.tick}.')
+
+        return amounts
+
+    def step(self) -> list[list[Decimal]]:
+        """ Sends every worker its flows, waits for all of them to tick and returns their new stocks. """
+
+        with localcontext(_context()):
+            flows = exchange(self.stocks)
+
+        self.tick += 1
+
+        # Every worker is sent its flows before any reply is awaited, so that provinces tick at the same time.
+        for worker, province_flows in zip(self.workers, flows):
+            send(worker, Message.TICK, _pack_amounts(self.tick, province_flows))
+
+        self.stocks = [self._receive_stock(worker) for worker in self.workers]
+        return self.stocks
+
+    def run(self, ticks: int, /) -> list[list[list[Decimal]]]:
+        return [self.step() for _ in range(ticks)]
+
+    def close(self) -> None:
+        for worker in self.workers:
+            try:
+                send(worker, Message.STOP)
+
+            except OSError:
+                pass
+
+            worker.close()
+
+        self.workers.clear()
+        self.server.close()
+
+def serve(host: str, port: int, /) -> None:
+    """ Connects to the coordinator at `host` and `port` and runs the province it is given until told to stop. """
+
+    setcontext(_context())
+
+    with socket.create_connection((host, port)) as connection:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        world: Optional[World] = None
+
+        while True:
+            kind, payload = receive(connection)
+
+            match kind:
+
+                case Message.INIT:
+                    seed, scale, level = INIT.unpack_from(payload)
+                    scenario = payload[INIT.size:].decode('utf-8') or None
+                    set_validation(Validation(level))
+                    world = Province(seed, scale, scenario).build()
+                    send(connection, Message.STOCK, _pack_amounts(0, stock_amounts(world)))
+
+                case Message.TICK if world is not None:
+                    at, flows = _unpack_amounts(payload)
+                    apply_flows(world, flows)
+                    tick(world)
+                    send(connection, Message.STOCK, _pack_amounts(at, stock_amounts(world)))
+
+                case Message.STOP:
+                    return
+
+                case _:
+                    raise ConnectionError(f'Unexpected {kind.name} message.')
+
+if __name__ == '__main__':
+    serve(sys.argv[1], int(sys.argv[2]))
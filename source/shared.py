@@ -0,0 +1,189 @@
+"""
+World arrays in `multiprocessing.shared_memory`, so that worker processes can run the kernels of `source.kernels` on one large world
+without pickling any of it.
+
+The columns a kernel reads, such as pop sizes and welfares or the workers of every industry, are written once into a shared block.
+Each worker attaches to the block by name the first time it sees it and from then on only receives which kernel to run on which
+rows, reading its inputs and writing its outputs in place. Blocks are reused from tick to tick and only replaced when the world
+outgrows them.
+"""
+
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from math import prod
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Optional
+from source import kernels
+from source.world import World
+from source import world as reference
+import numpy as np
+import os
+import sys
+
+if TYPE_CHECKING:
+    from visual.gather import DataManager
+
+@dataclass(frozen=True)
+class Layout:
+    """ Where each array of a block is, which is all a worker needs to attach to it. Arrays are `float64` and C-ordered. """
+
+    name: str
+    fields: tuple[tuple[str, tuple[int, ...], int], ...]  # Name, shape and byte offset of each array.
+
+class SharedArrays:
+    """ Named arrays in one shared memory block. Create them with `create` and attach to existing ones with `attach`. """
+
+    def __init__(self, memory: SharedMemory, layout: Layout, /) -> None:
+        self.memory = memory
+        self.layout = layout
+        self.arrays = {name: np.ndarray(shape, float, memory.buf, offset) for name, shape, offset in layout.fields}
+
+    @classmethod
+    def create(cls, shapes: dict[str, tuple[int, ...]], /) -> SharedArrays:
+        fields = []
+        offset = 0
+
+        for name, shape in shapes.items():
+            fields.append((name, shape, offset))
+            offset += prod(shape) * np.dtype(float).itemsize
+
+        memory = SharedMemory(create=True, size=max(offset, 1))
+        return cls(memory, Layout(memory.name, tuple(fields)))
+
+    @classmethod
+    def attach(cls, layout: Layout, /) -> SharedArrays:
+        # Only the process that created the block unlinks it, so attaching must not register it with the resource tracker.
+        if sys.version_info >= (3, 13):
+            return cls(SharedMemory(layout.name, track=False), layout)
+
+        # Python 3.12 has no `track` argument and always registers the block. Workers share the tracker of the process that started
+        # them, which keeps one registration per name, so this one is the creator's and goes away when the creator unlinks the
+        # block. Unregistering it here as well would make the tracker fail on that unlink.
+        return cls(SharedMemory(layout.name), layout)
+
+    def __getitem__(self, name: str, /) -> np.ndarray:
+        return self.arrays[name]
+
+    def fits(self, shapes: dict[str, tuple[int, ...]], /) -> bool:
+        current = {name: shape for name, shape, _ in self.layout.fields}
+        return current.keys() == shapes.keys() and all(len(current[name]) == len(shape) and current[name][0] >= shape[0] and
+                                                       current[name][1:] == shape[1:] for name, shape in shapes.items())
+
+    def close(self) -> None:
+        self.arrays.clear()  # The views must go before the buffer they point into can be released.
+        self.memory.close()
+
+    def unlink(self) -> None:
+        self.memory.unlink()
+
+# ===================== Workers =====================
+
+_attached: dict[tuple[str, ...], SharedArrays] = {}  # By the names of their arrays, which tells the blocks of each kernel apart.
+
+def _attach(layout: Layout, /) -> SharedArrays:
+    key = tuple(name for name, _, _ in layout.fields)
+    current = _attached.get(key)
+
+    if current is None or current.layout != layout:
+        if current is not None:  # The engine replaced the block, so this one is being unlinked.
+            current.close()
+
+        _attached[key] = SharedArrays.attach(layout)
+
+    return _attached[key]
+
+def _run(layout: Layout, kernel: str, inputs: tuple[str, ...], output: str, start: int, stop: int, constants: tuple, /) -> None:
+    """ Runs `kernel` on rows `[start, stop)` of the `inputs` arrays and writes the result into the same rows of `output`. """
+
+    arrays = _attach(layout)
+    arrays[output][start:stop] = getattr(kernels, kernel)(*(arrays[name][start:stop] for name in inputs), *constants)
+
+# ===================== Engine =====================
+
+class SharedEngine:
+    """
+    Runs ticks of the kernels engine with the efficiencies of the industries and the resizing of the pops split among `workers`
+    processes, which read and write the world's columns in shared memory. Use it as a context manager, which shuts the workers
+    down and frees the shared memory on exit.
+
+    The world itself stays `Decimal` objects in the main process, so only those two kernels run in the workers, and they are a
+    small part of a tick next to employment and promotion. On a scale 50 world it runs slower than `source.kernels.tick`, which is
+    why `main.py` does not offer it as an engine.
+    """
+
+    def __init__(self, workers: Optional[int] = None, /) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.executor: Executor = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'))
+        self.blocks: dict[str, SharedArrays] = {}
+        self.phases: tuple[reference.phase, ...] = (partial(kernels.production, efficiency=self.efficiencies),
+                                                    kernels.consumption,
+                                                    partial(kernels.resizing, resize=self.resized),
+                                                    reference.promotion,
+                                                    reference.employment,
+                                                    kernels.rebalancing)
+
+    def __enter__(self) -> SharedEngine:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+        for arrays in self.blocks.values():
+            arrays.close()
+            arrays.unlink()
+
+        self.blocks.clear()
+
+    def _block(self, kernel: str, rows: int, columns: dict[str, tuple[int, ...]], /) -> SharedArrays:
+        """
+        The block of `kernel`, which must have room for at least `rows` rows of every column. When it does not it is replaced by one
+        twice as large, so that a growing world does not replace it every tick.
+        """
+
+        arrays = self.blocks.get(kernel)
+
+        if arrays is None or not arrays.fits({name: (rows, *shape) for name, shape in columns.items()}):
+            if arrays is not None:
+                arrays.close()
+                arrays.unlink()
+
+            arrays = self.blocks[kernel] = SharedArrays.create({name: (max(2 * rows, 1), *shape) for name, shape in columns.items()})
+
+        return arrays
+
+    def _map(self, kernel: str, inputs: tuple[str, ...], output: str, rows: int, constants: tuple = (), /) -> None:
+        bounds = np.linspace(0, rows, min(self.workers, rows) + 1, dtype=int).tolist()
+        layout = self.blocks[kernel].layout
+        futures = [self.executor.submit(_run, layout, kernel, inputs, output, start, stop, constants) for start, stop in zip(bounds, bounds[1:])]
+
+        for future in futures:
+            future.result()
+
+    def efficiencies(self, sizes: np.ndarray, needed: np.ndarray, /) -> np.ndarray:
+        rows, jobs = sizes.shape
+        arrays = self._block('efficiencies', rows, {'sizes': (jobs,), 'needed': (jobs,), 'efficiency': ()})
+        arrays['sizes'][:rows] = sizes
+        arrays['needed'][:rows] = needed
+
+        self._map('efficiencies', ('sizes', 'needed'), 'efficiency', rows)
+        return arrays['efficiency'][:rows].copy()
+
+    def resized(self, sizes: np.ndarray, welfares: np.ndarray, threshold: float, rate: float, /) -> np.ndarray:
+        rows = len(sizes)
+        arrays = self._block('resized', rows, {'sizes': (), 'welfares': (), 'resized': ()})
+        arrays['sizes'][:rows] = sizes
+        arrays['welfares'][:rows] = welfares
+
+        self._map('resized', ('sizes', 'welfares'), 'resized', rows, (threshold, rate))
+        return arrays['resized'][:rows].copy()
+
+    def tick(self, world: World, recorder: Optional[DataManager] = None, /) -> None:
+        """ `source.kernels.tick` with its parallel kernels run by the workers. """
+
+        reference.tick(world, recorder, self.phases)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from enum import Enum
+from typing import Iterator
+
+class Validation(Enum):
+    """
+    How much the simulation checks its own values.
+
+    `FULL` checks every arithmetic operation between groups and every value passed to a factory, including those the engine
+    computed itself. `BOUNDARY` only checks the values that enter the simulation through the user-facing factories, such as
+    `create_good` or `PopFactory.job_makepop`, while trusted internal paths and arithmetic skip their checks. `OFF` skips every check.
+    """
+
+    OFF = 0
+    BOUNDARY = 1
+    FULL = 2
+
+level = Validation.FULL
+
+# Read directly by the hot paths, so they do not need to compare enum members on every operation.
+full = True
+boundary = True
+
+def set_validation(new_level: Validation, /) -> None:
+    global level, full, boundary
+
+    if not isinstance(new_level, Validation):
+        raise TypeError(f'{type(new_level).__name__} type is not a validation level.')
+
+    level = new_level
+    full = new_level == Validation.FULL
+    boundary = new_level != Validation.OFF
+
+@contextmanager
+def validating(new_level: Validation, /) -> Iterator[None]:
+    """ Sets the validation level for the duration of the block and then restores the previous one. """
+
+    previous = level
+    set_validation(new_level)
+
+    try:
+        yield
+
+    finally:
+        set_validation(previous)
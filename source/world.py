@@ -0,0 +1,174 @@
+from __future__ import annotations
+from source.goods import Products, Stock, Techs, create_stock
+from source.pop import Commune, CommuneFactory, Jobs
+from source.prod import Industry, IndustryFactory, Manufactury
+from source.algs import proportional, retrospective
+from source.pool import Arena, scope
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional
+from random import Random
+
+if TYPE_CHECKING:
+    from visual.gather import DataManager
+
+@dataclass
+class World:
+    """
+    Everything that changes during a simulation. Use the `create` class method unless the lists need a specific order.
+
+    `manufacturies` and `communes` reference the same objects as `industries` and `jobless_pops`. They are kept as lists of their
+    own because `manufacturies` and `industries` are shuffled independently every tick, while `communes` keeps its order.
+    Besides the workforces and the jobless pops, `communes` may hold settlements: communes that do not work for any industry but
+    still consume, resize and promote.
+
+    `arena` holds the temporary stocks and communes of the tick phases, which are recycled from one phase to the next, and
+    `stock_buffer` is the second buffer of the common stock, see `buffer_stock`.
+    """
+
+    industries: list[Industry]
+    manufacturies: list[Manufactury]
+    communes: list[Commune]
+    common_stock: Stock
+    jobless_pops: Commune
+    rng: Random = field(default_factory=Random)
+    arena: Arena = field(default_factory=Arena, repr=False, compare=False)
+    stock_buffer: Stock = field(default_factory=create_stock, repr=False, compare=False)
+
+    @classmethod
+    def create(cls,
+               industries: list[Industry],
+               common_stock: Stock,
+               jobless_pops: Commune,
+               rng: Optional[Random] = None,
+               settlements: Optional[list[Commune]] = None, /) -> World:
+        
+        manufacturies = [industry for industry in industries if isinstance(industry, Manufactury)]
+        communes = [industry.workforce for industry in industries] + (settlements or []) + [jobless_pops]
+
+        return cls(list(industries), manufacturies, communes, common_stock, jobless_pops, Random() if rng is None else rng)
+
+    def buffer_stock(self) -> Stock:
+        """
+        The common stock as it is now, in `stock_buffer`, which a phase can hold on to while it changes the common stock to tell
+        what it changed. The buffer is brought up to date with its own goods rather than copied, so it only holds until the next call.
+        """
+
+        self.stock_buffer.mirror(self.common_stock)
+        return self.stock_buffer
+
+    @property
+    def settlements(self) -> list[Commune]:
+        workforces = {id(industry.workforce) for industry in self.industries}
+        return [commune for commune in self.communes if id(commune) not in workforces and commune is not self.jobless_pops]
+
+def default_world(rng: Optional[Random] = None, /) -> World:
+    """ Two extractors and two manufacturies of flour sharing a common stock. """
+
+    WHEAT = Products.WHEAT
+    IRON = Products.IRON
+    FLOUR = Products.FLOUR
+
+    FARMER = Jobs.FARMER
+    MINER = Jobs.MINER
+    CRAFTSMAN = Jobs.CRAFTSMAN
+    SPECIALIST = Jobs.SPECIALIST
+
+    CRAFTING = Techs.CRAFTING
+    MILLING = Techs.MILLING
+
+    farm = IndustryFactory.create_industry(WHEAT, {FARMER: 990, SPECIALIST: 10}, {FARMER: 200, SPECIALIST: 5})
+    mine = IndustryFactory.create_industry(IRON, {MINER: 990, SPECIALIST: 10}, {MINER: 200, SPECIALIST: 5})
+    flour_craft = IndustryFactory.create_industry(FLOUR, {CRAFTSMAN: 990, SPECIALIST: 10}, {CRAFTSMAN: 200, SPECIALIST: 5}, CRAFTING)
+    flour_mill = IndustryFactory.create_industry(FLOUR, {CRAFTSMAN: 990, SPECIALIST: 10}, {CRAFTSMAN: 200, SPECIALIST: 5}, MILLING)
+
+    common_stock = create_stock({WHEAT: 500, IRON: 500})
+    jobless_pops = CommuneFactory.create_by_job()
+
+    return World.create([farm, mine, flour_craft, flour_mill], common_stock, jobless_pops, rng)
+
+# ===================== Tick phases =====================
+
+type phase = Callable[[World, Optional[DataManager]], None]
+
+def production(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    if recorder is not None:
+        recorder.record_goods_satisfaction(world.common_stock)
+
+    before = world.common_stock
+    if recorder is not None and recorder.records_next('goods_produced'):
+        before = world.buffer_stock()
+
+    for industry in world.industries:
+        world.common_stock += industry.produce()
+
+    if recorder is not None:
+        recorder.record_goods_produced(before, world.common_stock)
+        recorder.record_stockpile(world.common_stock)
+
+def consumption(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    original_stock = world.common_stock
+    if recorder is not None and recorder.records_next('goods_consumed'):
+        original_stock = world.buffer_stock()
+
+    if recorder is not None:
+        recorder.record_goods_demanded()
+
+    world.rng.shuffle(world.manufacturies)
+    for manufactury in world.manufacturies:
+        manufactury.restock(world.common_stock)
+
+    world.rng.shuffle(world.industries)
+    for industry in world.industries:
+        industry.workforce.update_welfares(world.common_stock, proportional)
+
+    world.jobless_pops.update_welfares(world.common_stock, proportional)
+
+    for settlement in world.settlements:
+        settlement.update_welfares(world.common_stock, proportional)
+
+    if recorder is not None:
+        recorder.record_pop_welfare()
+        recorder.record_goods_consumed(original_stock, world.common_stock)
+
+def resizing(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    for commune in world.communes:
+        commune.resize_all()
+
+def promotion(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    # The fact that promotion goes after resizing does affect the behavior of the simulation, for the promotions will be larger this way.
+    for commune in world.communes:
+        if commune is world.jobless_pops: continue
+        world.jobless_pops += commune.promote_all()
+
+def employment(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    world.rng.shuffle(world.industries)  # TODO implement an algorithm for choosing what Extractor gets the goods first, or that divides it between them.
+    for industry in world.industries:
+        labor_demand = None  # Only calculated again once employing has changed the workforce it depends on.
+
+        for pop in world.jobless_pops.values():
+            if labor_demand is None:
+                labor_demand = industry.calc_labor_demand()
+
+            if industry.can_employ(pop, labor_demand):
+                industry.employ(pop, labor_demand)
+                labor_demand = None
+
+def rebalancing(world: World, recorder: Optional[DataManager] = None, /) -> None:
+    for industry in world.industries:
+        if industry.workforce.size > industry.capacity:
+            world.jobless_pops += industry.fire_excess()
+
+        if industry.is_unbalanced():
+            world.jobless_pops += industry.balance(retrospective)
+
+    if recorder is not None:
+        recorder.record_pop_size()
+
+PHASES: tuple[phase, ...] = (production, consumption, resizing, promotion, employment, rebalancing)
+
+def tick(world: World, recorder: Optional[DataManager] = None, /, phases: tuple[phase, ...] = PHASES) -> None:
+    """ Advances the world by one tick, recording it in `recorder` if one is passed. """
+
+    for phase in phases:
+        with scope(world.arena):
+            phase(world, recorder)
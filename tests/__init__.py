@@ -1,12 +1,10 @@
 from abc import ABC
 from decimal import getcontext
-from pathlib import Path
-from importlib import import_module
-from unittest import TestCase, TestLoader, TextTestRunner
-from source import Q
+from unittest import TestCase
+from source import PRECISION as Q
 from source.abcs import Dyct
 from source.algs import balance_alg, sharing_alg
-from source.goods import Good, ProdTech, Products, Stock
+from source.goods import Good, Products, Stock, Techs as ProdTech
 from source.pop import Commune, Pop
 from source.prod import Extractor, Industry, Manufactury
 
@@ -61,23 +59,3 @@ class AlgsMixIn(ProdMixIn):
         self.assert_communes_equal(unemployed, com_exp)
         self.assert_industries_equal(ext, ext_exp)
 
-####################################################################################################################################
-
-loader = TestLoader()
-runner = TextTestRunner()
-tests_path = (Path.cwd() / __file__).parent
-
-for directory in tests_path.iterdir():
-    if not directory.is_dir() and not directory.name.startswith('__'):
-
-        module_name = f'{tests_path.name}.{directory.with_suffix('').name}'
-        
-        # ['tests.test_goods', 'tests.test_pop', 'tests.test_prod', 'tests.test_algs', ]
-        if module_name in ['tests.test_goods', 'tests.test_pop', 'tests.test_algs', ]: continue
-
-        module = import_module(module_name)
-
-        print(f'\n\nRunning tests for {directory.name}...')
-        suite = loader.loadTestsFromModule(module)
-
-        runner.run(suite)
@@ -0,0 +1,197 @@
+"""
+Differential oracle between the reference engine, the `Decimal`, object-based code in `source`, and any faster backend meant to
+replace part of it. Both run the same seeded scenario and every metric `DataManager` records is compared tick by tick, reporting
+the first one that differs by more than its tolerance.
+"""
+
+from __future__ import annotations
+from copy import deepcopy
+from dataclasses import dataclass
+from decimal import Decimal, getcontext
+from pathlib import Path
+from random import Random
+from tempfile import gettempdir
+from typing import Callable, Iterable, Optional
+from source.algs import sharing_alg
+from source.generate import generate_world
+from source.goods import Products, Stock, create_stock
+from source.pop import Commune, Jobs, PopFactory, Strata
+from source.world import World, tick
+from visual.gather import DataManager, data_key
+D = getcontext().create_decimal
+
+type engine = Callable[[World, Optional[DataManager]], None]  # Same as `source.world.tick`.
+
+@dataclass(frozen=True)
+class Tolerance:
+    """ Two values agree if they differ by no more than `absolute` or by no more than `relative` times the largest of them. """
+
+    absolute: Decimal = D('1e-12')
+    relative: Decimal = D('1e-12')
+
+    def allows(self, reference: Decimal, candidate: Decimal, /) -> bool:
+        difference = abs(reference - candidate)
+        return difference <= self.absolute or difference <= self.relative * max(abs(reference), abs(candidate))
+
+EXACT = Tolerance(D(0), D(0))
+DEFAULT_TOLERANCE = Tolerance()
+
+@dataclass(frozen=True)
+class Divergence:
+    """ The first value on which the candidate disagrees with the reference. A value missing from one side is `None`. """
+
+    tick: int
+    key: data_key
+    column: str
+    reference: Optional[Decimal]
+    candidate: Optional[Decimal]
+    seed: Optional[int] = None
+
+    def __str__(self) -> str:
+        where = f'{self.key}[{self.column}] at tick {self.tick}' + ('' if self.seed is None else f' with seed {self.seed}')
+        return f'{where}: reference {self.reference} != candidate {self.candidate}'
+
+def record(engine: engine, world: World, ticks: int, /) -> DataManager:
+    """ Runs `ticks` ticks of `world` through `engine` and returns everything it recorded. """
+
+    recorder = DataManager('oracle', *world.industries, *world.settlements, world.jobless_pops, data_dir=Path(gettempdir()))
+
+    for _ in range(ticks):
+        engine(world, recorder)
+
+    return recorder
+
+def first_divergence(reference: DataManager, candidate: DataManager, /,
+                     tolerances: Optional[dict[data_key, Tolerance]] = None) -> Optional[Divergence]:
+    """ Compares the recordings tick by tick and, within a tick, metric by metric in the order `DataManager` declares them. """
+
+    tolerances = {} if tolerances is None else tolerances
+    ref_rows = {key: reference.rows(key) for key in reference.columns}
+    cand_rows = {key: candidate.rows(key) for key in candidate.columns}
+    ticks = sorted({at for rows in (*ref_rows.values(), *cand_rows.values()) for at in rows})
+
+    for at in ticks:
+        for key, columns in reference.columns.items():
+            tolerance = tolerances.get(key, DEFAULT_TOLERANCE)
+            ref_row = ref_rows[key].get(at)
+            cand_row = cand_rows[key].get(at)
+
+            if ref_row is None and cand_row is None:
+                continue
+
+            if ref_row is None or cand_row is None:
+                return Divergence(at, key, '*', None if ref_row is None else ref_row[0], None if cand_row is None else cand_row[0])
+
+            for column, ref_value, cand_value in zip(columns, ref_row, cand_row):
+                if not tolerance.allows(ref_value, cand_value):
+                    return Divergence(at, key, column, ref_value, cand_value)
+
+    return None
+
+def compare_engines(candidate: engine, /, seeds: Iterable[int] = range(3), ticks: int = 20, *,
+                    reference: engine = tick,
+                    tolerances: Optional[dict[data_key, Tolerance]] = None,
+                    **world_kwargs) -> Optional[Divergence]:
+    """
+    Runs a world generated by `generate_world` from each seed through both engines and returns the first divergence found, if
+    any. `world_kwargs` are passed on to `generate_world`.
+    """
+
+    for seed in seeds:
+        ref_world = generate_world(seed, **world_kwargs)
+        cand_world = generate_world(seed, **world_kwargs)
+
+        divergence = first_divergence(record(reference, ref_world, ticks), record(candidate, cand_world, ticks), tolerances)
+        if divergence is not None:
+            return Divergence(divergence.tick, divergence.key, divergence.column, divergence.reference, divergence.candidate, seed)
+
+    return None
+
+####################################################################################################################################
+
+def random_commune(rng: Random, /, max_size: int = 1000, strata: tuple[Strata, ...] = (Strata.LOWER, Strata.MIDDLE)) -> Commune:
+    """
+    A commune with a random subset of the jobs of `strata` and, sometimes, unemployed pops. Sizes and welfares are drawn with few
+    decimal places and empty pops are common, so that edge cases come up often. The default strata are those with needs.
+    """
+
+    commune = Commune({})
+
+    for job in Jobs:
+        if job == Jobs.UNEMPLOYED or job.stratum not in strata or rng.random() < 0.4:
+            continue
+
+        size = 0 if rng.random() < 0.15 else D(rng.randint(0, max_size * 100)) / 100
+        commune[job] = PopFactory.job_makepop(job, size, D(rng.randint(0, 100)) / 100)
+
+    for stratum in strata:
+        if rng.random() < 0.25:
+            commune[stratum, Jobs.UNEMPLOYED] = PopFactory.stratum_makepop(stratum, D(rng.randint(0, max_size)), D(rng.randint(0, 100)) / 100)
+
+    return commune
+
+def random_stock(rng: Random, /, max_amount: int = 1000) -> Stock:
+    """ A stock of a random subset of the products, some of which are empty. """
+
+    return create_stock({product: 0 if rng.random() < 0.15 else D(rng.randint(0, max_amount * 100)) / 100
+                         for product in Products if rng.random() < 0.8})
+
+def _compare_groups(seed: int, ref_com: Commune, cand_com: Commune, ref_stock: Stock, cand_stock: Stock, tolerance: Tolerance, /) -> Optional[Divergence]:
+    for key, ref_pop in ref_com.items():
+        cand_pop = cand_com[key]
+        column = key.name if isinstance(key, Jobs) else f'{key[0].name}_{key[1].name}'
+
+        for metric, ref_value, cand_value in (('pop_size', ref_pop.size, cand_pop.size), ('pop_welfare', ref_pop.welfare, cand_pop.welfare)):
+            if not tolerance.allows(ref_value, cand_value):
+                return Divergence(0, metric, column, ref_value, cand_value, seed)  # type: ignore
+
+    for product in Products:
+        ref_amount = ref_stock[product].amount
+        cand_amount = cand_stock[product].amount
+
+        if not tolerance.allows(ref_amount, cand_amount):
+            return Divergence(0, 'stock', product.name, ref_amount, cand_amount, seed)
+
+    return None
+
+def _share(alg: sharing_alg, com: Commune, stock: Stock, /) -> Optional[type[Exception]]:
+    try:
+        alg(com, stock)
+
+    except Exception as exc:
+        return type(exc)
+
+    return None
+
+def compare_sharing(reference: sharing_alg, candidate: sharing_alg, /, seeds: Iterable[int] = range(200),
+                    tolerance: Tolerance = DEFAULT_TOLERANCE) -> Optional[Divergence]:
+    """
+    Shares a random stock among a random commune for every seed with both algorithms and returns the first divergence in the pops
+    or in the remaining stock. Its `tick` is always 0, since every case is a single call.
+
+    An exception is part of the outcome: the candidate must raise the same type the reference does, in which case the seed is
+    not compared any further. Otherwise the divergence's column names the exception and which side raised it.
+    """
+
+    for seed in seeds:
+        rng = Random(seed)
+        ref_com = random_commune(rng)
+        ref_stock = random_stock(rng)
+        cand_com = deepcopy(ref_com)
+        cand_stock = deepcopy(ref_stock)
+
+        ref_error = _share(reference, ref_com, ref_stock)
+        cand_error = _share(candidate, cand_com, cand_stock)
+
+        if ref_error is not cand_error:
+            side, error = ('reference', ref_error) if ref_error is not None else ('candidate', cand_error)
+            return Divergence(0, 'stock', f'{error.__name__} in {side}', None, None, seed)  # type: ignore
+
+        if ref_error is not None:
+            continue
+
+        divergence = _compare_groups(seed, ref_com, cand_com, ref_stock, cand_stock, tolerance)
+        if divergence is not None:
+            return divergence
+
+    return None
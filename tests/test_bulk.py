@@ -0,0 +1,124 @@
+from random import Random
+from unittest import skipUnless
+from parameterized import parameterized
+from source.bulk import JOBLESS, communes_from_table, industries_from_table, world_from_tables
+from source.exceptions import NegativeAmountError
+from source.goods import Products, create_stock
+from source.pop import CommuneFactory, Jobs, Strata
+from source.validation import Validation, validating
+from source.world import default_world, tick
+from tests import ProdMixIn
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+
+except ImportError:
+    pa = None
+
+INDUSTRIES = {
+    'product': ['WHEAT', 'IRON', 'FLOUR', 'FLOUR'],
+    'tech': ['EXTRACTION', 'EXTRACTION', 'CRAFTING', 'MILLING'],
+    'needed_FARMER': [990, 0, 0, 0],
+    'needed_MINER': [0, 990, 0, 0],
+    'needed_CRAFTSMAN': [0, 0, 990, 990],
+    'needed_SPECIALIST': [10, 10, 10, 10],
+}
+
+POPS = {
+    'commune': [0, 0, 1, 1, 2, 2, 3, 3],
+    'job': ['FARMER', 'SPECIALIST', 'MINER', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST'],
+    'size': [200, 5, 200, 5, 200, 5, 200, 5],
+}
+
+
+class TestBulk(ProdMixIn):
+
+    def test_default_world(self):
+        expected = default_world(Random(3))
+        world = world_from_tables(INDUSTRIES, POPS, create_stock({Products.WHEAT: 500, Products.IRON: 500}), rng=Random(3))
+
+        for _ in range(3):
+            for ind1, ind2 in zip(world.industries, expected.industries):
+                self.assert_industries_equal(ind1, ind2)
+
+            self.assert_stocks_equal(world.common_stock, expected.common_stock)
+            tick(world)
+            tick(expected)
+
+    @parameterized.expand([
+        ('dict', lambda data: data),
+        ('numpy', lambda data: {name: np.array(values) for name, values in data.items()}),
+        ('pandas', pd.DataFrame),
+    ])
+    def test_table_types(self, _, convert):
+        communes = communes_from_table(convert(POPS))
+        industries = industries_from_table(convert(INDUSTRIES), communes)
+
+        self.assertEqual(len(industries), 4)
+        self.assert_communes_equal(industries[0].workforce, CommuneFactory.create_by_job({Jobs.FARMER: 200, Jobs.SPECIALIST: 5}))
+
+    @skipUnless(pa, 'pyarrow is not installed')
+    def test_arrow(self):
+        communes = communes_from_table(pa.table(POPS))  # type: ignore
+        self.assert_communes_equal(communes[2], CommuneFactory.create_by_job({Jobs.CRAFTSMAN: 200, Jobs.SPECIALIST: 5}))
+
+    def test_unemployed_and_welfare(self):
+        pops = {
+            'commune': np.array([0, 0, 1, 1]),
+            'job': ['FARMER', 'UNEMPLOYED', 'UNEMPLOYED', 'SPECIALIST'],
+            'stratum': ['LOWER', 'MIDDLE', 'LOWER', 'MIDDLE'],
+            'size': ['10', '20', '30', '0'],
+            'welfare': ['0.2', '0.4', '0.6', '0.8'],
+        }
+
+        com1, com2 = communes_from_table(pops)
+
+        self.assert_communes_equal(com1, CommuneFactory.create_by_job_w_w({Jobs.FARMER: ('10', '0.2')}) +
+                                         CommuneFactory.create_by_stratum_w_w({Strata.MIDDLE: ('20', '0.4')}))
+        self.assert_communes_equal(com2, CommuneFactory.create_by_stratum_w_w({Strata.LOWER: ('30', '0.6')}))
+
+    def test_jobless_and_settlements(self):
+        pops = {'commune': [0, 4, JOBLESS], 'job': ['FARMER', 'MINER', 'CRAFTSMAN'], 'size': [1, 2, 3]}
+        world = world_from_tables(INDUSTRIES, pops, settlements=1)
+
+        self.assertEqual(len(world.communes), 6)
+        self.assert_communes_equal(world.settlements[0], CommuneFactory.create_by_job({Jobs.MINER: 2}))
+        self.assert_communes_equal(world.jobless_pops, CommuneFactory.create_by_job({Jobs.CRAFTSMAN: 3}))
+
+    @parameterized.expand([
+        ({'size': [-1, 5, 200, 5, 200, 5, 200, 5]}, NegativeAmountError),
+        ({'size': [np.nan, 5, 200, 5, 200, 5, 200, 5]}, ValueError),
+        ({'welfare': [2, 0, 0, 0, 0, 0, 0, 0]}, ValueError),
+        ({'job': ['FARMER', 'FARMER', 'MINER', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST']}, ValueError),
+        ({'job': ['COOK', 'SPECIALIST', 'MINER', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST']}, ValueError),
+        ({'job': ['UNEMPLOYED', 'SPECIALIST', 'MINER', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST', 'CRAFTSMAN', 'SPECIALIST']}, ValueError),
+        ({'stratum': ['MIDDLE', 'MIDDLE', 'LOWER', 'MIDDLE', 'LOWER', 'MIDDLE', 'LOWER', 'MIDDLE']}, ValueError),
+        ({'commune': ['a', 'a', 'b', 'b', 'c', 'c', 'd', 'd']}, TypeError),
+        ({'size': [1, 2]}, ValueError),
+    ])
+    def test_invalid_pops(self, changes: dict, exception: type[Exception]):
+        self.assertRaises(exception, communes_from_table, POPS | changes)
+
+    @parameterized.expand([
+        ({'tech': ['CRAFTING', 'EXTRACTION', 'CRAFTING', 'MILLING']},),
+        ({'needed_FARMER': [0, 0, 0, 0], 'needed_SPECIALIST': [0, 10, 10, 10]},),
+        ({'needed_UNEMPLOYED': [1, 1, 1, 1]},),
+        ({'stock_WHEAT': [1, 0, 0, 0]},),
+        ({'product': ['WHEAT', 'IRON', 'FLOUR', 'BREAD']},),
+    ])
+    def test_invalid_industries(self, changes: dict):
+        self.assertRaises(ValueError, industries_from_table, INDUSTRIES | changes)
+
+    def test_validation_off(self):
+        with validating(Validation.OFF):
+            communes = communes_from_table(POPS | {'size': [-1, 5, 200, 5, 200, 5, 200, 5]})
+
+        self.assertEqual(len(communes), 4)
+
+    def test_manufactury_stock(self):
+        industries = industries_from_table(INDUSTRIES | {'stock_WHEAT': [0, 0, 50, 0], 'stock_IRON': [0, 0, 0, 20]})
+
+        self.assert_stocks_equal(industries[2].stockpile, create_stock({Products.WHEAT: 50}))  # type: ignore
+        self.assert_stocks_equal(industries[3].stockpile, create_stock({Products.IRON: 20}))  # type: ignore
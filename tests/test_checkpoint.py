@@ -0,0 +1,178 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from source.checkpoint import load, save
+from source.codec import encode
+from source.generate import generate_world
+from source.goods import Products, Techs
+from source.pop import Strata
+from source.scenario import load_scenario, restore_defaults
+from source.world import World, tick
+from visual.gather import DataManager
+from visual.history import HistoryReader
+from decimal import getcontext
+D = getcontext().create_decimal
+
+TICKS = 12
+SAVED_AT = 7
+DEFAULT_SCENARIO = Path(__file__).parent.parent / 'scenarios' / 'default.toml'
+
+
+def state(world: World) -> tuple:
+    """ Everything a checkpoint must give back, in a form that only compares equal when it is exactly the same. """
+
+    return ([encode(industry) for industry in world.industries],
+            [world.industries.index(manufactury) for manufactury in world.manufacturies],
+            [encode(commune) for commune in world.communes],
+            encode(world.common_stock),
+            world.communes.index(world.jobless_pops),
+            world.rng.getstate())
+
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self) -> None:
+        folder = TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = Path(folder.name)
+        self.path = self.folder / 'run.ck'
+
+    def recorder(self, world: World, name: str, /, **kwargs) -> DataManager:
+        return DataManager(name, *world.industries, *world.settlements, world.jobless_pops, data_dir=self.folder, **kwargs)
+
+    def test_world_round_trip(self):
+        world = generate_world(2, settlements=2)
+
+        for _ in range(3):
+            tick(world)
+
+        save(self.path, world, 3)
+        checkpoint = load(self.path)
+
+        self.assertEqual(checkpoint.ticks, 3)
+        self.assertIsNone(checkpoint.position)
+        self.assertEqual(state(checkpoint.world), state(world))
+        self.assertEqual(len(checkpoint.world.settlements), 2)
+
+        for _ in range(5):
+            tick(world)
+            tick(checkpoint.world)
+
+        self.assertEqual(state(checkpoint.world), state(world))
+
+    def test_resumed_recording(self):
+        for kwargs in ({}, {'every': 3, 'aggregate': 'mean'}):
+            with self.subTest(**kwargs):
+                world = generate_world(4, settlements=1)
+                uninterrupted = self.recorder(world, 'uninterrupted', **kwargs)
+
+                for _ in range(TICKS):
+                    tick(world, uninterrupted)
+
+                world = generate_world(4, settlements=1)
+                interrupted = self.recorder(world, 'interrupted', **kwargs)
+
+                for current in range(TICKS):
+                    tick(world, interrupted)
+
+                    if current == 2:
+                        interrupted.flush(True)
+
+                    if current == SAVED_AT - 1:
+                        save(self.path, world, SAVED_AT, interrupted)
+
+                    if current == 9:  # Flushed after the checkpoint and before dying, so resuming must cut these rows off.
+                        interrupted.flush(True)
+
+                checkpoint = load(self.path)
+                resumed = DataManager('interrupted', *checkpoint.recorded, data_dir=self.folder, **kwargs)
+                resumed.resume(checkpoint.position)
+
+                for _ in range(checkpoint.ticks, TICKS):
+                    tick(checkpoint.world, resumed)
+
+                resumed.flush(True)
+                uninterrupted.flush(True)
+
+                for key in uninterrupted.columns:
+                    self.assertEqual(resumed.rows(key), uninterrupted.rows(key))
+                    self.assertEqual(resumed.csv_files[key].read_bytes(), uninterrupted.csv_files[key].read_bytes())
+
+    def test_resumed_history(self):
+        world = generate_world(4, settlements=1)
+        interrupted = self.recorder(world, 'run')
+
+        for current in range(TICKS):
+            tick(world, interrupted)
+
+            if current == 2:
+                interrupted.save_memmap()
+
+            if current == SAVED_AT - 1:
+                save(self.path, world, SAVED_AT, interrupted)
+
+            if current == 9:  # Appended after the checkpoint and before dying, so resuming must cut these rows off.
+                interrupted.save_memmap()
+
+        checkpoint = load(self.path)
+        resumed = DataManager('run', *checkpoint.recorded, data_dir=self.folder)
+        resumed.resume(checkpoint.position)
+
+        for _ in range(checkpoint.ticks, TICKS + 3):
+            tick(checkpoint.world, resumed)
+
+        resumed.save_memmap()
+        reader = HistoryReader(resumed.history_folder)
+
+        for key in resumed.columns:
+            self.assertEqual(reader.ticks(key).tolist(), list(range(TICKS + 3)))
+            self.assertEqual(reader[key].tolist(), resumed.frame(key).to_numpy(dtype=float).tolist())
+
+    def test_resumed_rules(self):
+        self.addCleanup(restore_defaults)
+        scenario = self.folder / 'custom.toml'
+        scenario.write_text(DEFAULT_SCENARIO.read_text().replace('# seed = 0', 'seed = 0').replace('LOWER = { FLOUR = 1 }', 'LOWER = { FLOUR = 0.5 }')
+                                                          .replace('base_yield = "4.267"', 'base_yield = 5'))
+
+        world = load_scenario(scenario).world
+        for _ in range(TICKS):
+            tick(world)
+
+        interrupted = load_scenario(scenario).world
+        for _ in range(SAVED_AT):
+            tick(interrupted)
+
+        save(self.path, interrupted, SAVED_AT)
+        restore_defaults()  # As a new process would start.
+        checkpoint = load(self.path)
+
+        self.assertEqual(Strata.LOWER.needs, {Products.FLOUR: D('0.5')})
+        self.assertEqual(Products.WHEAT.techs[Techs.EXTRACTION].base_yield, 5)
+
+        for _ in range(SAVED_AT, TICKS):
+            tick(checkpoint.world)
+
+        self.assertEqual(state(checkpoint.world), state(world))
+
+    def test_mismatched_recorder(self):
+        world = generate_world(4)
+        save(self.path, world, 0, self.recorder(world, 'run'))
+        self.assertRaises(ValueError, self.recorder(world, 'run', every=2).resume, load(self.path).position)
+
+    def test_invalid(self):
+        save(self.path, generate_world(1), 0)
+        data = self.path.read_bytes()
+
+        self.path.write_bytes(data[:-5])
+        self.addCleanup(restore_defaults)
+        load_scenario(DEFAULT_SCENARIO)
+        techs = Products.FLOUR.techs
+        self.assertRaises(ValueError, load, self.path)
+        self.assertEqual(Products.FLOUR.techs, techs)  # The rules in place before the failed load are put back.
+
+        self.path.write_bytes(b'NOPE' + data[4:])
+        self.assertRaises(ValueError, load, self.path)
+
+    def test_atomic(self):
+        save(self.path, generate_world(1), 0)
+        self.assertEqual([file.name for file in self.folder.iterdir()], ['run.ck'])
@@ -0,0 +1,75 @@
+from parameterized import parameterized
+from source.codec import HEADER, MAGIC, Codec, decode, decode_arrays, encode
+from source.generate import generate_world
+from source.goods import Products, create_good, create_stock
+from source.pop import CommuneFactory, Jobs, PopFactory, Strata
+from tests import ProdMixIn
+from decimal import Decimal, getcontext
+import numpy as np
+D = getcontext().create_decimal
+
+WORLD = generate_world(5, settlements=1)
+COMMUNE = CommuneFactory.create_by_job({Jobs.FARMER: '10.25', Jobs.SPECIALIST: 3}) + CommuneFactory.create_by_stratum_w_w({Strata.LOWER: ('7', '0.3')})
+
+
+class TestCodec(ProdMixIn):
+
+    def test_round_trip(self):
+        self.assert_goods_equal(decode(encode(create_good(Products.WHEAT, '1.5'))), create_good(Products.WHEAT, '1.5'))
+        self.assert_pops_equal(decode(encode(PopFactory.job_makepop(Jobs.MINER, 12, '0.25'))), PopFactory.job_makepop(Jobs.MINER, 12, '0.25'))
+        self.assert_stocks_equal(decode(encode(WORLD.common_stock)), WORLD.common_stock)
+        self.assert_communes_equal(decode(encode(COMMUNE)), COMMUNE)
+
+        for industry in WORLD.industries:
+            self.assert_industries_equal(decode(encode(industry)), industry)
+
+    def test_amounts(self):
+        amounts = [D('0'), D('-2.50'), D('1E-30')]
+        self.assertEqual([str(amount) for amount in decode(encode(amounts))], [str(amount) for amount in amounts])
+        self.assertRaises(TypeError, encode, [1, 2])
+
+    def test_float_round_trip(self):
+        for obj in (WORLD.common_stock, COMMUNE, *WORLD.industries):
+            data = encode(obj, Codec.FLOAT)
+            self.assertEqual(encode(decode(data), Codec.FLOAT), data)
+
+        for industry in WORLD.industries:
+            decoded = decode(encode(industry, Codec.FLOAT))
+
+            for job, pop in industry.workforce.items():
+                self.assertAlmostEqual(float(decoded.workforce[job].size), float(pop.size))
+
+    @parameterized.expand([
+        (D('0'),), (D('-0.00'),), (D('1.50'),), (D('123456789.0123456789012345678'),), (D('1E-40'),), (D('-7E+30'),),
+    ])
+    def test_exact_decimals(self, amount: Decimal):
+        decoded = decode(encode(PopFactory.job_makepop(Jobs.FARMER, abs(amount)), Codec.EXACT)).size
+        self.assertEqual(str(decoded), str(abs(amount)))
+
+    def test_arrays_are_views(self):
+        data = bytearray(encode(COMMUNE, Codec.FLOAT))
+        arrays = decode_arrays(data)
+
+        np.testing.assert_array_equal(arrays['jobs'], [Jobs.FARMER.value, Jobs.SPECIALIST.value, Jobs.UNEMPLOYED.value])
+        np.testing.assert_array_equal(arrays['sizes'], [10.25, 3, 7])
+
+        offset = arrays['sizes'].__array_interface__['data'][0] - np.frombuffer(data, np.uint8).__array_interface__['data'][0]
+        data[offset:offset + 8] = np.float64(99).tobytes()
+        self.assertEqual(arrays['sizes'][0], 99)
+
+    def test_arrays_need_float_codec(self):
+        self.assertRaises(ValueError, decode_arrays, encode(COMMUNE))
+        self.assertRaises(ValueError, decode_arrays, encode(WORLD.industries[0], Codec.FLOAT))
+
+    def test_invalid(self):
+        data = encode(WORLD.industries[2])
+
+        self.assertRaises(ValueError, decode, data[:-3])
+        self.assertRaises(ValueError, decode, b'NOPE' + data[4:])
+        self.assertRaises(ValueError, decode, MAGIC + bytes([2]) + data[len(MAGIC) + 1:])
+        self.assertRaises(ValueError, decode, data[:HEADER.size - 1])
+        self.assertRaises(ValueError, encode, create_good(Products.WHEAT, 'Infinity'))
+        self.assertRaises(TypeError, encode, WORLD)
+
+    def test_compact(self):
+        self.assertLess(len(encode(create_stock({Products.WHEAT: 1, Products.IRON: 2}))), 30)
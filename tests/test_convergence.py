@@ -0,0 +1,78 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from source.convergence import Monitor, run_until_converged, snapshot
+from source.generate import generate_world
+from source.goods import Products, create_good
+from source.world import tick
+from visual.gather import DataManager
+import main
+from decimal import getcontext
+D = getcontext().create_decimal
+
+
+class TestConvergence(TestCase):
+
+    def test_still_world(self):
+        world = generate_world(1, extractors=0, manufacturies=0)
+        self.assertEqual(run_until_converged(world, 50, Monitor(D(0), 5)), 5)
+
+    def test_growing_world(self):
+        self.assertIsNone(run_until_converged(generate_world(1), 30, Monitor(D('1e-3'), 5)))
+
+    def test_oscillation(self):
+        world = generate_world(1, extractors=0, manufacturies=0)
+        monitor = Monitor(D('0.01'), 4)
+        before = snapshot(world)[0]
+
+        for current in range(10):
+            # The wheat in stock swings by 2% of itself and then by 0.2%, which only the second window tolerates.
+            swing = create_good(Products.WHEAT, before * (D('0.02') if current < 5 else D('0.002')))
+
+            if current % 2:
+                world.common_stock += swing
+
+            else:
+                world.common_stock -= swing
+
+            if monitor.observe(world, current + 1):
+                break
+
+        self.assertEqual(monitor.converged_at, 8)
+
+    def test_resumed(self):
+        with TemporaryDirectory() as folder:
+            checkpoint = Path(folder) / 'run.ck'
+            world = generate_world(1, extractors=0, manufacturies=0)
+            main.main(3, record=False, world=world, checkpoint=checkpoint, checkpoint_every=3, monitor=Monitor(D(0), 5))
+
+            # Only the two ticks after the checkpoint are left to fill the window of five.
+            monitor = Monitor(D(0), 5)
+            main.main(50, record=False, checkpoint=checkpoint, resume=True, monitor=monitor)
+
+        self.assertEqual(monitor.converged_at, 5)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Monitor, D('0.1'), 1)
+        self.assertRaises(ValueError, Monitor, D('-0.1'))
+
+    def test_repeat(self):
+        with TemporaryDirectory() as folder:
+            for kwargs in ({}, {'every': 3, 'aggregate': 'last'}, {'every': 2}):
+                with self.subTest(**kwargs):
+                    world = generate_world(1, extractors=0, manufacturies=0)
+                    simulated = DataManager('simulated', *world.industries, world.jobless_pops, data_dir=Path(folder), **kwargs)
+                    repeated = DataManager('repeated', *world.industries, world.jobless_pops, data_dir=Path(folder), **kwargs)
+
+                    for _ in range(10):
+                        tick(world, simulated)
+
+                    for _ in range(4):
+                        tick(world, repeated)
+
+                    repeated.repeat(6)
+
+                    for key in simulated.columns:
+                        self.assertEqual(repeated.rows(key), simulated.rows(key))
+
+            self.assertRaises(ValueError, DataManager('empty', data_dir=Path(folder)).repeat, 1)
@@ -0,0 +1,81 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from source.generate import generate_world
+from source.world import World, tick
+from visual.gather import DataManager
+import sqlite3
+
+
+class TestDatabase(TestCase):
+
+    def setUp(self) -> None:
+        folder = TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = Path(folder.name)
+        self.path = self.folder / 'runs.sqlite'
+
+    def recorder(self, world: World, /, **kwargs) -> DataManager:
+        return DataManager('run', *world.industries, *world.settlements, world.jobless_pops, data_dir=self.folder, **kwargs)
+
+    def query(self, statement: str, /) -> list[tuple]:
+        con = sqlite3.connect(self.path)
+
+        try:
+            return con.execute(statement).fetchall()
+
+        finally:
+            con.close()
+
+    def test_incremental(self):
+        world = generate_world(1)
+        recorder = self.recorder(world, every=2)
+
+        for _ in range(3):
+            tick(world, recorder)
+
+        recorder.save_sqlite()
+
+        for _ in range(3):
+            tick(world, recorder)
+
+        recorder.save_sqlite()
+
+        self.assertEqual(self.query('SELECT tick FROM stock WHERE run_id = "run" ORDER BY tick'), [(0,), (2,), (4,)])
+        expected = [tuple(map(float, row)) for row in recorder.rows('stock').values()]
+        self.assertEqual(self.query('SELECT WHEAT, IRON, FLOUR FROM stock ORDER BY tick'), expected)
+
+    def test_overwrite(self):
+        for _ in range(2):
+            world = generate_world(1)
+            recorder = self.recorder(world)
+
+            for _ in range(3):
+                tick(world, recorder)
+
+            recorder.save_sqlite(run_id='same', overwrite=True)
+
+        self.assertEqual(self.query('SELECT COUNT(*) FROM pop_size'), [(3,)])
+
+    def test_retry_after_rollback(self):
+        world = generate_world(1)
+        recorder = self.recorder(world)
+
+        for _ in range(3):
+            tick(world, recorder)
+
+        # A view named like a later table makes the call fail after the earlier tables were inserted into.
+        con = sqlite3.connect(self.path)
+        con.execute('CREATE VIEW stock AS SELECT 1 AS unrelated')
+        con.close()
+
+        self.assertRaises(sqlite3.OperationalError, recorder.save_sqlite)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM pop_size'), [(0,)])
+
+        con = sqlite3.connect(self.path)
+        con.execute('DROP VIEW stock')
+        con.close()
+
+        recorder.save_sqlite()
+        self.assertEqual(self.query('SELECT COUNT(*) FROM pop_size'), [(3,)])
+        self.assertEqual(self.query('SELECT COUNT(*) FROM stock'), [(3,)])
@@ -0,0 +1,59 @@
+from unittest import TestCase
+from parameterized import parameterized
+from visual.decimate import decimate, lttb, min_max
+import numpy as np
+
+N = 10_000
+
+
+def series() -> tuple[np.ndarray, np.ndarray]:
+    x = np.arange(N, dtype=float)
+    y = np.sin(x / 50) + np.random.default_rng(0).normal(0, 0.1, N)
+    y[1234] = 10  # A spike that decimating must not hide.
+    y[7777] = -10
+    return x, y
+
+
+class TestDecimate(TestCase):
+
+    @parameterized.expand([('min_max',), ('lttb',)])
+    def test_short_series(self, method):
+        x, y = np.arange(10.0), np.arange(10.0)
+        decimated_x, decimated_y = decimate(x, y, 100, method)
+        self.assertIs(decimated_x, x)
+        self.assertIs(decimated_y, y)
+
+    @parameterized.expand([('min_max',), ('lttb',)])
+    def test_keeps_ends_and_order(self, method):
+        x, y = series()
+        decimated_x, decimated_y = decimate(x, y, 500, method)
+
+        self.assertLessEqual(len(decimated_x), 502)
+        self.assertEqual((decimated_x[0], decimated_x[-1]), (0, N - 1))
+        self.assertTrue(np.all(np.diff(decimated_x) > 0))
+        np.testing.assert_array_equal(decimated_y, y[decimated_x.astype(int)])
+
+    def test_min_max_keeps_extremes(self):
+        x, y = series()
+        decimated_x, decimated_y = min_max(x, y, 500)
+
+        self.assertIn(1234, decimated_x)
+        self.assertIn(7777, decimated_x)
+
+        # Every bucket keeps its lowest and highest point, so the envelope of the series is preserved.
+        width = N // 250
+        for start in range(0, N, width):
+            bucket = (decimated_x >= start) & (decimated_x < start + width)
+            self.assertEqual(decimated_y[bucket].max(), y[start:start + width].max())
+            self.assertEqual(decimated_y[bucket].min(), y[start:start + width].min())
+
+    def test_lttb(self):
+        x, y = series()
+        decimated_x, decimated_y = lttb(x, y, 500)
+
+        self.assertEqual(len(decimated_x), 500)
+        self.assertIn(1234, decimated_x)  # The spike forms by far the largest triangle in its bucket.
+
+        # A straight line keeps its shape with any of its points.
+        line_x, line_y = lttb(x, 2 * x, 50)
+        np.testing.assert_array_equal(line_y, 2 * line_x)
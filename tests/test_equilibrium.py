@@ -0,0 +1,108 @@
+from random import Random
+from unittest import TestCase
+from source import kernels
+from source.codec import encode
+from source.equilibrium import _copy, _Layout, solve
+from source.generate import generate_world
+from source.goods import trusted_good
+from source.pop import Pop
+from source.world import World, default_world, tick
+from decimal import getcontext
+D = getcontext().create_decimal
+
+
+def linear(slope: str, intercept: str, /):
+    """ An engine that only maps every amount of the common stock to `slope` times itself plus `intercept`. """
+
+    def engine(world: World, /) -> None:
+        for product, good in world.common_stock.items():
+            world.common_stock.data[product] = trusted_good(product, max(D(0), good.amount * D(slope) + D(intercept)))
+
+    return engine
+
+def pops(world: World, /) -> list[tuple]:
+    return [(key, float(pop.size), round(float(pop.welfare), 12)) for commune in world.communes for key, pop in commune.items()]
+
+
+class TestEquilibrium(TestCase):
+
+    def setUp(self) -> None:
+        self.world = generate_world(1, extractors=0, manufacturies=0)
+
+    def test_stable(self):
+        result = solve(self.world, engine=linear('0.5', '100'))
+
+        self.assertTrue(result.converged)
+        self.assertTrue(result.stable)
+        self.assertAlmostEqual(result.spectral_radius, 0.5, places=6)  # type: ignore
+        self.assertLess(result.evaluations, 10)
+
+        for good in result.world.common_stock.values():
+            self.assertAlmostEqual(float(good.amount), 200, places=5)
+
+    def test_unstable(self):
+        # Simulating would run away from 100, but the solver still finds it and tells it is unstable.
+        result = solve(self.world, engine=linear('2', '-100'))
+
+        self.assertTrue(result.converged)
+        self.assertFalse(result.stable)
+        self.assertAlmostEqual(result.spectral_radius, 2, places=5)  # type: ignore
+
+    def test_acceleration(self):
+        plain = solve(self.world, engine=linear('0.9', '10'), memory=0, max_evaluations=50)
+        mixed = solve(self.world, engine=linear('0.9', '10'), max_evaluations=50)
+
+        self.assertFalse(plain.converged)
+        self.assertTrue(mixed.converged)
+
+    def test_world(self):
+        world = generate_world(6, settlements=2)
+        before = [encode(industry) for industry in world.industries]
+        result = solve(world, engine=kernels.tick)
+
+        # This world dies out, but its extinction is unstable, since a few pops with the whole stock to themselves grow back.
+        self.assertTrue(result.converged)
+        self.assertFalse(result.stable)
+        self.assertAlmostEqual(result.spectral_radius, 1.1, delta=0.05)  # type: ignore
+        self.assertTrue(all(pop.size < D('1e-6') for commune in result.world.communes for pop in commune.values()))
+        self.assertEqual([encode(industry) for industry in world.industries], before)
+
+        before = {product: good.amount for product, good in result.world.common_stock.items()}
+        kernels.tick(result.world)
+
+        for product, amount in before.items():
+            self.assertAlmostEqual(float(result.world.common_stock[product].amount), float(amount), delta=1e-6 * max(1, float(amount)))
+
+    def test_created_pops(self):
+        # The first tick of the default world creates its first jobless pop, which must not shift the amounts read before it.
+        world = default_world(Random(0))
+
+        for commune in world.communes:
+            for key, pop in commune.items():
+                commune.data[key] = Pop(pop.size, D(len(key.name)) / 20, pop.stratum, pop.job)
+
+        copied, industries = _copy(world)
+        layout = _Layout(industries)
+        layout.extend(copied)
+        state = layout.read(copied, industries)
+
+        tick(copied)
+        self.assertTrue(layout.extend(copied))
+
+        copied, industries = _copy(world)
+        layout.write(copied, industries, state)
+        self.assertEqual(pops(copied), pops(world))
+        self.assertEqual(layout.read(copied, industries)[len(state):].tolist(), [0.0, 0.0])
+
+    def test_default_world(self):
+        for engine in (kernels.tick, tick):
+            with self.subTest(engine=engine.__module__):
+                result = solve(default_world(Random(0)), engine=engine, max_evaluations=40)
+
+                self.assertTrue(result.converged or engine is tick)  # The exact engine converges more slowly than the kernels.
+                self.assertTrue(all(0 <= pop.welfare <= 1 for commune in result.world.communes for pop in commune.values()))
+                engine(result.world)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, solve, self.world, memory=-1)
+        self.assertRaises(ValueError, solve, self.world, max_evaluations=0)
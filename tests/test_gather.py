@@ -0,0 +1,72 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from parameterized import parameterized
+from source.generate import generate_world
+from source.world import tick
+from visual.gather import AGGREGATES, DataManager
+
+TICKS = 7
+
+
+class TestCadence(TestCase):
+
+    def setUp(self) -> None:
+        folder = TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = Path(folder.name)
+
+    def run_recorded(self, **kwargs) -> DataManager:
+        world = generate_world(1)
+        recorder = DataManager('run', *world.industries, *world.settlements, world.jobless_pops, data_dir=self.folder, **kwargs)
+
+        for _ in range(TICKS):
+            tick(world, recorder)
+
+        return recorder
+
+    def test_every(self):
+        full = self.run_recorded()
+        sampled = self.run_recorded(every=3)
+
+        for key in full.columns:
+            self.assertEqual(list(sampled.rows(key)), [0, 3, 6])
+            self.assertEqual(sampled.rows(key), {tick: row for tick, row in full.rows(key).items() if tick % 3 == 0})
+
+    @parameterized.expand([(name,) for name in AGGREGATES])
+    def test_aggregate(self, name):
+        full = self.run_recorded()
+        aggregated = self.run_recorded(every=3, aggregate=name)
+        reduce = AGGREGATES[name]
+
+        for key in full.columns:
+            rows = full.rows(key)
+
+            # The window starting at tick 6 is not complete, so it is not recorded.
+            expected = {start: [reduce(list(values)) for values in zip(*(rows[tick] for tick in range(start, start + 3)))]
+                        for start in (0, 3)}
+            self.assertEqual(aggregated.rows(key), expected)
+
+    def test_records_next(self):
+        world = generate_world(1)
+        recorder = DataManager('run', *world.industries, data_dir=self.folder, every=2)
+        recorded = []
+
+        for _ in range(4):
+            recorded.append(recorder.records_next('stock'))
+            recorder.record_stockpile(world.common_stock)
+
+        self.assertEqual(recorded, [True, False, True, False])
+        self.assertTrue(DataManager('run', data_dir=self.folder, every=2, aggregate='mean').records_next('stock'))
+
+    def test_flush(self):
+        recorder = self.run_recorded(every=2)
+        recorder.flush(True)
+
+        for key, path in recorder.csv_files.items():
+            lines = path.read_text().splitlines()
+            self.assertEqual(lines[0].split(';'), recorder.columns[key])
+            self.assertEqual(len(lines) - 1, len(recorder.rows(key)))
+
+    def test_invalid_every(self):
+        self.assertRaises(ValueError, DataManager, 'run', data_dir=self.folder, every=0)
@@ -0,0 +1,74 @@
+from parameterized import parameterized
+from source.generate import generate_world, scaled_world
+from source.prod import Extractor, Manufactury
+from source.world import World, tick
+from tests import GoodsMixIn, PopMixIn
+
+
+class TestGenerateWorld(PopMixIn, GoodsMixIn):
+
+    def assert_worlds_equal(self, world1: World, world2: World):
+        self.assertEqual(len(world1.industries), len(world2.industries))
+        self.assertEqual(len(world1.communes), len(world2.communes))
+
+        for ind1, ind2 in zip(world1.industries, world2.industries):
+            self.assertIs(type(ind1), type(ind2))
+            self.assertEqual(ind1.product, ind2.product)
+            self.assertEqual(ind1.prod_tech, ind2.prod_tech)
+            self.assertDictEqual(ind1.needed_workers, ind2.needed_workers)
+
+        for com1, com2 in zip(world1.communes, world2.communes):
+            self.assert_communes_equal(com1, com2)
+
+        self.assert_stocks_equal(world1.common_stock, world2.common_stock)
+
+    @parameterized.expand([
+        (0, 2, 2, 0),
+        (1, 5, 3, 2),
+        (2, 0, 4, 1),
+    ])
+    def test_counts(self, seed: int, extractors: int, manufacturies: int, settlements: int):
+        world = generate_world(seed, extractors=extractors, manufacturies=manufacturies, settlements=settlements)
+
+        self.assertEqual(sum(isinstance(industry, Extractor) for industry in world.industries), extractors)
+        self.assertEqual(sum(isinstance(industry, Manufactury) for industry in world.industries), manufacturies)
+        self.assertEqual(len(world.manufacturies), manufacturies)
+        self.assertEqual(len(world.settlements), settlements)
+        self.assertEqual(len(world.communes), extractors + manufacturies + settlements + 1)
+
+    @parameterized.expand([
+        (0,),
+        (7,),
+    ])
+    def test_reproducible(self, seed: int):
+        world1 = generate_world(seed, extractors=3, manufacturies=3, settlements=2)
+        world2 = generate_world(seed, extractors=3, manufacturies=3, settlements=2)
+        self.assert_worlds_equal(world1, world2)
+
+        for _ in range(5):
+            tick(world1)
+            tick(world2)
+
+        self.assert_worlds_equal(world1, world2)
+
+    @parameterized.expand([
+        (0,),
+        (1,),
+        (2,),
+        (3,),
+    ])
+    def test_scaled_runs(self, seed: int):
+        world = scaled_world(10, seed)
+
+        for _ in range(50):
+            tick(world)
+
+        self.assertTrue(all(good.amount >= 0 for good in world.common_stock.values()))
+
+    @parameterized.expand([
+        ({'capacity': (10, 5)},),
+        ({'stock': (-1, 5)},),
+        ({'extractors': -1},),
+    ])
+    def test_invalid(self, kwargs: dict):
+        self.assertRaises(ValueError, generate_world, 0, **kwargs)
@@ -219,3 +219,18 @@ class TestStockpile(GoodsMixIn):
 
         self.assert_stocks_equal(stockpile, resetor)
         self.assertEqual(id1, id(stockpile))
+
+    @parameterized.expand([
+        (wheat_iron_stock_fac(100, 100), wheat_stock_fac(10)),
+        (wheat_stock_fac(10), wheat_iron_stock_fac(100, 50)),
+    ])
+    def test_mirror(self, stockpile: Stock, mirrored: Stock):
+        wheat = stockpile[WHEAT]
+        stockpile.mirror(mirrored)
+
+        self.assert_stocks_equal(stockpile, mirrored)
+        self.assertEqual(list(stockpile.keys()), list(mirrored.keys()))
+        self.assertIs(stockpile[WHEAT], wheat)
+
+        mirrored += wheat_fac(5)
+        self.assertNotEqual(stockpile[WHEAT], mirrored[WHEAT])
@@ -0,0 +1,66 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from pandas import DataFrame
+from source.generate import generate_world
+from source.world import tick
+from visual.gather import GRAPHS, DataManager, graph_hash
+import json
+import os
+
+
+class TestGraphs(TestCase):
+
+    def setUp(self) -> None:
+        folder = TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+
+        world = generate_world(1)
+        self.recorder = DataManager('run', *world.industries, *world.settlements, world.jobless_pops, data_dir=Path(folder.name))
+
+        for _ in range(5):
+            tick(world, self.recorder)
+
+    def modified(self) -> dict[str, int]:
+        return {which: self.recorder.graph_files[which].stat().st_mtime_ns for which in GRAPHS}
+
+    def test_hash(self):
+        df = DataFrame({'A': [1.0, 2.0]})
+        self.assertEqual(graph_hash(df, 'Title', 'x', 'y'), graph_hash(df.copy(), 'Title', 'x', 'y'))
+        self.assertNotEqual(graph_hash(df, 'Title', 'x', 'y'), graph_hash(df, 'Other', 'x', 'y'))
+        self.assertNotEqual(graph_hash(df, 'Title', 'x', 'y'), graph_hash(df * 2, 'Title', 'x', 'y'))
+
+    def test_skips_unchanged(self):
+        self.recorder.plot_all(parallel=False)
+        hashes = json.loads((self.recorder.graph_folder / 'hashes.json').read_text())
+        self.assertEqual(set(hashes), set(GRAPHS))
+
+        modified = self.modified()
+        self.recorder.plot_all(parallel=False)
+        self.assertEqual(self.modified(), modified)
+
+        # A missing graph is plotted again even though its data did not change, and `force` plots every graph again.
+        self.recorder.graph_files['stock'].unlink()
+        self.recorder.plot_all(parallel=False)
+        self.assertEqual({which for which, time in self.modified().items() if time != modified[which]}, {'stock'})
+
+        modified = self.modified()
+        self.recorder.plot_all(parallel=False, force=True)
+        self.assertTrue(all(time != modified[which] for which, time in self.modified().items()))
+
+    def test_parallel(self):
+        self.recorder.plot_all()
+        self.assertTrue(all(path.exists() for path in self.recorder.graph_files.values()))
+
+    def test_relative_folder(self):
+        with TemporaryDirectory() as folder:
+            cwd = Path.cwd()
+            os.chdir(folder)
+            self.addCleanup(os.chdir, cwd)
+
+            world = generate_world(1)
+            recorder = DataManager('run', *world.industries, *world.settlements, world.jobless_pops, data_dir=Path('out'))
+            tick(world, recorder)
+            recorder.plot_all(parallel=False)
+
+            self.assertTrue(all(path.parent == Path('out', 'run', 'graphs') and path.exists() for path in recorder.graph_files.values()))
@@ -0,0 +1,33 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import json
+import subprocess
+import sys
+
+ROOT = Path(__file__).parent.parent
+HEAVY = ('numpy', 'pandas', 'matplotlib', 'visual')
+
+
+def imported(code: str, /) -> set[str]:
+    """ Which of `HEAVY` a fresh interpreter imported after running `code`. """
+
+    code += f'\nimport sys, json; print(json.dumps([name for name in {HEAVY!r} if name in sys.modules]))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+class TestHeadless(TestCase):
+
+    def test_no_record(self):
+        self.assertEqual(imported('import main; main.main(3, record=False)'), set())
+
+    def test_headless(self):
+        with TemporaryDirectory() as folder:
+            modules = imported(f'import main; from pathlib import Path; main.main(3, plot=False, data_dir=Path({folder!r}))')
+
+        self.assertIn('visual', modules)
+        self.assertNotIn('matplotlib', modules)
+
+    def test_import_gather(self):
+        self.assertEqual(imported('import visual.gather, visual.writer'), {'visual'})
@@ -0,0 +1,63 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from pandas import DataFrame
+from source.generate import generate_world
+from source.world import World, tick
+from visual.gather import DataManager
+from visual.history import HistoryReader, write_history
+import numpy as np
+
+
+class TestHistory(TestCase):
+
+    def setUp(self) -> None:
+        folder = TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = Path(folder.name)
+
+    def recorder(self, world: World, /, **kwargs) -> DataManager:
+        return DataManager('run', *world.industries, *world.settlements, world.jobless_pops, data_dir=self.folder, **kwargs)
+
+    def test_round_trip(self):
+        first = DataFrame({'A': [1.0, 2.0], 'B': [3.0, 4.0]}, index=[0, 5])
+        second = DataFrame({'A': [5.0], 'B': [6.0]}, index=[10])
+
+        write_history(self.folder, {'stock': first})
+        write_history(self.folder, {'stock': second})
+        reader = HistoryReader(self.folder)
+
+        self.assertEqual(reader.rows['stock'], 3)
+        np.testing.assert_array_equal(reader['stock'], [[1, 3], [2, 4], [5, 6]])
+        self.assertEqual(list(reader.frame('stock', 1).index), [5, 10])
+        self.assertEqual(list(reader.frame('stock', 1).columns), ['A', 'B'])
+
+        write_history(self.folder, {'stock': second}, overwrite=True)
+        self.assertEqual(HistoryReader(self.folder).rows['stock'], 1)
+
+    def test_mismatched_columns(self):
+        write_history(self.folder, {'stock': DataFrame({'A': [1.0]})})
+        self.assertRaises(ValueError, write_history, self.folder, {'stock': DataFrame({'B': [1.0]})})
+
+    def test_missing(self):
+        self.assertRaises(FileNotFoundError, HistoryReader, self.folder)
+
+    def test_save_memmap(self):
+        world = generate_world(1)
+        recorder = self.recorder(world, every=3)
+
+        for _ in range(4):
+            tick(world, recorder)
+
+        recorder.save_memmap(overwrite=True)
+
+        for _ in range(5):
+            tick(world, recorder)
+
+        recorder.save_memmap(overwrite=True)  # Only the first call overwrites, the second appends the new rows.
+        reader = HistoryReader(recorder.history_folder)
+
+        for key in recorder.columns:
+            expected = recorder.frame(key).astype(float)
+            self.assertEqual(list(reader.frame(key).index), [0, 3, 6])
+            np.testing.assert_array_equal(reader[key], expected.to_numpy())
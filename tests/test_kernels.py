@@ -0,0 +1,56 @@
+from random import Random
+from typing import get_args
+from unittest import TestCase
+from parameterized import parameterized
+from source import kernels
+from source.algs import proportional
+from source.kernels import LOOPS
+from tests.oracle import Tolerance, _share, compare_engines, compare_sharing, random_commune, random_stock
+from visual.gather import data_key
+from decimal import getcontext
+import numpy as np
+D = getcontext().create_decimal
+
+FLOAT_TOLERANCE = Tolerance(D('1e-9'), D('1e-9'))
+
+
+def _arrays(rng: np.random.Generator, /) -> dict[str, tuple]:
+    sizes = rng.integers(0, 100, (20, 4)).astype(float) * (rng.random((20, 4)) < 0.8)
+    needed = rng.integers(0, 10, (20, 4)).astype(float)
+    needed[:, 0] += 1
+
+    desired = needed / needed.sum(axis=1, keepdims=True)
+    recipe = np.hstack([rng.random((20, 2)), np.zeros((20, 1))])
+    recipe /= recipe.sum(axis=1, keepdims=True)
+
+    return {
+        'efficiencies': (sizes, needed),
+        'ceilings': (rng.random((20, 3)) * 100, recipe, rng.random(20) * 100 * (rng.random(20) < 0.9)),
+        'resized': (sizes[:, 0], rng.random(20), 0.51, 0.05),
+        'layoffs': (sizes, desired),
+        'shares': (rng.random(3) * 1000, sizes[:, :3] * [0, 1, 1], np.array([[0, 0, 0], [0, 0, 1.5], [0.5, 0, 1]]), np.array([.5, .35, .15])),
+        'blended': (rng.random(20), rng.random(20), sizes[:, 0], 1 / 3, 2 / 3, 0.0),
+    }
+
+
+class TestKernels(TestCase):
+
+    @parameterized.expand([(name,) for name in ('efficiencies', 'ceilings', 'resized', 'layoffs', 'shares', 'blended')])
+    def test_loops_match_fallback(self, name: str):
+        fallback = getattr(kernels, f'_{name}')
+
+        for seed in range(5):
+            arguments = _arrays(np.random.default_rng(seed))[name]
+            loops, vectorized = LOOPS[name](*arguments), fallback(*arguments)
+
+            for actual, expected in zip(*((result,) if isinstance(result, np.ndarray) else result for result in (loops, vectorized))):
+                np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+    def test_sharing(self):
+        # The reference sometimes raises on the last digit of its rounding, which the kernels do not reproduce.
+        seeds = [seed for seed in range(200) if _share(proportional, random_commune(rng := Random(seed)), random_stock(rng)) is None]
+        self.assertIsNone(compare_sharing(proportional, kernels.proportional, seeds, FLOAT_TOLERANCE))
+
+    def test_engine(self):
+        tolerances = dict.fromkeys(get_args(data_key.__value__), FLOAT_TOLERANCE)
+        self.assertIsNone(compare_engines(kernels.tick, range(2), 40, tolerances=tolerances))
@@ -0,0 +1,65 @@
+from random import Random
+from parameterized import parameterized
+from source.algs import first_in_first_served, impartial, proportional, rich_first
+from source.goods import Products, create_good
+from source.world import tick
+from tests import PopMixIn
+from tests.oracle import EXACT, Tolerance, compare_engines, compare_sharing, random_commune, random_stock
+from decimal import getcontext
+D = getcontext().create_decimal
+
+
+class TestOracle(PopMixIn):
+
+    @parameterized.expand([
+        (D(100), D(100), EXACT, True),
+        (D(100), D('100.1'), EXACT, False),
+        (D(100), D('100.1'), Tolerance(D('0.2'), D(0)), True),
+        (D(1000), D(1001), Tolerance(D(0), D('0.001')), True),
+        (D(1000), D(1002), Tolerance(D(0), D('0.001')), False),
+    ])
+    def test_tolerance(self, reference, candidate, tolerance: Tolerance, expected: bool):
+        self.assertIs(tolerance.allows(reference, candidate), expected)
+
+    def test_reference_agrees_with_itself(self):
+        self.assertIsNone(compare_engines(tick, range(2), 10, settlements=1))
+
+    def test_reports_first_divergence(self):
+        ticks = 0
+
+        def perturbed(world, recorder=None, /):
+            nonlocal ticks
+            tick(world, recorder)
+            ticks += 1
+
+            if ticks == 3:
+                world.common_stock[Products.WHEAT] += create_good(Products.WHEAT, 100)
+
+        divergence = compare_engines(perturbed, range(1), 10)
+
+        self.assertIsNotNone(divergence)
+        self.assertEqual(divergence.seed, 0)  # type: ignore
+        self.assertEqual(divergence.tick, 3)  # type: ignore
+        self.assertEqual(divergence.key, 'stock')  # type: ignore
+        self.assertEqual(divergence.column, 'WHEAT')  # type: ignore
+
+    @parameterized.expand([
+        (first_in_first_served,),
+        (impartial,),
+        (rich_first,),
+        (proportional,),
+    ])
+    def test_sharing_agrees_with_itself(self, alg):
+        self.assertIsNone(compare_sharing(alg, alg, range(50)))
+
+    def test_sharing_divergence(self):
+        divergence = compare_sharing(first_in_first_served, impartial, range(50))
+
+        self.assertIsNotNone(divergence)
+        self.assertIn(divergence.key, ('pop_size', 'pop_welfare', 'stock'))  # type: ignore
+
+    def test_random_groups_are_reproducible(self):
+        rng1, rng2 = Random(5), Random(5)
+
+        self.assert_communes_equal(random_commune(rng1), random_commune(rng2))
+        self.assertEqual(random_stock(rng1), random_stock(rng2))
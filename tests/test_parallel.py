@@ -0,0 +1,56 @@
+from decimal import Decimal, getcontext, localcontext
+from threading import current_thread, main_thread
+from typing import get_args
+from unittest import TestCase
+from unittest.mock import patch
+from source import parallel
+from source.generate import generate_world
+from source.parallel import run_all
+from source.world import tick
+from tests.oracle import EXACT, compare_engines
+from visual.gather import data_key
+
+
+class TestParallel(TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch.object(parallel, 'threaded', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_order(self):
+        self.assertEqual(run_all(lambda x: x * 2, range(100)), list(range(0, 200, 2)))
+
+    def test_threads_used(self):
+        threads = run_all(lambda _: current_thread(), range(20))
+        self.assertTrue(any(thread is not main_thread() for thread in threads))
+
+    def test_serial(self):
+        with patch.object(parallel, 'threaded', False):
+            threads = run_all(lambda _: current_thread(), range(20))
+
+        self.assertTrue(all(thread is main_thread() for thread in threads))
+
+    def test_decimal_context(self):
+        with localcontext() as context:
+            context.prec = 3
+            results = run_all(lambda x: Decimal(1) / x, [Decimal(3)] * 10)
+
+        self.assertEqual(results, [Decimal('0.333')] * 10)
+        self.assertEqual(getcontext().prec, 28)
+
+    def test_same_as_serial(self):
+        tolerances = dict.fromkeys(get_args(data_key.__value__), EXACT)
+        self.assertIsNone(compare_engines(parallel.tick, range(3), 20, tolerances=tolerances))
+
+    def test_world_state(self):
+        world = generate_world(7)
+        expected = generate_world(7)
+
+        for _ in range(5):
+            parallel.tick(world)
+            tick(expected)
+
+        self.assertEqual(world.common_stock, expected.common_stock)
+        pops = lambda world: [[(key, pop.size, pop.welfare) for key, pop in commune.items()] for commune in world.communes]
+        self.assertEqual(pops(world), pops(expected))
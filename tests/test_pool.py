@@ -0,0 +1,87 @@
+from random import Random
+from threading import Thread
+from source.goods import Products, Stock, create_good
+from source.pool import Arena, active, scope, temporary
+from source.pop import Commune
+from source.world import PHASES, default_world, tick
+from tests import ProdMixIn
+import copy
+import pickle
+
+WHEAT = Products.WHEAT
+
+
+class TestPool(ProdMixIn):
+
+    def test_no_arena(self):
+        self.assertIsNone(active())
+        self.assertIsNot(temporary(Stock), temporary(Stock))
+
+    def test_reuse(self):
+        arena = Arena()
+
+        with scope(arena):
+            stock = temporary(Stock)
+            stock[WHEAT] = create_good(WHEAT, 10)
+
+        self.assertEqual(len(stock), 0)
+
+        with scope(arena):
+            self.assertIs(temporary(Stock), stock)
+            self.assertIsNot(temporary(Stock), stock)
+            self.assertIsInstance(temporary(Commune), Commune)
+
+        self.assertEqual(arena.allocated, 3)
+
+    def test_nested_scope(self):
+        arena = Arena()
+
+        with scope(arena):
+            stock = temporary(Stock)
+            stock[WHEAT] = create_good(WHEAT, 10)
+
+            with scope(arena):
+                self.assertIsNot(temporary(Stock), stock)
+
+            self.assertEqual(stock[WHEAT].amount, 10)
+
+            with scope(Arena()):
+                self.assertIsNot(active(), arena)
+
+            self.assertIs(active(), arena)
+
+        self.assertIsNone(active())
+
+    def test_thread_local(self):
+        seen = []
+
+        with scope(Arena()):
+            thread = Thread(target=lambda: seen.append(active()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(seen, [None])
+
+    def test_copies_start_empty(self):
+        world = default_world(Random(1))
+        tick(world)
+
+        for copied in (copy.deepcopy(world), pickle.loads(pickle.dumps(world))):
+            self.assertIsNot(copied.arena, world.arena)
+            self.assertEqual(copied.arena.allocated, 0)
+
+    def test_same_as_without_arena(self):
+        world = default_world(Random(5))
+        expected = default_world(Random(5))
+
+        for _ in range(10):
+            tick(world)
+
+            for phase in PHASES:
+                phase(expected, None)
+
+            for ind1, ind2 in zip(world.industries, expected.industries):
+                self.assert_industries_equal(ind1, ind2)
+
+            self.assert_stocks_equal(world.common_stock, expected.common_stock)
+            self.assert_communes_equal(world.jobless_pops, expected.jobless_pops)
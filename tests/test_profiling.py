@@ -0,0 +1,47 @@
+from collections import Counter
+from copy import deepcopy
+from unittest import TestCase
+from benchmarks.profiling import COUNTED, format_report, profile
+from source.generate import generate_world
+from source.goods import Good, Products
+from source.pop import Jobs, PopFactory
+from source.world import PHASES, tick
+from decimal import getcontext
+D = getcontext().create_decimal
+
+
+class TestProfiling(TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        world = generate_world(0, settlements=1)
+        tick(world)
+        cls.profiles = profile(world, 2)
+
+    def test_phases(self):
+        self.assertEqual(list(self.profiles), [phase.__name__ for phase in PHASES])
+
+        for name, result in self.profiles.items():
+            with self.subTest(phase=name):
+                self.assertGreater(result.peak_bytes, 0)
+
+    def test_created(self):
+        created = sum((result.created for result in self.profiles.values()), Counter())
+        self.assertTrue(all(created[cls.__name__] > 0 for cls in COUNTED))
+
+        self.assertGreater(self.profiles['production'].created['Good'], 0)
+        self.assertGreater(self.profiles['production'].created['Stock'], 0)
+        self.assertGreater(self.profiles['consumption'].created['Commune'], 0)
+        self.assertGreater(self.profiles['promotion'].created['Pop'], 0)
+
+    def test_constructible_after(self):
+        good = Good(Products.WHEAT, D(2))
+        pop = PopFactory.job_makepop(Jobs.FARMER, 3)
+
+        self.assertEqual(good.amount, D(2))
+        self.assertEqual(pop.size, D(3))
+        self.assertEqual(deepcopy(good), good)
+
+    def test_report(self):
+        report = format_report(self.profiles)
+        self.assertTrue(all(f'{phase.__name__}: peak ' in report for phase in PHASES))
@@ -0,0 +1,152 @@
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from parameterized import parameterized
+from source import scenario as scenario_module
+from source.exceptions import NegativeAmountError
+from source.goods import DEFAULT_TECHS, Products, Techs
+from source.pop import Jobs, Strata
+from source.scenario import cache_path, load_scenario, parse_scenario, restore_defaults
+from source.world import default_world, tick
+from tests import ProdMixIn
+from decimal import getcontext
+import tomllib
+D = getcontext().create_decimal
+
+DEFAULT_SCENARIO = Path(__file__).parent.parent / 'scenarios' / 'default.toml'
+
+SMALL = """
+seed = 4
+stock = { WHEAT = 10 }
+
+[techs.WHEAT.EXTRACTION]
+base_yield = 2
+
+[needs]
+LOWER = { FLOUR = 2, WHEAT = "0.5" }
+
+[[industries]]
+product = "WHEAT"
+needed = { FARMER = 100 }
+workforce = { FARMER = 50 }
+
+[[settlements]]
+MINER = 30
+
+[jobless]
+LOWER = { size = 20, welfare = 0.25 }
+"""
+
+
+class TestScenario(ProdMixIn):
+
+    def setUp(self) -> None:
+        self.folder = TemporaryDirectory()
+        self.path = Path(self.folder.name) / 'small.toml'
+        self.path.write_text(SMALL)
+
+    def tearDown(self) -> None:
+        restore_defaults()
+        self.folder.cleanup()
+
+    def test_default_scenario(self):
+        expected = default_world(Random(2))
+        world = parse_scenario(tomllib.loads(DEFAULT_SCENARIO.read_text()) | {'seed': 0}).world
+        world.rng = Random(2)
+
+        for _ in range(3):
+            for ind1, ind2 in zip(world.industries, expected.industries):
+                self.assert_industries_equal(ind1, ind2)
+
+            self.assert_stocks_equal(world.common_stock, expected.common_stock)
+            tick(world)
+            tick(expected)
+
+    def test_rules_are_installed(self):
+        load_scenario(self.path)
+
+        self.assertEqual(Products.WHEAT.techs[Techs.EXTRACTION].base_yield, D(2))
+        self.assertEqual(Strata.LOWER.needs, {Products.FLOUR: D(2), Products.WHEAT: D('0.5')})
+        self.assertEqual(Products.FLOUR.techs, DEFAULT_TECHS[Products.FLOUR])
+
+        restore_defaults()
+        self.assertEqual(Products.WHEAT.techs[Techs.EXTRACTION].base_yield, D('4.267'))
+
+    def test_rules_are_read_only(self):
+        with self.assertRaises(TypeError):
+            Products.WHEAT.techs[Techs.MILLING] = None  # type: ignore
+
+        with self.assertRaises(TypeError):
+            Strata.LOWER.needs[Products.WHEAT] = D(1)  # type: ignore
+
+        self.assertEqual(Strata.LOWER.needs, {Products.FLOUR: D(1)})
+
+    def test_world(self):
+        world = load_scenario(self.path).world
+
+        self.assertEqual(len(world.industries), 1)
+        self.assertEqual(world.industries[0].workforce[Jobs.FARMER].size, D(50))
+        self.assertEqual(world.settlements[0][Jobs.MINER].size, D(30))
+        self.assertEqual(world.jobless_pops[Strata.LOWER, Jobs.UNEMPLOYED].welfare, D('0.25'))
+        self.assertEqual(world.common_stock[Products.WHEAT].amount, D(10))
+
+    def test_cache(self):
+        first = load_scenario(self.path)
+        self.assertTrue(cache_path(self.path).exists())
+
+        with patch.object(scenario_module, 'parse_scenario', side_effect=AssertionError('the cache was not used')):
+            second = load_scenario(self.path)
+
+        self.assertIsNot(first.world, second.world)
+        self.assertEqual(first.world.rng.getstate(), second.world.rng.getstate())
+        self.assert_communes_equal(first.world.jobless_pops, second.world.jobless_pops)
+
+    def test_cache_invalidated(self):
+        load_scenario(self.path)
+        self.path.write_text(SMALL.replace('WHEAT = 10', 'WHEAT = 11'))
+
+        self.assertEqual(load_scenario(self.path).world.common_stock[Products.WHEAT].amount, D(11))
+
+    def test_cache_invalidated_by_code(self):
+        load_scenario(self.path)
+
+        with patch.object(scenario_module, '_code_digest', return_value=b'other code'):
+            with patch.object(scenario_module, 'parse_scenario', wraps=parse_scenario) as parse:
+                load_scenario(self.path)
+                load_scenario(self.path)
+
+        self.assertEqual(parse.call_count, 1)
+
+    def test_corrupt_cache(self):
+        load_scenario(self.path)
+        blob = cache_path(self.path).read_bytes()
+        cache_path(self.path).write_bytes(blob[:-10])
+
+        self.assertEqual(load_scenario(self.path).world.common_stock[Products.WHEAT].amount, D(10))
+
+    def test_unseeded_worlds_differ(self):
+        self.path.write_text(SMALL.replace('seed = 4', ''))
+        first = load_scenario(self.path)
+        second = load_scenario(self.path)
+
+        self.assertIsNone(second.seed)
+        self.assertNotEqual(first.world.rng.getstate(), second.world.rng.getstate())
+
+    @parameterized.expand([
+        ('base_yield = 2', 'base_yield = -2', ValueError),
+        ('product = "WHEAT"', 'product = "BREAD"', ValueError),
+        ('FARMER = 50', 'FARMER = -50', NegativeAmountError),
+        ('seed = 4', 'seed = "four"', TypeError),
+        ('LOWER = { FLOUR = 2', 'LOWER = { FLOUR = 0', ValueError),
+        ('MINER = 30', 'COOK = 30', ValueError),
+        ('[techs.WHEAT.EXTRACTION]\nbase_yield = 2', '[techs.FLOUR.CRAFTING]\nbase_yield = 2\nrecipe = { WHEAT = "0.5" }', ValueError),
+        ('[techs.WHEAT.EXTRACTION]\nbase_yield = 2', '[techs.WHEAT]\nEXTRACTION = 2', TypeError),
+        ('[techs.WHEAT.EXTRACTION]\nbase_yield = 2', '[techs]\nWHEAT = 2', TypeError),
+        ('[techs.WHEAT.EXTRACTION]\nbase_yield = 2', '[techs.FLOUR.CRAFTING]\nbase_yield = 2\nrecipe = 1', TypeError),
+        ('LOWER = { FLOUR = 2, WHEAT = "0.5" }', 'LOWER = 2', TypeError),
+        ('needed = { FARMER = 100 }', 'needed = 100', TypeError),
+    ])
+    def test_invalid(self, old: str, new: str, exception: type[Exception]):
+        self.assertRaises(exception, parse_scenario, tomllib.loads(SMALL.replace(old, new)))
+        self.assertEqual(Products.WHEAT.techs[Techs.EXTRACTION].base_yield, D('4.267'))
@@ -0,0 +1,75 @@
+from multiprocessing import get_context
+from pathlib import Path
+from unittest import TestCase
+from source.scenario import restore_defaults
+from source.sharding import Coordinator, Province, _pack_amounts, _unpack_amounts, exchange, run_local, serve
+from source.validation import Validation, validating
+from decimal import ROUND_UP, getcontext, localcontext
+import socket
+D = getcontext().create_decimal
+
+PROVINCES = [Province(1), Province(2), Province(3, 2)]
+SCENARIO = str(Path(__file__).parent.parent / 'scenarios' / 'default.toml')
+
+
+class TestSharding(TestCase):
+
+    def test_amounts_round_trip(self):
+        amounts = [D('0'), D('1.5'), D('123456789.0123456789012345678'), D('1E-30')]
+        at, unpacked = _unpack_amounts(_pack_amounts(7, amounts))
+
+        self.assertEqual(at, 7)
+        self.assertEqual([amount.as_tuple() for amount in unpacked], [amount.as_tuple() for amount in amounts])
+
+    def test_exchange(self):
+        stocks = [[D(100), D(0), D(3)], [D(0), D(10), D(0)], [D(50), D('1.5'), D(0)]]
+        flows = exchange(stocks)
+
+        self.assertEqual(flows[0][0], D(-5))
+        self.assertEqual(flows[1][0], D(5))
+
+        for column in range(3):
+            self.assertEqual(sum(flow[column] for flow in flows), 0)
+
+    def run_sharded(self, provinces: list[Province], ticks: int, /) -> list[list[list]]:
+        context = get_context('spawn')
+
+        with Coordinator(provinces) as coordinator:
+            workers = [context.Process(target=serve, args=coordinator.address) for _ in provinces]
+            for worker in workers:
+                worker.start()
+
+            coordinator.accept(30)
+            history = coordinator.run(ticks)
+
+        for worker in workers:
+            worker.join(30)
+            self.assertEqual(worker.exitcode, 0)
+
+        return history
+
+    def test_workers(self):
+        self.assertEqual(self.run_sharded(PROVINCES, 5), run_local(PROVINCES, 5))
+
+    def test_context(self):
+        # Both run in the simulation's context whatever the caller's is, so the workers round exactly as a single process would.
+        with localcontext(rounding=ROUND_UP):
+            history = self.run_sharded(PROVINCES[:2], 3)
+
+        self.assertEqual(history, run_local(PROVINCES[:2], 3))
+
+    def test_scenario(self):
+        self.addCleanup(restore_defaults)
+        provinces = [Province(1, scenario=SCENARIO), Province(2, scenario=SCENARIO)]
+
+        with validating(Validation.BOUNDARY):
+            history = self.run_sharded(provinces, 3)
+
+        self.assertEqual(history, run_local(provinces, 3))
+        self.assertRaises(ValueError, Province, 1, 2, SCENARIO)
+
+    def test_unexpected_message(self):
+        with Coordinator([Province(1)]) as coordinator:
+            with socket.create_connection(coordinator.address) as connection:
+                connection.sendall(b'\x09\x00\x00\x00\x00')
+                self.assertRaises(ValueError, coordinator.accept, 5)
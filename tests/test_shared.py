@@ -0,0 +1,65 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import get_args
+from unittest import TestCase
+from source import kernels
+from source.shared import SharedArrays, SharedEngine
+from tests.oracle import EXACT, compare_engines
+from visual.gather import data_key
+import numpy as np
+
+
+class TestSharedArrays(TestCase):
+
+    def setUp(self) -> None:
+        self.arrays = SharedArrays.create({'sizes': (10, 4), 'welfares': (10,)})
+        self.addCleanup(self.arrays.unlink)
+        self.addCleanup(self.arrays.close)
+
+    def test_attach(self):
+        self.arrays['sizes'][:] = np.arange(40).reshape(10, 4)
+        attached = SharedArrays.attach(self.arrays.layout)
+        attached['welfares'][3] = 0.5
+
+        np.testing.assert_array_equal(attached['sizes'], np.arange(40).reshape(10, 4))
+        self.assertEqual(self.arrays['welfares'][3], 0.5)
+        attached.close()
+
+    def test_fits(self):
+        self.assertTrue(self.arrays.fits({'sizes': (7, 4), 'welfares': (7,)}))
+        self.assertFalse(self.arrays.fits({'sizes': (11, 4), 'welfares': (11,)}))
+        self.assertFalse(self.arrays.fits({'sizes': (7, 5), 'welfares': (7,)}))
+        self.assertFalse(self.arrays.fits({'sizes': (7, 4)}))
+
+
+class TestSharedEngine(TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.engine = SharedEngine(2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.engine.close()
+
+    def test_same_as_kernels(self):
+        tolerances = dict.fromkeys(get_args(data_key.__value__), EXACT)
+        self.assertIsNone(compare_engines(self.engine.tick, range(2), 10, reference=kernels.tick, tolerances=tolerances))
+
+    def test_growth(self):
+        sizes = np.arange(3.0)
+        np.testing.assert_array_equal(self.engine.resized(sizes, np.ones(3), 0.5, 0.1), sizes * 1.1)
+        block = self.engine.blocks['resized']
+
+        np.testing.assert_array_equal(self.engine.resized(np.ones(6), np.zeros(6), 0.5, 0.1), np.full(6, 0.9))
+        self.assertIs(self.engine.blocks['resized'], block)
+
+        np.testing.assert_array_equal(self.engine.resized(np.ones(7), np.zeros(7), 0.5, 0.1), np.full(7, 0.9))
+        self.assertIsNot(self.engine.blocks['resized'], block)
+        self.assertRaises(FileNotFoundError, SharedMemory, block.layout.name)
+
+    def test_close_frees_memory(self):
+        with SharedEngine(1) as engine:
+            engine.resized(np.ones(3), np.ones(3), 0.5, 0.1)
+            name = engine.blocks['resized'].layout.name
+
+        self.assertRaises(FileNotFoundError, SharedMemory, name)
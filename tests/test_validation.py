@@ -0,0 +1,89 @@
+from parameterized import parameterized
+from source import validation
+from source.exceptions import NegativeAmountError
+from source.goods import Products, create_good, trusted_good
+from source.pop import Jobs, Pop, PopFactory, Strata
+from source.validation import Validation, set_validation, validating
+from tests import GoodsMixIn, PopMixIn
+from decimal import getcontext
+D = getcontext().create_decimal
+
+WHEAT = Products.WHEAT
+
+
+class TestValidation(PopMixIn, GoodsMixIn):
+
+    def tearDown(self) -> None:
+        set_validation(Validation.FULL)
+
+    @parameterized.expand([
+        (Validation.FULL, True, True),
+        (Validation.BOUNDARY, False, True),
+        (Validation.OFF, False, False),
+    ])
+    def test_flags(self, level: Validation, full: bool, boundary: bool):
+        set_validation(level)
+
+        self.assertIs(validation.level, level)
+        self.assertIs(validation.full, full)
+        self.assertIs(validation.boundary, boundary)
+
+    def test_validating_restores(self):
+        with self.assertRaises(RuntimeError):
+            with validating(Validation.OFF):
+                self.assertFalse(validation.boundary)
+                raise RuntimeError
+
+        self.assertIs(validation.level, Validation.FULL)
+
+    def test_invalid_level(self):
+        self.assertRaises(TypeError, set_validation, 'off')
+
+    @parameterized.expand([
+        (Validation.FULL, True),
+        (Validation.BOUNDARY, False),
+        (Validation.OFF, False),
+    ])
+    def test_arithmetic(self, level: Validation, raises: bool):
+        with validating(level):
+            good = create_good(WHEAT, 10)
+
+            if raises:
+                self.assertRaises(NegativeAmountError, good.__isub__, create_good(WHEAT, 20))
+
+            else:
+                good -= create_good(WHEAT, 20)
+                self.assertEqual(good.amount, D(-10))
+
+    @parameterized.expand([
+        (Validation.FULL, True),
+        (Validation.BOUNDARY, True),
+        (Validation.OFF, False),
+    ])
+    def test_factories(self, level: Validation, raises: bool):
+        with validating(level):
+            if raises:
+                self.assertRaises(NegativeAmountError, create_good, WHEAT, -1)
+                self.assertRaises(ValueError, PopFactory.job_makepop, Jobs.FARMER, 10, 2)
+
+            else:
+                self.assertEqual(create_good(WHEAT, -1).amount, D(-1))
+                self.assertEqual(PopFactory.job_makepop(Jobs.FARMER, 10, 2).welfare, D(2))
+
+    @parameterized.expand([
+        (Validation.FULL,),
+        (Validation.BOUNDARY,),
+        (Validation.OFF,),
+    ])
+    def test_trusted_constructors(self, level: Validation):
+        with validating(level):
+            self.assert_goods_equal(trusted_good(WHEAT, D(5)), create_good(WHEAT, 5))
+            self.assert_pops_equal(PopFactory.trusted_job_makepop(Jobs.MINER, D(5), D('0.7')), PopFactory.job_makepop(Jobs.MINER, 5, '0.7'))
+            self.assert_pops_equal(PopFactory.trusted_stratum_makepop(Strata.LOWER, D(5), D('0.7')), PopFactory.stratum_makepop(Strata.LOWER, 5, '0.7'))
+
+            empty = PopFactory.trusted_job_makepop(Jobs.MINER, D(0), D('0.7'))
+            self.assertEqual(empty.welfare, Pop.ZERO_SIZE_WELFARE)
+
+    def test_trusted_checks_when_full(self):
+        self.assertRaises(NegativeAmountError, trusted_good, WHEAT, D(-1))
+        self.assertRaises(NegativeAmountError, PopFactory.trusted_job_makepop, Jobs.MINER, D(-1))
@@ -0,0 +1,73 @@
+from copy import deepcopy
+from random import Random
+from unittest import TestCase
+from unittest.mock import patch
+from source.codec import encode
+from source.generate import scaled_world
+from source.goods import Products, create_stock
+from source.pop import CommuneFactory, Jobs, PopFactory, Strata
+from source.prod import Industry, IndustryFactory
+from source.world import World, employment, production, consumption, resizing, promotion, tick
+from decimal import getcontext
+D = getcontext().create_decimal
+
+
+def employable(seed: int, /) -> World:
+    """ A world right before its second employment, when promotion has just left it with jobless pops of two strata. """
+
+    world = scaled_world(2, seed)
+    tick(world)
+
+    for phase in (production, consumption, resizing, promotion):
+        phase(world)
+
+    return world
+
+
+class TestEmployment(TestCase):
+
+    def test_same_as_every_pop(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                world = employable(seed)
+                expected = deepcopy(world)
+
+                employment(world)
+
+                # Every industry working out its labor demand for every pop, as employment did before it reused them.
+                expected.rng.shuffle(expected.industries)
+                for industry in expected.industries:
+                    for pop in expected.jobless_pops.values():
+                        if industry.can_employ(pop):
+                            industry.employ(pop)
+
+                self.assertEqual([encode(industry) for industry in world.industries], [encode(industry) for industry in expected.industries])
+                self.assertEqual(encode(world.jobless_pops), encode(expected.jobless_pops))
+
+    def test_demand_after_employing(self):
+        # Miners it does not need leave the farm room for 500 workers, which it first splits 495 to 5 between farmers and
+        # specialists. Once the lower pop fills the farmers, the room left is split again, and only a sliver goes to specialists.
+        farm = IndustryFactory.create_industry(Products.WHEAT, {Jobs.FARMER: 990, Jobs.SPECIALIST: 10}, {Jobs.MINER: 500})
+        jobless_pops = CommuneFactory.create_by_job()
+
+        for stratum in (Strata.LOWER, Strata.MIDDLE):
+            jobless_pops += PopFactory.trusted_stratum_makepop(stratum, D(1000), D('0.5'))
+
+        world = World.create([farm], create_stock(), jobless_pops, Random(0))
+        employment(world)
+
+        self.assertEqual(farm.workforce[Jobs.FARMER].size, 495)
+        self.assertAlmostEqual(float(farm.workforce[Jobs.SPECIALIST].size), 5 * 10 / 505)
+
+    def test_labor_demand_reused(self):
+        world = employable(0)
+
+        with patch.object(Industry, 'calc_labor_demand', autospec=True, side_effect=Industry.calc_labor_demand) as demand, \
+             patch.object(Industry, 'can_employ', autospec=True, side_effect=Industry.can_employ) as can_employ, \
+             patch.object(Industry, 'employ', autospec=True, side_effect=Industry.employ) as employ:
+            employment(world)
+
+        # Once for every industry and again after every pop it employs, rather than once for every check and every employment.
+        self.assertGreater(employ.call_count, len(world.industries))
+        self.assertLessEqual(demand.call_count, len(world.industries) + employ.call_count)
+        self.assertLess(demand.call_count, can_employ.call_count + employ.call_count)
@@ -0,0 +1,84 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from unittest import TestCase
+from pandas import DataFrame, read_csv
+from visual.writer import BackgroundWriter
+
+
+class Blocking:
+    """ Stands in for a `DataFrame` whose writing takes until `release` is set. """
+
+    def __init__(self) -> None:
+        self.started = Event()
+        self.release = Event()
+
+    def to_csv(self, *args, **kwargs) -> None:
+        self.started.set()
+        self.release.wait(10)
+
+class Failing:
+    def to_csv(self, *args, **kwargs) -> None:
+        raise OSError('The disk is full.')
+
+
+class TestBackgroundWriter(TestCase):
+
+    def setUp(self) -> None:
+        folder = TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = Path(folder.name) / 'data.csv'
+
+    def test_appends(self):
+        with BackgroundWriter() as writer:
+            writer.submit(self.path, DataFrame({'A': [1, 2]}), True)
+            writer.submit(self.path, DataFrame({'A': [3]}))
+
+        self.assertEqual(read_csv(self.path, sep=';')['A'].tolist(), [1, 2, 3])
+
+    def test_backpressure(self):
+        blocking = Blocking()
+        writer = BackgroundWriter(1)
+        writer.submit(self.path, blocking)  # type: ignore
+        blocking.started.wait(10)
+        writer.submit(self.path, DataFrame({'A': [1]}))  # Fills the queue.
+
+        third = Thread(target=writer.submit, args=(self.path, DataFrame({'A': [2]})))
+        third.start()
+        third.join(0.2)
+        self.assertTrue(third.is_alive())
+
+        blocking.release.set()
+        third.join(10)
+        writer.close()
+        self.assertEqual(read_csv(self.path, sep=';')['A'].tolist(), [1, 2])
+
+    def test_error(self):
+        writer = BackgroundWriter()
+        writer.submit(self.path, Failing())  # type: ignore
+        self.assertRaises(OSError, writer.join)
+
+        # The writer stays failed, and nothing submitted after the error is written.
+        self.assertRaises(OSError, writer.submit, self.path, DataFrame({'A': [1]}))
+        self.assertRaises(OSError, writer.join)
+        self.assertRaises(OSError, writer.close)
+        self.assertFalse(self.path.exists())
+
+    def test_drains_on_exception(self):
+        with self.assertRaises(KeyError):
+            with BackgroundWriter() as writer:
+                for value in range(5):
+                    writer.submit(self.path, DataFrame({'A': [value]}))
+
+                raise KeyError
+
+        self.assertEqual(read_csv(self.path, sep=';')['A'].tolist(), list(range(5)))
+
+    def test_exception_wins_over_error(self):
+        with self.assertRaises(KeyError):
+            with BackgroundWriter() as writer:
+                writer.submit(self.path, Failing())  # type: ignore
+                raise KeyError
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, BackgroundWriter, 0)
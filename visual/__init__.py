@@ -1,16 +1,5 @@
 from pathlib import Path
+import os
 
-
-cwd = Path.cwd()
-
-if cwd.name != 'EconSim':
-    raise Exception('Bad current working directory. Launch program from `main.py`')
-
-visual_dir = cwd / 'visual'
-data_dir = visual_dir / 'data'
-
-try:
-    data_dir.mkdir()
-
-except FileExistsError:
-    pass
+# Where a `DataManager` saves its data unless it is given another folder. Nothing is created until something is saved.
+data_dir = Path(os.environ.get('ECONSIM_DATA_DIR', Path(__file__).parent / 'data'))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterable, Sequence
+import sqlite3
+
+def _quote(identifier: str, /) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+def connect(path: Path, /) -> sqlite3.Connection:
+    """ Opens the database in `path`, creating it if needed. """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return sqlite3.connect(path)
+
+def create_table(con: sqlite3.Connection, table: str, columns: Sequence[str], /) -> None:
+    """
+    Creates the table of a metric family if it does not exist yet. Rows are keyed by `(run_id, tick)`, which doubles as the index
+    used by range queries. Columns missing from an older table, e.g. after adding a new product, are added to it.
+    """
+
+    value_columns = ', '.join(f'{_quote(col)} REAL' for col in columns)
+    con.execute(f'CREATE TABLE IF NOT EXISTS {_quote(table)} '
+                f'(run_id TEXT NOT NULL, tick INTEGER NOT NULL, {value_columns}, PRIMARY KEY (run_id, tick)) WITHOUT ROWID')
+
+    existing = {row[1] for row in con.execute(f'PRAGMA table_info({_quote(table)})')}
+    for col in columns:
+        if col not in existing:
+            con.execute(f'ALTER TABLE {_quote(table)} ADD COLUMN {_quote(col)} REAL')
+
+def insert_rows(con: sqlite3.Connection, table: str, run_id: str, columns: Sequence[str], rows: Iterable[Sequence], /) -> None:
+    """
+    Inserts all `rows` in a single `executemany`. Each row starts with its tick followed by one value per column. Rows already
+    stored for the same run and tick are replaced.
+    """
+
+    names = ', '.join(_quote(col) for col in ('run_id', 'tick', *columns))
+    placeholders = ', '.join('?' * (len(columns) + 2))
+    statement = f'INSERT OR REPLACE INTO {_quote(table)} ({names}) VALUES ({placeholders})'
+
+    con.executemany(statement, ((run_id, int(tick), *map(float, values)) for tick, *values in rows))
+
+def delete_run(con: sqlite3.Connection, table: str, run_id: str, /) -> None:
+    con.execute(f'DELETE FROM {_quote(table)} WHERE run_id = ?', (run_id,))
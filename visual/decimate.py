@@ -0,0 +1,78 @@
+from __future__ import annotations
+from typing import Callable, Literal
+import numpy as np
+
+# A 300 dpi graph of the default size is 1920 pixels wide, and `min_max` keeps two points per pixel.
+DECIMATE_THRESHOLD = 4000
+
+type decimation = Literal['min_max', 'lttb']
+type decimation_alg = Callable[[np.ndarray, np.ndarray, int], tuple[np.ndarray, np.ndarray]]
+
+def min_max(x: np.ndarray, y: np.ndarray, n_out: int, /) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Splits the series into `n_out // 2` buckets and keeps the lowest and the highest point of each, in their original order.
+    Every peak and trough survives, which makes this the right choice for series whose extremes matter, like population and stock.
+    """
+
+    n = len(y)
+    buckets = max(1, n_out // 2)
+
+    if n <= n_out:
+        return x, y
+
+    width = n // buckets
+    body = buckets * width
+    grid = y[:body].reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+
+    indices = [offsets + np.argmin(grid, axis=1), offsets + np.argmax(grid, axis=1)]
+
+    if body < n:
+        indices.append(np.array([body + np.argmin(y[body:]), body + np.argmax(y[body:])]))
+
+    kept = np.unique(np.concatenate([[0, n - 1], *indices]))
+    return x[kept], y[kept]
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int, /) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets. Keeps the first and last point, and from each bucket in between the point that forms the
+    largest triangle with the point kept from the previous bucket and the mean of the next bucket. It keeps the shape of the line
+    with fewer points than `min_max`, but a peak may be lost if its neighbours form a larger triangle.
+    """
+
+    n = len(y)
+
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+
+        mean_x = x[next_start:next_stop].mean()
+        mean_y = y[next_start:next_stop].mean()
+
+        areas = np.abs((x[previous] - mean_x) * (y[start:stop] - y[previous]) - (x[previous] - x[start:stop]) * (mean_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        kept[i + 1] = previous
+
+    return x[kept], y[kept]
+
+ALGORITHMS: dict[decimation, decimation_alg] = {
+    'min_max': min_max,
+    'lttb': lttb,
+}
+
+def decimate(x: np.ndarray, y: np.ndarray, /, threshold: int = DECIMATE_THRESHOLD, method: decimation = 'min_max') -> tuple[np.ndarray, np.ndarray]:
+    """ Reduces a series to at most about `threshold` points. Series that are already short enough are returned untouched. """
+
+    if len(y) <= threshold:
+        return x, y
+
+    return ALGORITHMS[method](np.asarray(x, dtype=float), np.asarray(y, dtype=float), threshold)
@@ -3,18 +3,27 @@ from dataclasses import dataclass
 from decimal import Decimal, DivisionByZero, DivisionUndefined, InvalidOperation, getcontext
 from itertools import chain
 from pathlib import Path
-from typing import Literal
-from matplotlib.axes import Axes
-from matplotlib.lines import Line2D
-from source.goods import Products, Stock, create_stock
+from typing import TYPE_CHECKING, Callable, Literal, Optional
+from source.goods import Products, Stock
 from source.pop import Commune, CommuneFactory, Jobs, Strata
 from source.prod import Extractor, Industry, Manufactury
-from visual import data_dir
-from pandas import DataFrame
-import pandas as pd
-import matplotlib.pyplot as plt
+from source.pool import temporary
+from visual import database
+from visual.writer import BackgroundWriter, write_csv
+from concurrent.futures import ProcessPoolExecutor
+import visual
+import hashlib
+import json
+import os
 D = getcontext().create_decimal
 
+# pandas, numpy and matplotlib are only imported once they are needed, so recording or running headless does not pay for them.
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from pandas import DataFrame
+    from source.checkpoint import Position
+    from visual.decimate import decimation
+
 def is_empty(path: Path) -> bool:
     size = path.stat().st_size
 
@@ -25,24 +34,109 @@ def is_empty(path: Path) -> bool:
         return True
 
 type data_key = Literal['pop_size', 'pop_welfare', 'stock', 'goods_produced', 'goods_demanded', 'goods_consumed', 'goods_satisfaction']
+type aggregation = Literal['mean', 'min', 'max', 'last']
+
+AGGREGATES: dict[aggregation, Callable[[list[Decimal]], Decimal]] = {
+    'mean': lambda values: D(sum(values)) / len(values),
+    'min': min,
+    'max': max,
+    'last': lambda values: values[-1],
+}
+
+# Title, x label and y label of the graph of each key.
+GRAPHS: dict[data_key, tuple[str, str, str]] = {
+    'pop_size': ('Population Size', 'Time', 'Size'),
+    'pop_welfare': ('Welfare over time', 'Time', 'Welfare'),
+    'stock': ('Stock', 'Time', 'Amount'),
+    'goods_produced': ('Products produced over time', 'Time', 'Amount'),
+    'goods_demanded': ('Products demanded over time', 'Time', 'Amount'),
+    'goods_consumed': ('Products consumed over time', 'Time', 'Amount'),
+    'goods_satisfaction': ('Demand satisfaction', 'Time', 'Percentage'),
+}
+
+def graph_hash(df: DataFrame, title: str, xlabel: str, ylabel: str, /) -> str:
+    """ Hashes everything that is drawn on a graph, so an unchanged graph can be recognized without rendering it. """
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([title, xlabel, ylabel, [str(col) for col in df.columns]]).encode())
+    digest.update(df.to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+def render_graph(df: DataFrame, path: Path, title: str, xlabel: str, ylabel: str, /, *,
+                 threshold: Optional[int] = None,
+                 method: decimation = 'min_max') -> None:
+    """
+    Plots every column of `df` that is not entirely zero and saves it to `path`. Only the object oriented API of matplotlib is
+    used, so this does not depend on `pyplot`'s global state and can run in worker processes.
+
+    Columns longer than `threshold` points, `DECIMATE_THRESHOLD` by default, are decimated before matplotlib sees them. The
+    default `min_max` method keeps every peak and trough, so the graph looks the same at 300 dpi while being drawn from a
+    fraction of the points.
+    """
+
+    from matplotlib.figure import Figure
+    from visual.decimate import DECIMATE_THRESHOLD, decimate
+
+    threshold = DECIMATE_THRESHOLD if threshold is None else threshold
+
+    fig = Figure()
+    ax: Axes = fig.subplots()
+
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+    for col, series in df.loc[:, (df != 0).any()].items():
+        x, y = decimate(series.index.to_numpy(), series.to_numpy(), threshold, method)
+        ax.plot(x, y, label=col)
+
+    fig.tight_layout()
+    fig.legend()
+    fig.savefig(str(path), dpi=300)
 
 class DataManager:
-    def __init__(self, name: str, /, *to_be_recorded: Industry | Commune) -> None:
+    """
+    Records the state of the simulation every time one of its `record_*` methods is called, which is expected to be once per tick.
+
+    With `every` greater than one, only every `every`-th call of each method is recorded and the others return before computing
+    anything. If an `aggregate` is also passed, every call is computed instead and each window of `every` calls is reduced to a
+    single row by it, and the calls of a window that is not complete yet are not part of the recorded data. Rows are indexed by
+    the tick they were sampled at or, when aggregating, by the first tick of their window.
+    """
+
+    def __init__(self, name: str, /, *to_be_recorded: Industry | Commune,
+                 writer: Optional[BackgroundWriter] = None,
+                 every: int = 1,
+                 aggregate: Optional[aggregation] = None,
+                 data_dir: Optional[Path] = None) -> None:
+        
         self.name = name
-        self.data: dict[data_key, DataFrame] = {
-            'pop_size': DataFrame(columns = [job.name for job in Jobs]),
-            'pop_welfare': DataFrame(columns = [job.name for job in Jobs]),
-            'stock': DataFrame(columns = [good.name for good in Products]),
-            'goods_produced': DataFrame(columns = [good.name for good in Products]),
-            'goods_demanded': DataFrame(columns = [good.name for good in Products]),
-            'goods_consumed': DataFrame(columns = [good.name for good in Products]),
-            'goods_satisfaction': DataFrame(columns = [good.name for good in Products])
+        self.writer = writer
+        self.columns: dict[data_key, list[str]] = {
+            'pop_size': [job.name for job in Jobs],
+            'pop_welfare': [job.name for job in Jobs],
+            'stock': [good.name for good in Products],
+            'goods_produced': [good.name for good in Products],
+            'goods_demanded': [good.name for good in Products],
+            'goods_consumed': [good.name for good in Products],
+            'goods_satisfaction': [good.name for good in Products]
         }
 
+        if every < 1:
+            raise ValueError(f'Can only record every one or more ticks, but {every} was passed.')
+
+        self.every = every
+        self.aggregate = aggregate
+        self._calls: dict[data_key, int] = {key: 0 for key in self.columns}
+        self._rows: dict[data_key, list[list[Decimal]]] = {key: [] for key in self.columns}
+        self._ticks: dict[data_key, list[int]] = {key: [] for key in self.columns}
+        self._windows: dict[data_key, list[list[Decimal]]] = {key: [] for key in self.columns}
+
         self.manufacturies = tuple(thing for thing in to_be_recorded if isinstance(thing, Manufactury))
         self.extractors = tuple(thing for thing in to_be_recorded if isinstance(thing, Extractor))
         self.communes = tuple(thing for thing in to_be_recorded if isinstance(thing, Commune))
 
+        data_dir = visual.data_dir if data_dir is None else data_dir
         self.folder = data_dir / self.name
 
         self.csv_files: dict[data_key, Path] = {
@@ -54,16 +148,22 @@ class DataManager:
             'goods_consumed': self.folder / 'goods_consumed.csv',
             'goods_satisfaction': self.folder / 'goods_satisfaction.csv',
         }
+        self._csv_flushed: dict[data_key, int] = {key: 0 for key in self.columns}
+
+        self.history_folder = self.folder / 'history'
+        self._history_flushed: dict[data_key, int] = {key: 0 for key in self.columns}
+        self.database_file = data_dir / 'runs.sqlite'
+        self._sqlite_flushed: dict[data_key, int] = {key: 0 for key in self.columns}
 
         self.graph_folder = self.folder / 'graphs'
         self.graph_files: dict[data_key, Path] = {
-            'pop_size': self.folder / self.graph_folder / 'pop_size.png',
-            'pop_welfare': self.folder / self.graph_folder / 'pop_welfare.png',
-            'stock': self.folder / self.graph_folder / 'stock.png',
-            'goods_produced': self.folder / self.graph_folder / 'goods_produced.png',
-            'goods_demanded': self.folder / self.graph_folder / 'goods_demanded.png',
-            'goods_consumed': self.folder / self.graph_folder / 'goods_consumed.png',
-            'goods_satisfaction': self.folder / self.graph_folder / 'goods_satisfaction.png',
+            'pop_size': self.graph_folder / 'pop_size.png',
+            'pop_welfare': self.graph_folder / 'pop_welfare.png',
+            'stock': self.graph_folder / 'stock.png',
+            'goods_produced': self.graph_folder / 'goods_produced.png',
+            'goods_demanded': self.graph_folder / 'goods_demanded.png',
+            'goods_consumed': self.graph_folder / 'goods_consumed.png',
+            'goods_satisfaction': self.graph_folder / 'goods_satisfaction.png',
         }
 
     def _get_all_communes(self) -> Commune:
@@ -77,7 +177,55 @@ class DataManager:
         
         return communes    
 
+    @property
+    def data(self) -> dict[data_key, DataFrame]:
+        return {key: self.frame(key) for key in self.columns}
+
+    def frame(self, key: data_key, start: int = 0, /) -> DataFrame:
+        """ Returns the rows of `key` from the `start`-th on as a `DataFrame` indexed by tick. """
+
+        from pandas import DataFrame
+
+        return DataFrame(self._rows[key][start:], columns=self.columns[key], index=self._ticks[key][start:])
+
+    def rows(self, key: data_key, /) -> dict[int, list[Decimal]]:
+        """ The exact recorded rows of `key` by tick, without going through pandas. """
+
+        return dict(zip(self._ticks[key], self._rows[key]))
+
+    def records_next(self, key: data_key, /) -> bool:
+        """ Whether the next call to the `record_*` method of `key` will record anything, so callers can skip preparing its arguments. """
+
+        return self.aggregate is not None or self._calls[key] % self.every == 0
+
+    def _skips(self, key: data_key, /) -> bool:
+        """ Counts a call to a `record_*` method and returns whether it can return right away. """
+
+        skips = not self.records_next(key)
+        self._calls[key] += 1
+        return skips
+
+    def _append(self, key: data_key, new_col: dict[str, Decimal], /) -> None:
+        tick = self._calls[key] - 1
+        row = list(new_col.values())
+
+        if self.aggregate is None:
+            self._rows[key].append(row)
+            self._ticks[key].append(tick)
+            return
+
+        window = self._windows[key]
+        window.append(row)
+
+        if len(window) == self.every:
+            reduce = AGGREGATES[self.aggregate]
+            self._rows[key].append([reduce(list(values)) for values in zip(*window)])
+            self._ticks[key].append(tick - self.every + 1)
+            window.clear()
+
     def record_pop_size(self):
+        if self._skips('pop_size'): return
+
         new_col: dict[str, Decimal] = {job.name: D(0) for job in Jobs}
 
         for key, pop in self._get_all_communes().items():
@@ -90,10 +238,11 @@ class DataManager:
             else:
                 raise KeyError
         
-        new_df = DataFrame(new_col, index=[0])
-        self.data['pop_size'] = pd.concat([self.data['pop_size'], new_df], ignore_index=True) 
+        self._append('pop_size', new_col)
 
     def record_pop_welfare(self) -> None:
+        if self._skips('pop_welfare'): return
+
         new_col: dict[str, Decimal] = {job.name: D(0) for job in Jobs}
         divisor = 0
 
@@ -111,30 +260,33 @@ class DataManager:
         if divisor != 0:
             new_col[Jobs.UNEMPLOYED.name] /= divisor
             
-        new_df = DataFrame(new_col, index=[0])
-        self.data['pop_welfare'] = pd.concat([self.data['pop_welfare'], new_df], ignore_index=True)
+        self._append('pop_welfare', new_col)
     
     def record_stockpile(self, stock: Stock, /):
+        if self._skips('stock'): return
+
         new_col: dict[str, Decimal] = {product.name: D(0) for product in Products}
 
         for product, good in stock.items():
             new_col[product.name] += good.amount
 
-        new_df = DataFrame(new_col, index=[0])
-        self.data['stock'] = pd.concat([self.data['stock'], new_df], ignore_index=True)
+        self._append('stock', new_col)
 
     def record_goods_produced(self, stock_before: Stock, stock_after: Stock, /):
+        if self._skips('goods_produced'): return
+
         new_col: dict[str, Decimal] = {product.name: D(0) for product in Products}
 
         for product in Products:
             new_col[product.name] += stock_after[product].amount - stock_before[product].amount
 
-        new_df = DataFrame(new_col, index=[0])
-        self.data['goods_produced'] = pd.concat([self.data['goods_produced'], new_df], ignore_index=True)
+        self._append('goods_produced', new_col)
 
     def record_goods_demanded(self):
+        if self._skips('goods_demanded'): return
+
         new_col: dict[str, Decimal] = {product.name: D(0) for product in Products}
-        total_demand = create_stock()
+        total_demand = temporary(Stock)
 
         for manufactury in self.manufacturies:
             total_demand += manufactury.workforce.calc_goods_demand()
@@ -149,21 +301,23 @@ class DataManager:
         for product, demand in total_demand.items():
             new_col[product.name] += demand.amount
         
-        new_df = DataFrame(new_col, index=[0])
-        self.data['goods_demanded'] = pd.concat([self.data['goods_demanded'], new_df], ignore_index=True)
+        self._append('goods_demanded', new_col)
 
     def record_goods_consumed(self, stock_before: Stock, stock_after: Stock):
+        if self._skips('goods_consumed'): return
+
         new_col: dict[str, Decimal] = {product.name: D(0) for product in Products}
 
         for product in Products:
             new_col[product.name] += stock_before[product].amount - stock_after[product].amount
 
-        new_df = DataFrame(new_col, index=[0])
-        self.data['goods_consumed'] = pd.concat([self.data['goods_consumed'], new_df], ignore_index=True)
+        self._append('goods_consumed', new_col)
 
     def record_goods_satisfaction(self, stock_before: Stock):
+        if self._skips('goods_satisfaction'): return
+
         new_col: dict[str, Decimal] = {product.name: D(0) for product in Products}
-        total_demand = create_stock()
+        total_demand = temporary(Stock)
 
         for manufactury in self.manufacturies:
             total_demand += manufactury.workforce.calc_goods_demand()
@@ -188,18 +342,104 @@ class DataManager:
 
             new_col[product.name] += satisfaction
 
-        new_df = DataFrame(new_col, index=[0])
-        self.data['goods_satisfaction'] = pd.concat([self.data['goods_satisfaction'], new_df], ignore_index=True)
+        self._append('goods_satisfaction', new_col)
+
+    def repeat(self, ticks: int, /) -> None:
+        """
+        Records the last recorded state again for each of the next `ticks` ticks without computing anything, which is how a run
+        that converged fast-forwards its recording to its full length instead of simulating the rest of it.
+        """
+
+        for key, columns in self.columns.items():
+            recorded = self._windows[key] or self._rows[key]
+
+            if not recorded:
+                raise ValueError(f'Nothing was recorded for {key} yet, so there is nothing to repeat.')
+
+            last = dict(zip(columns, recorded[-1]))
+
+            for _ in range(ticks):
+                if self._skips(key): continue
+                self._append(key, last)
+
+    def position(self) -> Position:
+        """ Where the recording is, so that `resume` can continue it once the simulation is resumed from a checkpoint. """
+
+        from source.checkpoint import Position
+
+        position = Position(self.every, self.aggregate)
+
+        for key in self.columns:
+            position.calls[key] = self._calls[key]
+            position.flushed[key] = self._csv_flushed[key]
+            position.stored[key] = self._sqlite_flushed[key]
+            position.appended[key] = self._history_flushed[key]
+            position.pending[key] = [list(row) for row in self._rows[key][self._csv_flushed[key]:]]
+            position.windows[key] = [list(row) for row in self._windows[key]]
+
+        return position
+
+    def resume(self, position: Position, /) -> None:
+        """
+        Continues the recording from `position`. The rows flushed before it are read back from the CSV files, and any row the files
+        or the binary history hold past it, written after the checkpoint was taken, is cut off so that they match the resumed run.
+        """
+
+        if (position.every, position.aggregate) != (self.every, self.aggregate):
+            raise ValueError(f'The checkpoint was recorded every {position.every} ticks with {position.aggregate} aggregation, '
+                             f'but this `DataManager` records every {self.every} with {self.aggregate}.')
+
+        for key in self.columns:
+            rows = self._read_flushed(key, position.flushed[key]) + [list(row) for row in position.pending[key]]
+
+            self._rows[key] = rows
+            self._ticks[key] = [index * self.every for index in range(len(rows))]  # Both when sampling and aggregating.
+            self._windows[key] = [list(row) for row in position.windows[key]]
+            self._calls[key] = position.calls[key]
+            self._csv_flushed[key] = position.flushed[key]
+            self._sqlite_flushed[key] = position.stored[key]
+            self._history_flushed[key] = position.appended[key]
+
+        if any(position.appended.values()):
+            from visual.history import truncate_history
+
+            truncate_history(self.history_folder, position.appended)
+
+    def _read_flushed(self, key: data_key, count: int, /) -> list[list[Decimal]]:
+        """ The first `count` rows of the CSV file of `key`, exactly as they were recorded, truncating the file after them. """
+
+        if count == 0:
+            return []
+
+        path = self.csv_files[key]
+        rows: list[list[Decimal]] = []
+
+        with open(path, 'r+b') as file:
+            file.readline()  # The header.
+
+            while len(rows) < count:
+                line = file.readline()
+
+                if not line:
+                    raise ValueError(f'{path} holds fewer than the {count} rows the checkpoint flushed.')
+
+                rows.append([Decimal(value) for value in line.decode().rstrip('\r\n').split(';')])
+
+            file.truncate(file.tell())
+
+        return rows
 
     def _prepare_save(self):
         if not self.folder.exists():
-            self.folder.mkdir()
+            self.folder.mkdir(parents=True)
         
         for file in self.csv_files.values():
             if not file.exists():
                 file.open("x+").close()
 
     def save_csv(self, overwrite: bool = False) -> None:
+        import pandas as pd
+
         self._prepare_save()
 
         if overwrite or all(is_empty(file) for file in self.csv_files.values()):
@@ -212,53 +452,107 @@ class DataManager:
                 new_df = pd.concat([old_df, df], ignore_index=True)
                 new_df.to_csv(self.csv_files[key], sep=';', index=False)
 
-    def plot_graph(self, which: data_key, /, *, title: str, xlabel: str, ylabel: str):
-        
-        if not self.graph_folder.exists():
-            self.graph_folder.mkdir()
-        
-        if not self.graph_files[which].exists():
-            self.graph_files[which].open('x+').close()
+    def flush(self, overwrite: bool = False) -> None:
+        """
+        Appends the rows recorded since the last flush to the CSV files. If the `DataManager` has a `BackgroundWriter`, the rows
+        are handed to it and written on its thread, otherwise they are written right away. If `overwrite` is true, the first
+        flush replaces whatever the files contained before.
+        """
 
-        df = self.data[which]
-        
-        fig, ax = plt.subplots()
-        ax: Axes
+        self._prepare_save()
 
-        ax.set_title(title)
-        ax.set_xlabel(xlabel)
-        ax.set_ylabel(ylabel)
+        for key in self.columns:
+            start = self._csv_flushed[key]
+            batch = self.frame(key, start)
+            self._csv_flushed[key] = len(self._rows[key])
 
-        for col, series in df.items():
-            if len(series[series == 0]) == len(series):
-                continue
+            if self.writer is None:
+                write_csv(self.csv_files[key], batch, overwrite and start == 0)
 
-            ax.plot(series, label=col)
-        
-        fig.tight_layout()
-        fig.legend()
-        fig.savefig(str(self.graph_files[which]), dpi=300)
-        plt.close()
+            else:
+                self.writer.submit(self.csv_files[key], batch, overwrite and start == 0)
+
+    def save_memmap(self, overwrite: bool = False) -> None:
+        """
+        Appends the rows recorded since the last call to the binary history, which can be lazily reopened with
+        `visual.history.HistoryReader`. If `overwrite` is true, the first call replaces whatever history was stored before.
+        """
+
+        from visual.history import write_history
+
+        batches = {key: self.frame(key, self._history_flushed[key]) for key in self.columns}
+        write_history(self.history_folder, batches, overwrite and not any(self._history_flushed.values()))
+
+        for key in self.columns:
+            self._history_flushed[key] = len(self._rows[key])
 
-    def plot_all(self) -> None:
+    def save_sqlite(self, path: Optional[Path] = None, run_id: Optional[str] = None, overwrite: bool = False) -> None:
+        """
+        Inserts the rows recorded since the last call into one table per metric family, keyed by `run_id` and tick. Every call is a
+        single transaction with one batched insert per table, so it can be called periodically during a run. `run_id` defaults to
+        the name of the `DataManager` and `overwrite` deletes rows previously stored under that id before the first insert.
+        """
 
-        # Population size
-        self.plot_graph('pop_size', title='Population Size', xlabel='Time', ylabel='Size')
+        path = self.database_file if path is None else path
+        run_id = self.name if run_id is None else run_id
+        con = database.connect(path)
+        stored = {key: len(self._rows[key]) for key in self.columns}
 
-        # Population welfare
-        self.plot_graph('pop_welfare', title='Welfare over time', xlabel='Time', ylabel='Welfare')
+        try:
+            with con:
+                for key, columns in self.columns.items():
+                    start = self._sqlite_flushed[key]
+                    database.create_table(con, key, columns)
 
-        # Population welfare
-        self.plot_graph('stock', title='Stock', xlabel='Time', ylabel='Amount')
+                    if overwrite and start == 0:
+                        database.delete_run(con, key, run_id)
 
-        # Products produced
-        self.plot_graph('goods_produced', title='Products produced over time', xlabel='Time', ylabel='Amount')
+                    rows = ((tick, *row) for tick, row in zip(self._ticks[key][start:stored[key]], self._rows[key][start:stored[key]]))
+                    database.insert_rows(con, key, run_id, columns, rows)
 
-        # Products demanded
-        self.plot_graph('goods_demanded', title='Products demanded over time', xlabel='Time', ylabel='Amount')
+        finally:
+            con.close()
+
+        # Only once the transaction committed, so that a call that failed and rolled back inserts the same rows when retried.
+        self._sqlite_flushed.update(stored)
+
+    def plot_graph(self, which: data_key, /, *, title: str, xlabel: str, ylabel: str):
+        self.graph_folder.mkdir(parents=True, exist_ok=True)
+        render_graph(self.frame(which).astype(float), self.graph_files[which], title, xlabel, ylabel)
+
+    def plot_all(self, parallel: bool = True, force: bool = False) -> None:
+        """
+        Plots every graph in `GRAPHS`. A hash of the data behind each graph is kept in the graph folder, and graphs whose data
+        did not change since they were last plotted are skipped unless `force` is true. If `parallel` is true, the remaining
+        graphs are rendered in a process pool.
+        """
+
+        self.graph_folder.mkdir(parents=True, exist_ok=True)
+        hashes_file = self.graph_folder / 'hashes.json'
+        hashes: dict[str, str] = json.loads(hashes_file.read_text()) if hashes_file.exists() else {}
+
+        pending: list[tuple[data_key, DataFrame, str]] = []
+        for which, labels in GRAPHS.items():
+            df = self.frame(which).astype(float)
+            digest = graph_hash(df, *labels)
+
+            if not force and hashes.get(which) == digest and self.graph_files[which].exists():
+                continue
+
+            pending.append((which, df, digest))
+
+        if parallel and len(pending) > 1:
+            with ProcessPoolExecutor(min(len(pending), os.cpu_count() or 1)) as executor:
+                futures = [executor.submit(render_graph, df, self.graph_files[which], *GRAPHS[which]) for which, df, _ in pending]
+
+                for future in futures:
+                    future.result()
+
+        else:
+            for which, df, _ in pending:
+                render_graph(df, self.graph_files[which], *GRAPHS[which])
 
-        # Products consumed
-        self.plot_graph('goods_consumed', title='Products consumed over time', xlabel='Time', ylabel='Amount')
+        for which, _, digest in pending:
+            hashes[which] = digest
 
-        # Products satisfaction
-        self.plot_graph('goods_satisfaction', title='Demand satisfaction', xlabel='Time', ylabel='Percentage')
+        hashes_file.write_text(json.dumps(hashes, indent=4))
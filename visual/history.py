@@ -0,0 +1,173 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+import json
+import numpy as np
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from visual.gather import data_key
+
+HEADER_NAME = 'header.json'
+SCHEMA_VERSION = 2  # Version 2 added the ticks of every row.
+DTYPE = np.dtype('<f8')
+TICK_DTYPE = np.dtype('<i8')
+
+def _read_header(folder: Path, /) -> Optional[dict]:
+    header_file = folder / HEADER_NAME
+
+    if not header_file.exists():
+        return None
+
+    with header_file.open() as file:
+        header = json.load(file)
+
+    if header['version'] != SCHEMA_VERSION:
+        raise ValueError(f'History schema version {header['version']} is not supported.')
+
+    return header
+
+def _write_header(folder: Path, header: dict, /) -> None:
+    """ The header is written to a temporary file first so a crash never leaves a half written header behind. """
+
+    temp_file = folder / (HEADER_NAME + '.tmp')
+
+    with temp_file.open('w') as file:
+        json.dump(header, file, indent=4)
+
+    temp_file.replace(folder / HEADER_NAME)
+
+def _append(path: Path, old_rows: int, matrix: np.ndarray, /) -> None:
+    """ Writes `matrix` to the file in `path` right after its first `old_rows` rows, through `np.memmap`. """
+
+    if old_rows == 0 and path.exists():
+        path.unlink()
+
+    if len(matrix) > 0:
+        offset = old_rows * matrix[0].nbytes
+        mode = 'r+' if path.exists() else 'w+'
+        mapped = np.memmap(path, dtype=matrix.dtype, mode=mode, offset=offset, shape=matrix.shape)
+        mapped[:] = matrix
+        mapped.flush()
+        del mapped
+
+def write_history(folder: Path, data: dict[data_key, DataFrame], /, overwrite: bool = False) -> None:
+    """
+    Writes every `DataFrame` in `data` to `folder` as a raw row-major float64 matrix in its own `<key>.f64` file, and the ticks of
+    its rows, its index, to `<key>.ticks`. A small JSON header records the column names and the number of rows of each matrix so
+    any slice can later be read through `np.memmap`.
+
+    If `overwrite` is false and a history already exists in `folder`, the new rows are appended to it, in which case the columns
+    must match the existing ones.
+    """
+
+    folder.mkdir(parents=True, exist_ok=True)
+    header = None if overwrite else _read_header(folder)
+
+    if header is None:
+        header = {'version': SCHEMA_VERSION, 'dtype': DTYPE.str, 'columns': {}, 'rows': {}}
+
+    for key, df in data.items():
+        columns = [str(col) for col in df.columns]
+        old_rows = header['rows'].get(key, 0)
+
+        if key in header['columns'] and header['columns'][key] != columns:
+            raise ValueError(f'Columns of `{key}` do not match the ones already stored in {folder}.')
+
+        matrix = df.to_numpy(dtype=DTYPE)
+        _append(folder / f'{key}.f64', old_rows, matrix)
+        _append(folder / f'{key}.ticks', old_rows, df.index.to_numpy(dtype=TICK_DTYPE))
+
+        header['columns'][key] = columns
+        header['rows'][key] = old_rows + len(matrix)
+
+    _write_header(folder, header)
+
+def truncate_history(folder: Path, rows: dict[data_key, int], /) -> None:
+    """ Cuts every metric in `rows` back to its given number of rows, dropping whatever was appended after them. """
+
+    header = _read_header(folder)
+    stored: dict[str, int] = {} if header is None else header['rows']
+
+    for key, count in rows.items():
+        if stored.get(key, 0) < count:
+            raise ValueError(f'{folder} holds {stored.get(key, 0)} rows of `{key}`, fewer than the {count} expected.')
+
+    if header is None:
+        return
+
+    for key, count in rows.items():
+        if stored.get(key, 0) > count:
+            with open(folder / f'{key}.f64', 'r+b') as file:
+                file.truncate(count * len(header['columns'][key]) * DTYPE.itemsize)
+
+            with open(folder / f'{key}.ticks', 'r+b') as file:
+                file.truncate(count * TICK_DTYPE.itemsize)
+
+            stored[key] = count
+
+    _write_header(folder, header)
+
+class HistoryReader:
+    """
+    Lazily reopens a history written by `write_history`. Nothing but the header is read on instantiation, every metric is only
+    mapped into memory the first time it is accessed and pages are only read from disk when they are sliced.
+    """
+
+    def __init__(self, folder: Path, /) -> None:
+        header = _read_header(folder)
+
+        if header is None:
+            raise FileNotFoundError(f'There is no history in {folder}.')
+
+        self.folder = folder
+        self.columns: dict[str, list[str]] = header['columns']
+        self.rows: dict[str, int] = header['rows']
+        self._arrays: dict[str, np.ndarray] = {}
+        self._ticks: dict[str, np.ndarray] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """ Returns a read-only `(rows, columns)` matrix of the metric. """
+
+        if key not in self.columns:
+            raise KeyError(f'`{key}` is not stored in {self.folder}.')
+
+        if key not in self._arrays:
+            shape = (self.rows[key], len(self.columns[key]))
+
+            if shape[0] == 0:
+                self._arrays[key] = np.empty(shape, dtype=DTYPE)
+
+            else:
+                self._arrays[key] = np.memmap(self.folder / f'{key}.f64', dtype=DTYPE, mode='r', shape=shape)
+
+        return self._arrays[key]
+
+    def ticks(self, key: str, /) -> np.ndarray:
+        """ Returns a read-only array of the tick each row of the metric was recorded at. """
+
+        if key not in self.columns:
+            raise KeyError(f'`{key}` is not stored in {self.folder}.')
+
+        if key not in self._ticks:
+            if self.rows[key] == 0:
+                self._ticks[key] = np.empty(0, dtype=TICK_DTYPE)
+
+            else:
+                self._ticks[key] = np.memmap(self.folder / f'{key}.ticks', dtype=TICK_DTYPE, mode='r', shape=(self.rows[key],))
+
+        return self._ticks[key]
+
+    def frame(self, key: str, start: Optional[int] = None, stop: Optional[int] = None, /) -> DataFrame:
+        """ Copies only the rows in `[start, stop)` of a metric into a `DataFrame` indexed by the tick they were recorded at. """
+
+        from pandas import DataFrame
+
+        start, stop, _ = slice(start, stop).indices(self.rows[key])
+        return DataFrame(np.array(self[key][start:stop]), columns=self.columns[key], index=np.array(self.ticks(key)[start:stop]))
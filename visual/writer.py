@@ -0,0 +1,97 @@
+from __future__ import annotations
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional, Self
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+type batch = tuple[Path, DataFrame, bool]
+
+def write_csv(path: Path, df: DataFrame, overwrite: bool, /) -> None:
+    """ Appends `df` to the CSV file in `path`. The header is only written when the file is new, empty or overwritten. """
+
+    if overwrite or not path.exists() or path.stat().st_size == 0:
+        df.to_csv(path, sep=';', index=False)
+
+    else:
+        df.to_csv(path, sep=';', index=False, header=False, mode='a')
+
+class BackgroundWriter:
+    """
+    Writes batches of recorded data to disk on its own thread so the simulation loop never waits on disk I/O.
+
+    The queue is bounded, so `submit` blocks once `maxsize` batches are pending. That is the backpressure that stops a slow disk
+    from letting batches pile up in memory. An error raised while writing is re-raised in the simulation thread on every later
+    call to `submit`, `join` or `close`, and every batch after it is discarded. Used as a context manager, all pending batches are
+    written when the block exits, even if it exits because of an exception.
+    """
+
+    def __init__(self, maxsize: int = 8, /) -> None:
+        if maxsize < 1:
+            raise ValueError(f'The queue of a `BackgroundWriter` must hold at least one batch, but {maxsize} was passed.')
+
+        self._queue: Queue[Optional[batch]] = Queue(maxsize)
+        self._error: Optional[BaseException] = None
+        self._thread = Thread(target=self._run, name='BackgroundWriter', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                if self._error is None:
+                    write_csv(*item)
+
+            except BaseException as e:
+                self._error = e
+
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self) -> None:
+        # The error is kept, so the writer stays failed: writing later batches would leave a silent gap in the files.
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, path: Path, df: DataFrame, overwrite: bool = False, /) -> None:
+        """ Queues `df` to be written to `path`. Blocks while the queue is full. """
+
+        self._raise_error()
+
+        if not self._thread.is_alive():
+            raise RuntimeError('Cannot submit batches to a closed `BackgroundWriter`.')
+
+        self._queue.put((path, df, overwrite))
+
+    def join(self) -> None:
+        """ Blocks until every batch submitted so far has been written. """
+
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """ Writes all pending batches and stops the thread. """
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+        self._raise_error()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]], exc: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        try:
+            self.close()
+
+        except Exception:
+            if exc_type is None:
+                raise  # Otherwise the original exception is more relevant and is allowed to propagate.